@@ -0,0 +1,184 @@
+"""
+Modifica in blocco dei parametri di molti clip, es.
+
+    durata *= 1.5
+    ampiezza[0] += 3
+    posizione = linspace(-8, 8)
+
+Ogni istruzione viene valutata su tutti i clip in un solo passaggio
+vettoriale (colonne NumPy, come ClipQuery); le istruzioni, separate da
+';' o da un a capo, si applicano in ordine e ognuna vede i risultati
+delle precedenti. Il testo non viene mai eseguito:
+
+    program   := statement ((';' | newline) statement)*
+    statement := field ('=' | '+=' | '-=' | '*=' | '/=') value
+    field     := name ('[' intero ']')*
+    value     := number
+               | 'linspace' '(' number ',' number ')'   (dal primo all'ultimo clip)
+               | 'random' '(' number ',' number ')'     (uniforme)
+
+Come nelle query, un parametro lista senza indice è il suo primo
+elemento. I clip in cui il campo non esiste o non è numerico vengono
+saltati, così come i risultati non finiti e i tempi negativi.
+"""
+import functools
+import re
+
+import numpy as np
+
+from src.Params import FLOAT_PARAMS, is_number
+from src.ClipQuery import (
+    QuerySyntaxError, TokenParser, tokenize, read_field, write_field, field_name
+)
+
+# Parametri di tempo: non possono diventare negativi
+TIME_PARAMS = ('cAttacco', 'durata')
+
+_TOKEN = re.compile(r'''[ \t]*(?:
+    (?P<number>-?\d+(?:\.\d+)?)|
+    (?P<assign>[-+*/]?=)|
+    (?P<punct>[()\[\],])|
+    (?P<end>[;\n])|
+    (?P<name>[A-Za-z_]\w*)
+)''', re.VERBOSE)
+
+
+class _Statement:
+    def __init__(self, field, name, indices, op, function, args):
+        self.field = field
+        self.name = name
+        self.indices = indices
+        self.op = op
+        self.function = function  # None per un numero
+        self.args = args
+
+    def operand(self, count, rng):
+        if self.function == 'linspace':
+            return np.linspace(self.args[0], self.args[1], count)
+        if self.function == 'random':
+            return rng.uniform(self.args[0], self.args[1], count)
+        return np.full(count, self.args[0])
+
+
+class EditParser(TokenParser):
+    """
+    Parser delle istruzioni `field op value`; FUNCTIONS associa a ogni
+    funzione ammessa il numero di argomenti (None: almeno uno).
+    """
+    FUNCTIONS = {'linspace': 2, 'random': 2}
+    OPERATORS = ('=', '+=', '-=', '*=', '/=')
+    END = 'end of edit'
+
+    def __init__(self, text):
+        super().__init__(tokenize(text, _TOKEN, keywords=()))
+
+    def parse(self):
+        statements = []
+        while self.peek()[0] is not None:
+            if self.peek()[0] == 'end':
+                self.index += 1
+                continue
+            statements.append(self.statement())
+            if self.peek()[0] is not None:
+                self.take('end')
+        if not statements:
+            raise QuerySyntaxError("empty edit")
+        return statements
+
+    def value(self):
+        """(funzione, argomenti); la funzione è None per un numero"""
+        if self.peek()[0] != 'name':
+            return None, (float(self.take('number')[1]),)
+        _, function, position = self.take('name')
+        if function not in self.FUNCTIONS:
+            raise QuerySyntaxError(f"unknown function {function!r}", position)
+        self.take('punct', '(')
+        args = [float(self.take('number')[1])]
+        while self.peek()[:2] == ('punct', ','):
+            self.index += 1
+            args.append(float(self.take('number')[1]))
+        self.take('punct', ')')
+        arity = self.FUNCTIONS[function]
+        if arity is not None and len(args) != arity:
+            raise QuerySyntaxError(f"{function} takes {arity} arguments", position)
+        return function, tuple(args)
+
+    def statement(self):
+        name, indices = self.field()
+        field = field_name(name, indices)
+        token = self.take('assign')
+        if token[1] not in self.OPERATORS:
+            raise QuerySyntaxError(f"unexpected {token[1]!r}", token[2])
+        function, args = self.value()
+        return _Statement(field, name, indices, token[1], function, args)
+
+
+def _convert(name, old, new):
+    # Stesse regole di ParamDialog: tempi sempre float, interi restano interi
+    if name in FLOAT_PARAMS:
+        return float(round(new, 6))
+    if isinstance(old, int) and float(new).is_integer():
+        return int(new)
+    return float(round(new, 6))
+
+
+class ParamEdit:
+    """Modifica compilata; `apply` calcola i nuovi valori senza toccare i clip"""
+    def __init__(self, text, statements):
+        self.text = text
+        self.statements = statements
+
+    def __repr__(self):
+        return f"ParamEdit({self.text!r})"
+
+    def apply(self, params_list, seed=None):
+        """
+        Per ogni dizionario di parametri restituisce i valori di primo
+        livello modificati, es. [{'durata': 7.5}, {}, ...]. L'ordine dei
+        parametri è quello usato da linspace.
+        """
+        count = len(params_list)
+        changes = [{} for _ in range(count)]
+        rng = np.random.default_rng(seed)
+        for statement in self.statements:
+            name, indices = statement.name, statement.indices
+            currents = [changes[i][name] if name in changes[i] else params.get(name)
+                        for i, params in enumerate(params_list)]
+            column = np.full(count, np.nan)
+            for i, current in enumerate(currents):
+                value = read_field(current, indices)
+                if is_number(value):
+                    column[i] = value
+            operand = statement.operand(count, rng)
+            with np.errstate(all='ignore'):
+                if statement.op == '=':
+                    # Si assegna solo dove il campo esiste già ed è numerico
+                    result = np.where(np.isnan(column), np.nan, operand)
+                elif statement.op == '+=':
+                    result = column + operand
+                elif statement.op == '-=':
+                    result = column - operand
+                elif statement.op == '*=':
+                    result = column * operand
+                else:
+                    result = column / operand
+                valid = np.isfinite(result)
+                if name in TIME_PARAMS:
+                    valid &= result >= 0
+            # La scrittura nei dizionari è per forza per clip: valori Python, non scalari NumPy
+            values = result.tolist()
+            for i in np.flatnonzero(valid).tolist():
+                current = currents[i]
+                new = _convert(name, read_field(current, indices), values[i])
+                changes[i][name] = write_field(current, indices, new)
+        # Restano solo i valori davvero cambiati
+        for params, values in zip(params_list, changes):
+            for name in [name for name, value in values.items() if params.get(name) == value]:
+                del values[name]
+        return changes
+
+
+@functools.lru_cache(maxsize=64)
+def compile_edit(text):
+    """Compila (una volta per testo) una modifica in blocco. Solleva QuerySyntaxError"""
+    return ParamEdit(text.strip(), EditParser(text).parse())
@@ -0,0 +1,70 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QDialog, QFormLayout, QComboBox, QPlainTextEdit, QLabel,
+    QDialogButtonBox, QMessageBox
+)
+
+from src.MusicItem import MusicItem
+
+# Clip a cui applicare la modifica: etichetta -> funzione(window)
+TARGETS = {
+    'Selected clips': lambda window: [item for item in window.scene.selectedItems()
+                                      if isinstance(item, MusicItem)],
+    'Search results': lambda window: [item for item in window.scene.highlighted_items
+                                      if item.scene() is window.scene],
+    'All clips': lambda window: window.scene.clip_items(),
+}
+
+
+class BulkEditDialog(QDialog):
+    """Modifica in blocco dei parametri dei clip selezionati o trovati dalla ricerca"""
+    def __init__(self, window, parent=None):
+        super().__init__(parent or window)
+        self.setWindowTitle("Bulk Edit Parameters")
+        self.main_window = window
+        self.command = None
+
+        layout = QFormLayout()
+        self.target = QComboBox()
+        self.target.addItems(list(TARGETS))
+        self.target.currentIndexChanged.connect(self.update_count)
+        layout.addRow("Apply to:", self.target)
+
+        self.expression = QPlainTextEdit()
+        self.expression.setPlaceholderText("durata *= 1.5\nampiezza[0] += 3\nposizione = linspace(-8, 8)")
+        layout.addRow("Edit:", self.expression)
+
+        self.count_label = QLabel()
+        layout.addRow("", self.count_label)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Apply | QDialogButtonBox.Cancel)
+        buttons.button(QDialogButtonBox.Apply).clicked.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+        # Se non c'è selezione si parte dai risultati della ricerca
+        if not TARGETS['Selected clips'](window) and window.scene.highlighted_items:
+            self.target.setCurrentText('Search results')
+        self.update_count()
+
+    def target_items(self):
+        return TARGETS[self.target.currentText()](self.main_window)
+
+    def update_count(self, *args):
+        self.count_label.setText(f"{len(self.target_items())} clip")
+
+    def keyPressEvent(self, event):
+        if (event.modifiers() & (Qt.ControlModifier | Qt.MetaModifier)) and event.key() == Qt.Key_W:
+            self.reject()
+        else:
+            super().keyPressEvent(event)
+
+    def accept(self):
+        """Applica la modifica come un solo comando annullabile"""
+        try:
+            self.command = self.main_window.bulk_edit(self.expression.toPlainText(), self.target_items())
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Edit", str(e), QMessageBox.Ok)
+            return
+        super().accept()
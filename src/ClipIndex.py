@@ -0,0 +1,96 @@
+from bisect import bisect_left, bisect_right
+
+
+class ClipIndex:
+    """
+    Indice dei clip di una scena ordinato per inizio (coordinata x).
+
+    Viene ricostruito in modo lazy alla prima interrogazione dopo una
+    modifica (i clip chiamano `invalidate` quando si spostano, cambiano
+    durata o escono dalla scena), così trascinamenti e import non pagano
+    nulla finché nessuno interroga l'indice. Le ricerche per intervallo
+    costano O(log n + k) grazie alla bisezione sugli inizi e alla durata
+    massima: un clip che inizia prima di x0 - max_width non può
+    sovrapporsi all'intervallo.
+    """
+    def __init__(self, source):
+        # source() restituisce i clip attualmente nella scena
+        self._source = source
+        self._items = []
+        self._starts = []
+        self._ends = []
+        self._max_width = 0.0
+        # Inizi e fini di tutti i clip, ordinati, per lo snap magnetico
+        self._edges = []
+        self._edge_items = []
+        self._dirty = True
+
+    @property
+    def dirty(self):
+        return self._dirty
+
+    def invalidate(self):
+        self._dirty = True
+
+    def _ensure(self):
+        if not self._dirty:
+            return
+        entries = []
+        for item in self._source():
+            start = item.pos().x() + item.rect().x()
+            entries.append((start, start + item.rect().width(), item))
+        entries.sort(key=lambda entry: entry[0])
+        self._starts = [entry[0] for entry in entries]
+        self._ends = [entry[1] for entry in entries]
+        self._items = [entry[2] for entry in entries]
+        self._max_width = max((end - start for start, end, _ in entries), default=0.0)
+        edges = [(start, item) for start, _, item in entries] + [(end, item) for _, end, item in entries]
+        edges.sort(key=lambda edge: edge[0])
+        self._edges = [edge[0] for edge in edges]
+        self._edge_items = [edge[1] for edge in edges]
+        self._dirty = False
+
+    def __len__(self):
+        self._ensure()
+        return len(self._items)
+
+    def __iter__(self):
+        """Clip in ordine di inizio"""
+        self._ensure()
+        return iter(list(self._items))
+
+    def overlapping(self, x0, x1):
+        """Clip che si sovrappongono a [x0, x1), in ordine di inizio"""
+        self._ensure()
+        lo = bisect_left(self._starts, x0 - self._max_width)
+        hi = bisect_left(self._starts, x1)
+        return [self._items[i] for i in range(lo, hi) if self._ends[i] > x0]
+
+    def nearest_edge(self, x, tolerance, exclude=()):
+        """
+        Bordo (inizio o fine di un clip) più vicino a x entro tolerance,
+        ignorando i clip in exclude; None se non ce ne sono.
+        """
+        self._ensure()
+        edges = self._edges
+        i = bisect_left(edges, x)
+        best = None
+        j = i
+        while j < len(edges) and edges[j] - x <= tolerance:
+            if self._edge_items[j] not in exclude:
+                best = edges[j]
+                break
+            j += 1
+        k = i - 1
+        while k >= 0 and x - edges[k] <= tolerance:
+            if self._edge_items[k] not in exclude:
+                if best is None or x - edges[k] < best - x:
+                    best = edges[k]
+                break
+            k -= 1
+        return best
+
+    def starting_in(self, x0, x1):
+        """Clip che iniziano in [x0, x1]"""
+        self._ensure()
+        return self._items[bisect_left(self._starts, x0):bisect_right(self._starts, x1)]
@@ -0,0 +1,294 @@
+"""
+Linguaggio di query per filtrare i clip su più parametri, es.
+
+    durata > 3 and ritmo[0] in 5..9 and track in {2,4}
+
+Una query viene compilata una volta sola in un predicato vettoriale:
+i campi usati diventano colonne NumPy estratte in un solo passaggio
+dai parametri dei clip e il predicato le valuta tutte insieme. Il
+testo non viene mai eseguito: il parser accetta solo la grammatica
+
+    expr       := term ('or' term)*
+    term       := factor ('and' factor)*
+    factor     := 'not' factor | '(' expr ')' | comparison
+    comparison := field op number
+                | field 'in' number '..' number      (estremi inclusi)
+                | field 'in' '{' number (',' number)* '}'
+    field      := name ('[' intero ']')*             (es. ritmo[0], track)
+    op         := '==' | '=' | '!=' | '<' | '<=' | '>' | '>='
+
+Un parametro salvato come lista senza indice vale il primo elemento
+(come Params.first_value); `track` è la traccia del clip. I campi
+mancanti o non numerici non soddisfano nessun confronto. NumPy viene
+importato solo da chi usa le query.
+"""
+import functools
+import re
+
+import numpy as np
+
+from src.Params import first_value, is_number
+from src.ParamIndex import SEARCH_TOLERANCE
+
+TRACK_FIELD = 'track'
+
+_TOKEN = re.compile(r'''\s*(?:
+    (?P<number>-?\d+(?:\.\d+)?(?!\.\d))|
+    (?P<range>\.\.)|
+    (?P<op>==|!=|<=|>=|<|>|=)|
+    (?P<punct>[()\[\]{},])|
+    (?P<name>[A-Za-z_]\w*)
+)''', re.VERBOSE)
+_KEYWORDS = ('and', 'or', 'not', 'in')
+
+
+class QuerySyntaxError(ValueError):
+    """Query non valida; `position` è l'offset nel testo"""
+    def __init__(self, message, position=None):
+        super().__init__(message if position is None else f"{message} (col {position + 1})")
+        self.position = position
+
+
+def tokenize(text, pattern=_TOKEN, keywords=_KEYWORDS):
+    """
+    Token (tipo, testo, posizione) secondo `pattern`, un'espressione con
+    gruppi nominati; i nomi in `keywords` diventano token del proprio tipo.
+    Condiviso con i linguaggi di BulkEdit e Generate.
+    """
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = pattern.match(text, pos)
+        if match is None or match.end() == pos:
+            raise QuerySyntaxError(f"unexpected character {text[pos:].lstrip()[:1]!r}", pos)
+        group = match.lastgroup
+        value = match.group(group)
+        kind = value if group == 'name' and value in keywords else group
+        tokens.append((kind, value, match.start(group)))
+        pos = match.end()
+    return tokens
+
+
+def read_field(value, indices):
+    """Elemento di un parametro: senza indici il primo valore, None se manca"""
+    if not indices:
+        return first_value(value)
+    for index in indices:
+        if not isinstance(value, (list, tuple)) or index >= len(value):
+            return None
+        value = value[index]
+    return value
+
+
+def write_field(value, indices, new):
+    """
+    Nuovo valore di primo livello con new nella posizione indicata (liste
+    copiate); senza indici un parametro lista conserva gli altri elementi
+    """
+    if not indices:
+        if isinstance(value, (list, tuple)):
+            return [new] + list(value[1:])
+        return new
+    copy = list(value)
+    copy[indices[0]] = write_field(copy[indices[0]], indices[1:], new) if indices[1:] else new
+    return copy
+
+
+class TokenParser:
+    """
+    Base dei parser a discesa ricorsiva dei linguaggi sui parametri:
+    scorrimento dei token e campi `name[i][j]`. END descrive la fine
+    del testo nei messaggi di errore.
+    """
+    END = 'end of query'
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.index = 0
+
+    def peek(self):
+        return self.tokens[self.index] if self.index < len(self.tokens) else (None, None, None)
+
+    def take(self, kind, value=None):
+        token = self.peek()
+        if token[0] != kind or (value is not None and token[1] != value):
+            found = self.END if token[0] is None else repr(token[1])
+            raise QuerySyntaxError(f"expected {value or kind}, found {found}", token[2])
+        self.index += 1
+        return token
+
+    def field(self):
+        """(nome, indici) di un campo come ritmo[0]"""
+        name = self.take('name')[1]
+        indices = []
+        while self.peek()[:2] == ('punct', '['):
+            self.index += 1
+            token = self.take('number')
+            if not re.fullmatch(r'\d+', token[1]):
+                raise QuerySyntaxError(f"invalid index {token[1]!r}", token[2])
+            indices.append(int(token[1]))
+            self.take('punct', ']')
+        return name, indices
+
+
+def field_name(name, indices):
+    """Testo di un campo, es. ('ritmo', [0]) -> 'ritmo[0]'"""
+    return name + ''.join(f'[{i}]' for i in indices)
+
+
+class _Parser(TokenParser):
+    def __init__(self, text):
+        super().__init__(tokenize(text))
+        self.fields = set()
+
+    def parse(self):
+        if not self.tokens:
+            raise QuerySyntaxError("empty query")
+        node = self.expr()
+        if self.peek()[0] is not None:
+            token = self.peek()
+            raise QuerySyntaxError(f"unexpected {token[1]!r}", token[2])
+        return node
+
+    def expr(self):
+        node = self.term()
+        while self.peek()[0] == 'or':
+            self.index += 1
+            node = ('or', node, self.term())
+        return node
+
+    def term(self):
+        node = self.factor()
+        while self.peek()[0] == 'and':
+            self.index += 1
+            node = ('and', node, self.factor())
+        return node
+
+    def factor(self):
+        kind = self.peek()[0]
+        if kind == 'not':
+            self.index += 1
+            return ('not', self.factor())
+        if kind == 'punct' and self.peek()[1] == '(':
+            self.index += 1
+            node = self.expr()
+            self.take('punct', ')')
+            return node
+        return self.comparison()
+
+    def field(self):
+        field = field_name(*super().field())
+        self.fields.add(field)
+        return field
+
+    def number(self):
+        return float(self.take('number')[1])
+
+    def comparison(self):
+        field = self.field()
+        kind, value, _ = self.peek()
+        if kind == 'op':
+            self.index += 1
+            return ('cmp', field, '==' if value == '=' else value, self.number())
+        if kind == 'in':
+            self.index += 1
+            if self.peek()[:2] == ('punct', '{'):
+                self.index += 1
+                values = [self.number()]
+                while self.peek()[:2] == ('punct', ','):
+                    self.index += 1
+                    values.append(self.number())
+                self.take('punct', '}')
+                return ('set', field, tuple(values))
+            low = self.number()
+            self.take('range', '..')
+            return ('range', field, low, self.number())
+        self.take('op')  # solleva l'errore con la posizione
+
+
+def _compile(node, tolerance):
+    kind = node[0]
+    if kind == 'and':
+        left, right = _compile(node[1], tolerance), _compile(node[2], tolerance)
+        return lambda columns: left(columns) & right(columns)
+    if kind == 'or':
+        left, right = _compile(node[1], tolerance), _compile(node[2], tolerance)
+        return lambda columns: left(columns) | right(columns)
+    if kind == 'not':
+        inner = _compile(node[1], tolerance)
+        return lambda columns: ~inner(columns)
+    field = node[1]
+    if kind == 'range':
+        low, high = node[2], node[3]
+        return lambda columns: (columns[field] >= low) & (columns[field] <= high)
+    if kind == 'set':
+        values = np.array(node[2])
+        return lambda columns: (np.abs(columns[field][:, None] - values[None, :]) <= tolerance).any(axis=1)
+    op, value = node[2], node[3]
+    # NaN (campo mancante) rende falso ogni confronto, anche !=
+    comparisons = {
+        '==': lambda column: np.abs(column - value) <= tolerance,
+        '!=': lambda column: np.abs(column - value) > tolerance,
+        '<': lambda column: column < value,
+        '<=': lambda column: column <= value,
+        '>': lambda column: column > value,
+        '>=': lambda column: column >= value,
+    }
+    compare = comparisons[op]
+    return lambda columns: compare(columns[field])
+
+
+def _field_getter(field):
+    name, *indices = re.split(r'\[', field)
+    indices = [int(index.rstrip(']')) for index in indices]
+    if name == TRACK_FIELD and not indices:
+        return lambda params, track: track
+    return lambda params, track: read_field(params.get(name), indices)
+
+
+class ClipQuery:
+    """
+    Query compilata. `records` è una sequenza di coppie (params, traccia);
+    `mask(records)` restituisce un array booleano con un valore per record.
+    """
+    def __init__(self, text, fields, predicate):
+        self.text = text
+        self.fields = frozenset(fields)
+        self._predicate = predicate
+        self._getters = [(field, _field_getter(field)) for field in sorted(self.fields)]
+
+    def __repr__(self):
+        return f"ClipQuery({self.text!r})"
+
+    def columns(self, records):
+        """Colonne NumPy dei campi usati, estratte in un solo passaggio"""
+        count = len(records)
+        columns = {field: np.full(count, np.nan) for field in self.fields}
+        for i, (params, track) in enumerate(records):
+            for field, getter in self._getters:
+                value = getter(params, track)
+                if is_number(value):
+                    columns[field][i] = value
+        return columns
+
+    def evaluate(self, columns):
+        """Valuta il predicato su colonne già estratte"""
+        count = len(next(iter(columns.values()))) if columns else 0
+        with np.errstate(invalid='ignore'):
+            return np.broadcast_to(self._predicate(columns), (count,))
+
+    def mask(self, records):
+        return self.evaluate(self.columns(records))
+
+    def indices(self, records):
+        """Posizioni dei record che soddisfano la query"""
+        return np.flatnonzero(self.mask(records))
+
+
+@functools.lru_cache(maxsize=128)
+def compile_query(text, tolerance=SEARCH_TOLERANCE):
+    """Compila (una volta per testo) una query. Solleva QuerySyntaxError"""
+    parser = _Parser(text)
+    tree = parser.parse()
+    return ClipQuery(text.strip(), parser.fields, _compile(tree, tolerance))
@@ -0,0 +1,151 @@
+"""
+Stili condivisi dei clip (flyweight).
+
+Font, colori e penne delle etichette non appartengono ai singoli clip:
+ogni combinazione (font, colore) esiste una volta sola in `label_style`
+e i clip la referenziano. Il tema del testo (text_color, item_text_size)
+viene letto dalle settings una volta sola da uno `StyleRegistry` per
+oggetto Settings e riletto da solo quando quelle chiavi cambiano
+(Settings.subscribe); `refresh()` incrementa `version` e le etichette
+risolvono di nuovo lo stile al primo paint, senza toccare i clip uno
+per uno.
+"""
+import weakref
+
+from PyQt5.QtGui import QColor, QFont, QPen
+
+DEFAULT_TEXT_COLOR = '#000000'
+DEFAULT_TEXT_SIZE = 12
+
+# Chiavi delle settings che definiscono il tema del testo
+THEME_KEYS = frozenset({'text_color', 'item_text_size'})
+
+# Scala del testo con l'altezza della traccia (updateHeight)
+REFERENCE_HEIGHT = 50  # Altezza alla quale il testo ha la dimensione delle settings
+MIN_SCALED_SIZE = 8
+MAX_SCALED_SIZE = 24
+
+_colors = {}
+_fonts = {}
+_label_styles = {}
+
+
+def shared_color(color):
+    """QColor condiviso per il valore dato. Non va modificato"""
+    color = color if isinstance(color, QColor) else QColor(color)
+    key = color.rgba()
+    shared = _colors.get(key)
+    if shared is None:
+        shared = _colors[key] = QColor(color)
+    return shared
+
+
+def shared_font(font):
+    """QFont condiviso equivalente a quello dato. Non va modificato"""
+    key = font.key()
+    shared = _fonts.get(key)
+    if shared is None:
+        shared = _fonts[key] = QFont(font)
+    return shared
+
+
+class LabelStyle:
+    """Font, colore e penna di un'etichetta, condivisi tra tutti i clip che li usano"""
+    __slots__ = ('font', 'color', 'pen')
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.pen = QPen(color)
+
+    def __repr__(self):
+        return f"LabelStyle({self.font.pointSize()}pt, {self.color.name()})"
+
+
+def label_style(font, color):
+    """LabelStyle condiviso per la coppia (font, colore)"""
+    font = shared_font(font)
+    color = shared_color(color)
+    key = (font.key(), color.rgba())
+    style = _label_styles.get(key)
+    if style is None:
+        style = _label_styles[key] = LabelStyle(font, color)
+    return style
+
+
+def scaled_size(size, height):
+    """Dimensione del testo per un clip alto `height`, limitata tra 8 e 24"""
+    return int(max(MIN_SCALED_SIZE, min(size * height / REFERENCE_HEIGHT, MAX_SCALED_SIZE)))
+
+
+class StyleRegistry:
+    """
+    Tema del testo dei clip letto dalle settings.
+
+    `font(height)` e `color` sono oggetti condivisi; `version` cambia a
+    ogni refresh che modifica il tema, così le etichette sanno quando
+    risolvere di nuovo il proprio stile.
+    """
+    def __init__(self, settings=None):
+        self._settings = weakref.ref(settings) if settings is not None else None
+        self.version = 0
+        self.text_size = None
+        self.color = shared_color(DEFAULT_TEXT_COLOR)
+        self._fonts = {}
+        self.refresh()
+        if settings is not None:
+            settings.subscribe(self._settings_changed)
+
+    @property
+    def settings(self):
+        return self._settings() if self._settings is not None else None
+
+    def refresh(self):
+        """Rilegge il tema dalle settings. True se è cambiato"""
+        settings = self.settings
+        if settings is None:
+            # Senza settings: font di sistema e testo nero
+            size, color = None, shared_color(DEFAULT_TEXT_COLOR)
+        else:
+            size = int(settings.get('item_text_size', DEFAULT_TEXT_SIZE))
+            color = shared_color(settings.get('text_color', DEFAULT_TEXT_COLOR))
+        if size == self.text_size and color is self.color and self.version:
+            return False
+        self.text_size = size
+        self.color = color
+        self._fonts.clear()
+        self.version += 1
+        return True
+
+    def _settings_changed(self, keys):
+        if not keys.isdisjoint(THEME_KEYS):
+            self.refresh()
+
+    def font(self, height=None):
+        """Font condiviso del tema, scalato all'altezza del clip se data"""
+        font = self._fonts.get(height)
+        if font is None:
+            font = QFont()
+            if self.text_size is not None:
+                font.setPointSize(self.text_size if height is None else scaled_size(self.text_size, height))
+            elif height is not None:
+                font.setPointSize(scaled_size(DEFAULT_TEXT_SIZE, height))
+            font = self._fonts[height] = shared_font(font)
+        return font
+
+
+_registries = weakref.WeakKeyDictionary()
+_default_registry = None
+
+
+def style_registry(settings=None):
+    """StyleRegistry delle settings date (uno per oggetto Settings)"""
+    global _default_registry
+    if settings is None:
+        if _default_registry is None:
+            _default_registry = StyleRegistry()
+        return _default_registry
+    registry = _registries.get(settings)
+    if registry is None:
+        registry = _registries[settings] = StyleRegistry(settings)
+    return registry
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable
 from PyQt5.QtCore import QPointF
 
 class Command(ABC):
@@ -26,6 +26,21 @@ class CommandManager:
         self._undo_stack: List[Command] = []
         self._redo_stack: List[Command] = []
         self._max_stack_size = 50
+        self._listeners: List[Callable[[Command], None]] = []
+
+    def add_listener(self, callback: Callable[[Command], None]):
+        """Register a callback invoked with every command executed, undone or redone"""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Command], None]):
+        """Unregister a callback previously added with add_listener"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify_listeners(self, command: Command):
+        for callback in list(self._listeners):
+            callback(command)
 
     def execute(self, command: Command):
         command.execute()
@@ -37,6 +52,7 @@ class CommandManager:
         self._undo_stack.append(command)
         self._redo_stack.clear() # Pulisce lo stack di redo dopo un nuovo comando
         self._notify_state_change()
+        self._notify_listeners(command)
                 
     def undo(self):
         if not self._undo_stack:
@@ -50,6 +66,7 @@ class CommandManager:
             self._redo_stack.pop(0)
 
         self._notify_state_change()
+        self._notify_listeners(command)
 
     def redo(self):
         """Redo the last undone command"""
@@ -59,6 +76,7 @@ class CommandManager:
         command.execute()
         self._undo_stack.append(command)
         self._notify_state_change()
+        self._notify_listeners(command)
 
     def clear(self):
         """Clear both undo and redo stacks"""
@@ -112,6 +130,97 @@ class MoveItemCommand(Command):
         self.item.setPos(self.old_pos)
         self.item.params['cAttacco'] = self.old_attack
 
+class MoveItemsCommand(Command):
+    """Command for moving several MusicItems at once (e.g. a group drag)"""
+    def __init__(self, items, old_positions, new_positions):
+        self.items = list(items)
+        self.old_positions = [QPointF(pos) for pos in old_positions]
+        self.new_positions = [QPointF(pos) for pos in new_positions]
+
+    def execute(self):
+        self._apply(self.new_positions)
+
+    def undo(self):
+        self._apply(self.old_positions)
+
+    def _apply(self, positions):
+        scene = self.items[0].scene() if self.items else None
+        if scene is not None and hasattr(scene, 'move_items'):
+            scene.move_items(self.items, positions)
+        else:
+            for item, pos in zip(self.items, positions):
+                item.setPos(pos)
+
+    def remap(self, item_map, factor):
+        """Segue gli item ricreati da Timeline.scale_scene"""
+        self.items = [item_map.get(item, item) for item in self.items]
+        self.old_positions = [QPointF(pos.x() * factor, pos.y()) for pos in self.old_positions]
+        self.new_positions = [QPointF(pos.x() * factor, pos.y()) for pos in self.new_positions]
+
+class EditParamsCommand(Command):
+    """Command for changing the params of many MusicItems at once (bulk edit)"""
+    def __init__(self, items, old_values, new_values):
+        # old_values/new_values: per item, i valori di primo livello da scrivere
+        self.items = list(items)
+        self.old_values = list(old_values)
+        self.new_values = list(new_values)
+
+    def execute(self):
+        self._apply(self.new_values)
+
+    def undo(self):
+        self._apply(self.old_values)
+
+    def _apply(self, values):
+        scene = self.items[0].scene() if self.items else None
+        if scene is not None and hasattr(scene, 'apply_params'):
+            scene.apply_params(self.items, values)
+        else:
+            for item, changes in zip(self.items, values):
+                item.params.update(changes)
+
+    def remap(self, item_map, factor):
+        """Segue gli item ricreati da Timeline.scale_scene (i params non dipendono dallo zoom)"""
+        self.items = [item_map.get(item, item) for item in self.items]
+
+class AddItemsCommand(Command):
+    """Command for inserting many new MusicItems at once (e.g. generated clips)"""
+    def __init__(self, scene, records, name="Clip"):
+        # records: coppie (params, traccia); gli item vengono creati al primo
+        # execute e poi solo tolti e rimessi, così i comandi successivi che
+        # li riferiscono restano validi
+        self.scene = scene
+        self.records = list(records)
+        self.name = name
+        self.items = []
+
+    def execute(self):
+        if not self.items:
+            self.items = self.scene.add_clips(self.records, self.name)
+            return
+        with self.scene.batch_update():
+            for item in self.items:
+                if item.scene() is not self.scene:
+                    self.scene.addItem(item)
+
+    def undo(self):
+        self.scene.remove_clips(self.items)
+
+    def remap(self, item_map, factor):
+        """
+        Segue gli item ricreati da Timeline.scale_scene; quelli fuori dalla
+        scena (comando annullato) vengono riscalati qui
+        """
+        items = []
+        for item in self.items:
+            if item in item_map:
+                items.append(item_map[item])
+            else:
+                item.setPos(item.pos().x() * factor, item.pos().y())
+                item.setRect(0, 0, item.rect().width() * factor, item.rect().height())
+                items.append(item)
+        self.items = items
+
 class ResizeItemCommand(Command):
     def __init__(self, item, old_width, new_width):
         self.item = item
@@ -0,0 +1,149 @@
+"""
+Generazione di molti clip da distribuzioni di parametri, es.
+
+    durata = uniform(1, 4)
+    ampiezza[0] = gauss(-20, 3)
+    ritmo[0] = sequence(5, 7, 9)
+    posizione = walk(0, 1)
+
+Gli inizi (cAttacco) sono uniformi nell'intervallo scelto, salvo
+un'istruzione che li definisca; i clip vengono ordinati nel tempo prima
+di campionare gli altri parametri, così sequence, walk e linspace
+procedono dal primo all'ultimo clip. Ogni colonna viene generata con
+NumPy in un solo passaggio; i parametri non citati restano quelli di
+default. La sintassi dei campi è quella di BulkEdit:
+
+    statement := field '=' (number | function '(' number (',' number)* ')')
+
+    uniform(a, b)          uniforme tra a e b
+    gauss(media, sd)       gaussiana
+    choice(v1, v2, ...)    valore a caso tra quelli elencati
+    sequence(v1, v2, ...)  valori in ciclo, nell'ordine
+    walk(inizio, passo)    random walk con passi gaussiani di sd passo
+    linspace(a, b)         da a (primo clip) a b (ultimo clip)
+"""
+import functools
+
+import numpy as np
+
+from src.Params import default_params, FLOAT_PARAMS, is_number
+from src.BulkEdit import EditParser
+from src.ClipQuery import QuerySyntaxError, read_field, write_field
+
+MIN_DURATION = 0.01  # Durata minima di un clip generato (secondi)
+
+DEFAULT_SPEC = "durata = uniform(1, 4)\nposizione = walk(0, 1)"
+
+
+class _GenerateParser(EditParser):
+    FUNCTIONS = {'uniform': 2, 'gauss': 2, 'choice': None, 'sequence': None,
+                 'walk': 2, 'linspace': 2}
+    OPERATORS = ('=',)
+
+
+def _sample(statement, count, rng):
+    args = statement.args
+    function = statement.function
+    if function is None:
+        return np.full(count, args[0])
+    if function == 'uniform':
+        return rng.uniform(args[0], args[1], count)
+    if function == 'gauss':
+        return rng.normal(args[0], args[1], count)
+    if function == 'choice':
+        return rng.choice(np.array(args), count)
+    if function == 'sequence':
+        return np.resize(np.array(args), count)
+    if function == 'walk':
+        steps = rng.normal(0.0, args[1], count)
+        steps[0] = 0.0
+        return args[0] + np.cumsum(steps)
+    return np.linspace(args[0], args[1], count)
+
+
+def parse_tracks(text, num_tracks):
+    """
+    Tracce da un testo come "0, 2-4" (vuoto o "all": tutte).
+    Solleva ValueError se una traccia non esiste.
+    """
+    text = text.strip()
+    if not text or text.lower() == 'all':
+        return list(range(num_tracks))
+    tracks = []
+    for part in text.split(','):
+        first, _, last = part.strip().partition('-')
+        try:
+            first = int(first)
+            last = int(last) if last else first
+        except ValueError:
+            raise ValueError(f"invalid track {part.strip()!r}")
+        if not 0 <= first <= last < num_tracks:
+            raise ValueError(f"track {part.strip()!r} out of range 0-{num_tracks - 1}")
+        tracks.extend(t for t in range(first, last + 1) if t not in tracks)
+    return tracks
+
+
+class ClipGenerator:
+    """Specifica compilata; `generate` restituisce le coppie (params, traccia)"""
+    def __init__(self, text, statements):
+        self.text = text
+        self.statements = statements
+        template = default_params()
+        for statement in statements:
+            if statement.name not in template:
+                raise QuerySyntaxError(f"unknown parameter {statement.name!r}")
+            if not is_number(read_field(template[statement.name], statement.indices)):
+                raise QuerySyntaxError(f"{statement.field} is not a numeric field")
+
+    def __repr__(self):
+        return f"ClipGenerator({self.text!r})"
+
+    def generate(self, count, start, end, tracks, seed=None):
+        """
+        count clip con inizio in [start, end] su tracce scelte a caso tra
+        `tracks`, ordinati per inizio. Solleva ValueError per opzioni non valide.
+        """
+        if count <= 0 or end < start or not tracks:
+            raise ValueError("generation needs clips, a time range and at least one track")
+        rng = np.random.default_rng(seed)
+        statements = list(self.statements)
+        attack = [s for s in statements if s.name == 'cAttacco']
+        starts = _sample(attack[-1], count, rng) if attack else rng.uniform(start, end, count)
+        starts = np.sort(np.clip(starts, start, end))
+        columns = {'cAttacco': starts}
+        for statement in statements:
+            if statement.name == 'cAttacco':
+                continue
+            column = _sample(statement, count, rng)
+            if statement.name == 'durata':
+                column = np.maximum(column, MIN_DURATION)
+            columns[(statement.name, tuple(statement.indices))] = column
+        track_column = rng.choice(np.asarray(tracks), count).tolist()
+
+        template = default_params()
+        records = []
+        values = {key: column.tolist() for key, column in columns.items()}
+        fields = [(key[0], list(key[1]), values[key]) for key in values if key != 'cAttacco']
+        for i in range(count):
+            # Copia leggera del template: liste nuove, scalari condivisi
+            params = {key: list(value) if isinstance(value, list) else value
+                      for key, value in template.items()}
+            params['cAttacco'] = round(values['cAttacco'][i], 6)
+            for name, indices, column in fields:
+                old = read_field(params.get(name), indices)
+                params[name] = write_field(params.get(name), indices, _convert(name, old, column[i]))
+            records.append((params, track_column[i]))
+        return records
+
+
+def _convert(name, old, new):
+    # I parametri interi nei default restano interi
+    if name not in FLOAT_PARAMS and is_number(old) and isinstance(old, int):
+        return int(round(new))
+    return float(round(new, 6))
+
+
+@functools.lru_cache(maxsize=32)
+def compile_generator(text):
+    """Compila una specifica di generazione. Solleva QuerySyntaxError"""
+    return ClipGenerator(text.strip(), _GenerateParser(text).parse())
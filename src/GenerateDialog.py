@@ -0,0 +1,75 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QDialog, QFormLayout, QSpinBox, QDoubleSpinBox, QLineEdit, QPlainTextEdit,
+    QDialogButtonBox, QMessageBox
+)
+
+from src.Generate import DEFAULT_SPEC, parse_tracks
+
+
+class GenerateDialog(QDialog):
+    """Genera molti clip da distribuzioni di parametri in un intervallo e su più tracce"""
+    def __init__(self, window, parent=None):
+        super().__init__(parent or window)
+        self.setWindowTitle("Generate Clips")
+        self.main_window = window
+        self.command = None
+        scene = window.scene
+
+        layout = QFormLayout()
+        self.count = QSpinBox()
+        self.count.setRange(1, 100000)
+        self.count.setValue(100)
+        layout.addRow("Clips:", self.count)
+
+        self.start = QDoubleSpinBox()
+        self.end = QDoubleSpinBox()
+        for spin, value in ((self.start, 0.0), (self.end, 60.0)):
+            spin.setDecimals(3)
+            spin.setRange(0.0, 1e6)
+            spin.setValue(value)
+        layout.addRow("Start (s):", self.start)
+        layout.addRow("End (s):", self.end)
+
+        # Di default la traccia selezionata, altrimenti tutte
+        self.tracks = QLineEdit("" if window.selected_track is None else str(window.selected_track))
+        self.tracks.setPlaceholderText(f"all (e.g. 0, 2-{max(scene.num_tracks - 1, 0)})")
+        layout.addRow("Tracks:", self.tracks)
+
+        self.spec = QPlainTextEdit(DEFAULT_SPEC)
+        self.spec.setToolTip("uniform(a, b), gauss(mean, sd), choice(...), sequence(...), "
+                             "walk(start, step), linspace(a, b)")
+        layout.addRow("Parameters:", self.spec)
+
+        self.seed = QLineEdit()
+        self.seed.setPlaceholderText("random")
+        layout.addRow("Seed:", self.seed)
+
+        self.name = QLineEdit("Gen")
+        layout.addRow("Name:", self.name)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.button(QDialogButtonBox.Ok).setText("Generate")
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    def keyPressEvent(self, event):
+        if (event.modifiers() & (Qt.ControlModifier | Qt.MetaModifier)) and event.key() == Qt.Key_W:
+            self.reject()
+        else:
+            super().keyPressEvent(event)
+
+    def accept(self):
+        """Genera i clip come un solo comando annullabile"""
+        try:
+            tracks = parse_tracks(self.tracks.text(), self.main_window.scene.num_tracks)
+            seed = int(self.seed.text()) if self.seed.text().strip() else None
+            self.command = self.main_window.generate_clips(
+                self.spec.toPlainText(), self.count.value(), self.start.value(),
+                self.end.value(), tracks, seed, self.name.text() or "Clip")
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Generation", str(e), QMessageBox.Ok)
+            return
+        super().accept()
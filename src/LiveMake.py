@@ -0,0 +1,118 @@
+import os
+from PyQt5.QtCore import QObject, QTimer, QProcess, pyqtSignal
+
+
+class LiveMake(QObject):
+    """
+    Ricostruzione automatica ("live make") della sezione corrente.
+
+    Quando è attiva, ogni comando eseguito dal CommandManager programma
+    un salvataggio seguito da `make SEZIONE=<file>` in background.
+    Le modifiche ravvicinate vengono accorpate dal timer di debounce e
+    le build non si sovrappongono mai: al massimo una in esecuzione e
+    una in attesa.
+
+    Signals:
+        build_started (str): Emesso con il nome della sezione all'avvio della build
+        build_finished (int, str): Emesso con exit code e output a build terminata
+
+    Attributes:
+        window: MainWindow che fornisce settings, file corrente e log
+        enabled: True se il live make è attivo
+        delay: Intervallo di debounce in millisecondi
+    """
+    build_started = pyqtSignal(str)
+    build_finished = pyqtSignal(int, str)
+
+    def __init__(self, window, delay=500):
+        super().__init__(window)
+        self.window = window
+        self.enabled = False
+        self.delay = delay
+        self._process = None
+        self._pending = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self.start_build)
+
+    @property
+    def is_running(self):
+        return self._process is not None
+
+    @property
+    def has_pending(self):
+        return self._pending
+
+    def set_enabled(self, enabled):
+        """Attiva o disattiva il live make"""
+        self.enabled = bool(enabled)
+        if not self.enabled:
+            self._timer.stop()
+            self._pending = False
+
+    def stop(self):
+        """Disattiva il live make e termina l'eventuale build in corso"""
+        self.set_enabled(False)
+        if self._process is not None:
+            self._process.finished.disconnect(self._on_finished)
+            self._process.kill()
+            self._process.waitForFinished(1000)
+            self._process = None
+
+    def on_command(self, command=None):
+        """Listener del CommandManager: ogni modifica riavvia il debounce"""
+        if self.enabled:
+            self._timer.start()
+
+    def start_build(self):
+        """Salva e avvia make, oppure accoda una build se una è già in corso"""
+        if self._process is not None:
+            self._pending = True
+            return
+
+        if not self.window.current_file:
+            self.window.log_message("Live make: nessun file YAML caricato/salvato.")
+            return
+
+        self.window.save_to_yaml()
+
+        make_dir = self.window.settings.get('make_directory')
+        section = os.path.splitext(os.path.basename(self.window.current_file))[0]
+
+        self._process = QProcess(self)
+        self._process.setWorkingDirectory(make_dir)
+        self._process.setProcessChannelMode(QProcess.MergedChannels)
+        self._process.finished.connect(self._on_finished)
+        self._process.errorOccurred.connect(self._on_error)
+
+        self.window.log_message(f"Live make: make SEZIONE={section}")
+        self.build_started.emit(section)
+        self._process.start('make', [f'SEZIONE={section}'])
+
+    def _on_finished(self, exit_code, exit_status=None):
+        output = ''
+        if self._process is not None:
+            output = bytes(self._process.readAll()).decode(errors='replace')
+            self._process.deleteLater()
+        self._process = None
+
+        if exit_code == 0:
+            self.window.log_message("Live make completato con successo!")
+        else:
+            self.window.log_message(f"Live make fallito (exit code {exit_code})")
+        if output:
+            self.window.log_message(f"Output:\n{output}")
+        self.build_finished.emit(exit_code, output)
+
+        if self._pending:
+            self._pending = False
+            if self.enabled:
+                self.start_build()
+
+    def _on_error(self, error):
+        # FailedToStart non emette finished: va gestito qui per non bloccare la coda
+        if error == QProcess.FailedToStart:
+            self.window.log_message("Live make: impossibile avviare make")
+            self._on_finished(-1)
@@ -0,0 +1,163 @@
+import ast
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from src.Params import is_number
+from src.ParamIndex import SEARCH_TOLERANCE
+
+# Debounce (ms) tra l'ultimo tasto premuto e la ricerca
+SEARCH_DELAY = 150
+
+
+def parse_search_value(text):
+    """
+    Valore cercato: un numero o una lista di numeri. Usa literal_eval,
+    quindi il testo non viene mai eseguito. Solleva ValueError/SyntaxError.
+    """
+    value = ast.literal_eval(text.strip())
+    if isinstance(value, (list, tuple)):
+        if not all(is_number(v) for v in value):
+            raise ValueError(f"not a list of numbers: {text}")
+        return list(value)
+    if not is_number(value):
+        raise ValueError(f"not a number: {text}")
+    return value
+
+
+def parse_search(text):
+    """
+    Testo della barra di ricerca: un valore (confrontato con il parametro
+    scelto) oppure una query su più parametri, restituita compilata
+    (ClipQuery). Solleva ValueError/SyntaxError.
+    """
+    try:
+        return parse_search_value(text)
+    except (ValueError, SyntaxError):
+        from src.ClipQuery import compile_query
+        return compile_query(text)
+
+
+def frozen_params(params):
+    """Copia in sola lettura dei parametri (liste come tuple)"""
+    return {key: _freeze(value) for key, value in params.items()}
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def params_match(params, param, value, tolerance=SEARCH_TOLERANCE):
+    """Stesso confronto di ParamIndex.find, su una copia dei parametri"""
+    current = params.get(param)
+    if isinstance(value, (list, tuple)):
+        return (isinstance(current, tuple) and len(current) == len(value)
+                and all(is_number(a) and abs(a - b) <= tolerance for a, b in zip(current, value)))
+    return is_number(current) and abs(current - value) <= tolerance
+
+
+class LiveSearch(QObject):
+    """
+    Ricerca mentre si scrive nella barra di ricerca (valore del parametro
+    scelto o query su più parametri, vedi parse_search).
+
+    Ogni modifica del testo o del parametro riavvia il timer di
+    debounce; allo scadere la ricerca gira su un thread di lavoro, su
+    una copia in sola lettura dei parametri dei clip (rifatta solo se
+    l'indice dei parametri segnala modifiche). I risultati tornano al
+    thread dell'interfaccia con un segnale e vengono applicati come
+    differenza con Timeline.set_highlighted: si ridisegnano solo i clip
+    che cambiano stato. I risultati di ricerche superate da una più
+    recente vengono scartati.
+
+    Signals:
+        results_ready (int, object): Emesso dal thread di lavoro con il numero della richiesta e i clip trovati
+        search_finished (int): Emesso dopo aver applicato i risultati, con il numero di clip evidenziati
+
+    Attributes:
+        window: MainWindow che fornisce scena e barra di ricerca
+        delay: Intervallo di debounce in millisecondi
+    """
+    results_ready = pyqtSignal(int, object)
+    search_finished = pyqtSignal(int)
+
+    def __init__(self, window, delay=SEARCH_DELAY):
+        super().__init__(window)
+        self.window = window
+        self.delay = delay
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='live-search')
+        self._request = 0
+        self._future = None
+        self._stopped = False
+        self._snapshot = ()
+        self._snapshot_version = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self.start_search)
+        self.results_ready.connect(self._apply_results)
+
+    @property
+    def is_running(self):
+        return self._future is not None and not self._future.done()
+
+    def on_query_changed(self, *args):
+        """Listener della barra di ricerca: ogni modifica riavvia il debounce"""
+        if not self._stopped:
+            self._timer.start()
+
+    def cancel(self):
+        """Annulla la ricerca programmata e scarta quella in corso"""
+        self._timer.stop()
+        self._request += 1
+
+    def stop(self):
+        """Annulla tutto e ferma il thread di lavoro"""
+        self.cancel()
+        self._stopped = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def snapshot(self):
+        """Copie (item, params, traccia) dei clip, rifatte solo dopo una modifica"""
+        scene = self.window.scene
+        version = scene.param_index.version
+        if version != self._snapshot_version:
+            self._snapshot = tuple((item, frozen_params(item.params), scene.track_at(item.pos().y()))
+                                   for item in scene.clip_items())
+            self._snapshot_version = version
+        return self._snapshot
+
+    def start_search(self):
+        self._timer.stop()
+        if self._stopped:
+            return
+        self._request += 1
+        text = self.window.search_value.text()
+        if not text.strip():
+            self.window.scene.set_highlighted(())
+            self.search_finished.emit(0)
+            return
+        try:
+            value = parse_search(text)
+        except (ValueError, SyntaxError):
+            # Testo ancora incompleto (es. "[7,"): restano i risultati precedenti
+            return
+        param = self.window.search_param.currentText()
+        self._future = self._executor.submit(self._evaluate, self._request, self.snapshot(), param, value)
+
+    def _evaluate(self, request, snapshot, param, value):
+        # Thread di lavoro: legge solo la copia dei parametri, mai gli item
+        if isinstance(value, (int, float, list)):
+            found = [item for item, params, _ in snapshot if params_match(params, param, value)]
+        else:
+            indices = value.indices([(params, track) for _, params, track in snapshot])
+            found = [snapshot[i][0] for i in indices]
+        self.results_ready.emit(request, found)
+
+    def _apply_results(self, request, found):
+        if request != self._request:
+            return
+        self.window.scene.set_highlighted(found)
+        self.search_finished.emit(len(found))
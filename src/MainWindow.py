@@ -1,11 +1,12 @@
-import yaml
-import subprocess
+import sys
+import copy
 from pathlib import Path
 import os
-from PyQt5.QtCore import Qt
+from PyQt5 import sip
+from PyQt5.QtCore import Qt, QTimer, QPointF
 from PyQt5.QtWidgets import (
     QMainWindow, QVBoxLayout, QPushButton, QWidget, QHBoxLayout, 
-    QFileDialog, QComboBox, QLineEdit, QLabel, QMessageBox, QTextEdit
+    QFileDialog, QComboBox, QLineEdit, QLabel, QMessageBox, QTextEdit, QGraphicsScene
 )
 from PyQt5.QtGui import QKeySequence  # Nuovo import
 """
@@ -20,21 +21,25 @@ from TimelineContainer import TimelineContainer
 from TrackHeaderView import TrackHeaderItem
 
 """
-from src.Timeline import *
+from src.Timeline import Timeline
 from src.TimelineView import TimelineView
-from src.RenameDialog import RenameDialog
 from src.MusicItem import MusicItem
 from src.Settings import Settings
-from src.SettingsDialog import SettingsDialog
-from src.Commands import CommandManager, ResizeItemCommand,SetPosCommand, MoveItemCommand
+from src.Commands import CommandManager, ResizeItemCommand,SetPosCommand, MoveItemCommand, EditParamsCommand, MoveItemsCommand, AddItemsCommand
 from src.TimelineContainer import TimelineContainer
-from src.TrackHeaderView import TrackHeaderItem
+from src.LiveMake import LiveMake
+from src.LiveSearch import LiveSearch, parse_search
+from src.Params import PARAM_NAMES, sort_by_attack, load_comportamenti, dump_comportamenti
+from src.ClipStyle import style_registry, THEME_KEYS
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.settings = Settings()
         self.command_manager = CommandManager()
+        self.live_make = LiveMake(self)
+        self.command_manager.add_listener(self.live_make.on_command)
+        self.live_search = LiveSearch(self)
         self.setWindowTitle("DPT - Delta Personal Timeline")
         self.setGeometry(100, 100, 1200, 600)
         self.current_file = None
@@ -56,6 +61,8 @@ class MainWindow(QMainWindow):
         self.timeline_container = TimelineContainer(self.scene)
         layout.addWidget(self.timeline_container)
         self.timeline_container.track_header_view.scene.track_selection_changed.connect(self.on_track_selection_changed)
+        # Le modifiche alle settings si applicano alla scena esistente
+        self.settings.subscribe(self.apply_settings)
         # Search bar
         layout.addWidget(self._create_search_bar())
         
@@ -84,12 +91,18 @@ class MainWindow(QMainWindow):
         search_layout = QHBoxLayout(search_widget)
         
         self.search_param = QComboBox()
-        self.search_param.addItems(['cAttacco', 'durataArmonica', 'ritmo', 'durata', 'ampiezza', 'frequenza', 'posizione'])
+        self.search_param.addItems(PARAM_NAMES)
         
         self.search_value = QLineEdit()
-        self.search_value.setPlaceholderText("Enter value to search...")
+        self.search_value.setPlaceholderText("Enter value to search, or a query (durata > 3 and track in {2,4})...")
         self.search_value.returnPressed.connect(self.perform_search)
+        # Ricerca mentre si scrive (debounce + thread di lavoro)
+        self.search_value.textChanged.connect(self.live_search.on_query_changed)
+        self.search_param.currentIndexChanged.connect(self.live_search.on_query_changed)
         
+        select_matches_btn = QPushButton("Select Matches")
+        select_matches_btn.clicked.connect(self.select_search_results)
+
         clear_search_btn = QPushButton("Clear Search")
         clear_search_btn.clicked.connect(self.clear_search)
         
@@ -97,6 +110,7 @@ class MainWindow(QMainWindow):
         search_layout.addWidget(self.search_param)
         search_layout.addWidget(QLabel("Value:"))
         search_layout.addWidget(self.search_value)
+        search_layout.addWidget(select_matches_btn)
         search_layout.addWidget(clear_search_btn)
         
         return search_widget
@@ -149,6 +163,15 @@ class MainWindow(QMainWindow):
         save_as_action.setShortcut('Ctrl+Shift+S')
         save_as_action.triggered.connect(self.save_as_yaml)
         
+        file_menu.addSeparator()
+
+        live_make_action = file_menu.addAction('&Live Make')
+        live_make_action.setShortcut('Ctrl+Shift+M')
+        live_make_action.setCheckable(True)
+        live_make_action.setChecked(False)
+        live_make_action.toggled.connect(self.toggle_live_make)
+        self.live_make_action = live_make_action
+
         file_menu.addSeparator()
         
         exit_action = file_menu.addAction('&Exit')
@@ -204,6 +227,18 @@ class MainWindow(QMainWindow):
         param_dialog_action = edit_menu.addAction('Show Parameters')
         param_dialog_action.setShortcut('Ctrl+Return')
         param_dialog_action.triggered.connect(lambda: self.show_param_dialog_for_selected())
+
+        bulk_edit_action = edit_menu.addAction('Bulk Edit Parameters...')
+        bulk_edit_action.setShortcut('Ctrl+Shift+Return')
+        bulk_edit_action.triggered.connect(self.show_bulk_edit_dialog)
+
+        transform_action = edit_menu.addAction('Transform Section...')
+        transform_action.setShortcut('Ctrl+Shift+T')
+        transform_action.triggered.connect(self.show_transform_dialog)
+
+        generate_action = edit_menu.addAction('Generate Clips...')
+        generate_action.setShortcut('Ctrl+Shift+G')
+        generate_action.triggered.connect(self.show_generate_dialog)
         
         # Movement actions
         move_right_action = edit_menu.addAction('Move Right')
@@ -283,6 +318,7 @@ class MainWindow(QMainWindow):
         - Open: Ctrl+O  
         - Save: Ctrl+S
         - Save As: Ctrl+Shift+S
+        - Live Make: Ctrl+Shift+M
         - Exit: Ctrl+Q
 
         Edit:
@@ -318,6 +354,7 @@ class MainWindow(QMainWindow):
         self.log_window.append(message)
 
     def run_make_command(self):
+        import subprocess
         try:
             make_dir = self.settings.get('make_directory')
             
@@ -348,6 +385,11 @@ class MainWindow(QMainWindow):
             self.log_message(f"Output errore:\n{e.stderr}")
             self.log_message(f"Output standard:\n{e.stdout}")
 
+    def toggle_live_make(self, enabled):
+        """Attiva/disattiva la ricostruzione automatica ad ogni modifica"""
+        self.live_make.set_enabled(enabled)
+        self.log_message(f"Live make {'attivo' if enabled else 'disattivato'}")
+
     def add_new_track(self):
         self.scene.num_tracks += 1
         required_height = self.scene.num_tracks * self.scene.track_height
@@ -374,25 +416,21 @@ class MainWindow(QMainWindow):
                         item_data['settings'], self.scene.track_height)
             item.params = item_data['params']
             item.color = item_data['color']
-            item.setBrush(item_data['color'])
             item.setPos(item_data['pos'])
             self.scene.addItem(item)
 
     def delete_selected_track(self):
         """Elimina la traccia selezionata, sia dalla selezione dell'header che della traccia stessa"""
-        # Controlla prima gli header selezionati
-        selected_headers = [item for item in self.timeline_container.track_header_view.scene.items() 
-                        if isinstance(item, TrackHeaderItem) and item.is_selected]
+        # Controlla prima le tracce selezionate negli header
+        selected_tracks = self.timeline_container.track_header_view.scene.selected_tracks()
         
-        if selected_headers:
-            for header in selected_headers:
-                self.scene.delete_track(header.track_number)
-        else:
-            # Comportamento esistente per la selezione della traccia
-            for item in self.scene.selectedItems():
-                if isinstance(item, TrackItem):
-                    self.scene.delete_track(item.track_number)
-                    break
+        if selected_tracks:
+            # Dall'ultima alla prima: gli indici delle precedenti restano validi
+            for track_number in reversed(selected_tracks):
+                self.scene.delete_track(track_number)
+        elif self.selected_track is not None:
+            # Le tracce non sono item della scena: si usa la traccia selezionata
+            self.scene.delete_track(self.selected_track)
 
     def copy_selected_items(self):
         """Copia gli item selezionati nella clipboard interna"""
@@ -411,23 +449,23 @@ class MainWindow(QMainWindow):
     def paste_items(self):
         """Incolla gli item dalla clipboard interna"""
         if hasattr(self, 'clipboard_items') and self.clipboard_items:
-            for item_data in self.clipboard_items:
-                # Creiamo un nuovo item con un piccolo offset per distinguerlo visivamente
-                new_item = MusicItem(0, 0, item_data['width'], 
-                                item_data['name'], 
-                                item_data['settings'],
-                                self.scene.track_height)
-                new_item.params = item_data['params'].copy()
-                new_item.color = item_data['color']
-                new_item.setBrush(item_data['color'])
+            with self.scene.batch_update():
+                for item_data in self.clipboard_items:
+                    # Creiamo un nuovo item con un piccolo offset per distinguerlo visivamente
+                    new_item = MusicItem(0, 0, item_data['width'], 
+                                    item_data['name'], 
+                                    item_data['settings'],
+                                    self.scene.track_height)
+                    new_item.params = item_data['params'].copy()
+                    new_item.color = item_data['color']
                 
-                # Aggiungiamo un piccolo offset alla posizione
-                new_x = new_item.params['cAttacco'] * self.scene.pixels_per_beat * self.scene.zoom_level + 20
-                new_y = item_data['track_index'] * self.scene.track_height
-                new_item.setPos(new_x, new_y)
-                new_item.params['cAttacco'] = new_x / (self.scene.pixels_per_beat * self.scene.zoom_level)
+                    # Aggiungiamo un piccolo offset alla posizione
+                    new_x = new_item.params['cAttacco'] * self.scene.pixels_per_beat * self.scene.zoom_level + 20
+                    new_y = item_data['track_index'] * self.scene.track_height
+                    new_item.setPos(new_x, new_y)
+                    new_item.params['cAttacco'] = new_x / (self.scene.pixels_per_beat * self.scene.zoom_level)
                 
-                self.scene.addItem(new_item)
+                    self.scene.addItem(new_item)
 
     def set_item_pos(self, item, new_pos):
         old_pos = item.pos()
@@ -436,43 +474,121 @@ class MainWindow(QMainWindow):
 
 
     def sort_items_by_attack(self, items):
-        return sorted(items, key=lambda x: float(x['cAttacco']))
+        return sort_by_attack(items)
 
     def show_settings_dialog(self):
-        dialog = SettingsDialog(self.settings, self)
-        if dialog.exec_():
-            stored_items = []
-            for item in self.scene.items():
-                if isinstance(item, MusicItem):
-                    stored_items.append({
-                        'params': item.params.copy(),
-                        'pos': item.pos(),
-                        'width': item.rect().width(),
-                        'color': item.color,
-                        'name': item.name,
-                        'settings': item.settings
-                    })
-            
-            self.scene.clear()
-            self.scene.draw_tracks()
-            self.timeline_container.ruler_scene.updateColors()
-            self.timeline_container.ruler_scene.draw_ruler()
-            
-            for item_data in stored_items:
-                item = MusicItem(0, 0, item_data['width'], item_data['name'], 
-                            item_data['settings'], self.scene.track_height)
-                item.params = item_data['params']
-                item.color = item_data['color']
-                item.setBrush(item_data['color'])
-                item.setPos(item_data['pos'])
-                self.scene.addItem(item)
-                item.updateTextStyle()
+        # Import lazy: i dialoghi non servono all'avvio
+        from src.SettingsDialog import SettingsDialog
+        # Le modifiche arrivano ad apply_settings: i clip, la selezione e
+        # la cronologia degli undo restano quelli di prima
+        SettingsDialog(self.settings, self).exec_()
+
+    def apply_settings(self, keys):
+        """Aggiorna in place solo gli stili toccati dalle chiavi cambiate"""
+        if sip.isdeleted(self.scene):
+            return
+        if not keys.isdisjoint(THEME_KEYS):
+            self.update_all_items_style()
+        if 'track_background_color' in keys:
+            # Timeline.track_brush segue il colore: basta ridisegnare lo sfondo
+            self.scene.invalidate(self.scene.sceneRect(), QGraphicsScene.BackgroundLayer)
+        ruler = self.timeline_container.ruler_scene
+        if 'timeline_background_color' in keys:
+            ruler.updateColors()
+        if 'timeline_text_size' in keys:
+            ruler.draw_ruler()
+        if 'render_profile' in keys:
+            self.timeline_container.timeline_view.apply_render_profile(self.settings.get('render_profile'))
 
     def show_param_dialog_for_selected(self):
         selected = self.scene.selectedItems()
         if selected and isinstance(selected[0], MusicItem):
             selected[0].showParamDialog()
 
+    def show_bulk_edit_dialog(self):
+        from src.BulkEditDialog import BulkEditDialog
+        dialog = BulkEditDialog(self)
+        dialog.exec_()
+
+    def bulk_edit(self, text, items):
+        """
+        Applica una modifica in blocco (es. "durata *= 1.5") ai clip indicati
+        come un solo comando annullabile. Restituisce il comando, o None se
+        nessun clip cambia. Solleva QuerySyntaxError se il testo non è valido.
+        """
+        from src.BulkEdit import compile_edit
+        edit = compile_edit(text)
+        # Ordine di inizio: linspace va dal primo all'ultimo clip nel tempo
+        targets = set(items)
+        items = [item for item in self.scene.clip_index if item in targets]
+        changes = edit.apply([item.params for item in items])
+        changed = [(item, values) for item, values in zip(items, changes) if values]
+        if not changed:
+            return None
+        command = EditParamsCommand(
+            [item for item, _ in changed],
+            [{key: copy.deepcopy(item.params[key]) for key in values} for item, values in changed],
+            [values for _, values in changed]
+        )
+        self.command_manager.execute(command)
+        self.log_message(f"Modifica in blocco su {len(changed)} clip: {edit.text}")
+        return command
+
+    def show_transform_dialog(self):
+        from src.TransformDialog import TransformDialog
+        dialog = TransformDialog(self)
+        dialog.exec_()
+
+    def transform_clips(self, operation, items, **options):
+        """
+        Applica una trasformazione di sezione (stretch, quantize, insert,
+        delete, shift_tracks) ai clip indicati come un solo comando
+        annullabile. Restituisce il comando, o None se nessun clip cambia.
+        """
+        from src.Transforms import time_changes, TRANSFORMS
+        plan = self.scene.transform_plan(operation, items, **options)
+        if not plan:
+            return None
+        items = [item for item, *_ in plan]
+        if operation == 'shift_tracks':
+            command = MoveItemsCommand(
+                items,
+                [item.pos() for item in items],
+                [QPointF(item.pos().x(), track * self.scene.track_height) for item, _, _, track in plan]
+            )
+        else:
+            import numpy as np
+            changes = time_changes([item.params for item in items],
+                                   np.array([start for _, start, _, _ in plan]),
+                                   np.array([duration for _, _, duration, _ in plan]))
+            command = EditParamsCommand(
+                items,
+                [{key: copy.deepcopy(item.params[key]) for key in values}
+                 for item, values in zip(items, changes)],
+                changes
+            )
+        self.command_manager.execute(command)
+        self.log_message(f"{TRANSFORMS[operation][0]}: {len(items)} clip")
+        return command
+
+    def show_generate_dialog(self):
+        from src.GenerateDialog import GenerateDialog
+        dialog = GenerateDialog(self)
+        dialog.exec_()
+
+    def generate_clips(self, text, count, start, end, tracks, seed=None, name="Clip"):
+        """
+        Genera count clip dalle distribuzioni di `text` (vedi Generate) tra
+        start e end sulle tracce indicate e li inserisce come un solo
+        comando annullabile. Solleva ValueError se la specifica non è valida.
+        """
+        from src.Generate import compile_generator
+        records = compile_generator(text).generate(count, start, end, tracks, seed)
+        command = AddItemsCommand(self.scene, records, name)
+        self.command_manager.execute(command)
+        self.log_message(f"Generati {len(records)} clip tra {start:g}s e {end:g}s")
+        return command
+
     def move_items_on_tracks(self, direction):
         selected_items = self.scene.selectedItems()
         track_groups = {}
@@ -540,14 +656,14 @@ class MainWindow(QMainWindow):
         selected_items = self.scene.selectedItems()
         if not selected_items:
             return
-            
+
+        from src.RenameDialog import RenameDialog
         dialog = RenameDialog(self)
         if dialog.exec_():
             new_name = dialog.name_input.text()
             for item in selected_items:
                 if isinstance(item, MusicItem):
                     item.name = new_name
-                    item.text.setPlainText(new_name)
 
     def on_track_selection_changed(self, track_number, is_selected):
         if is_selected:
@@ -595,26 +711,16 @@ class MainWindow(QMainWindow):
             
             sorted_items = self.sort_items_by_attack(items)
             
-            class CustomDumper(yaml.SafeDumper):
-                def represent_sequence(self, tag, sequence, flow_style=None):
-                    if len(sequence) > 0 and isinstance(sequence[0], list):
-                        flow_style = True
-                    return super().represent_sequence(tag, sequence, flow_style)
-            
             try:
                 with open(self.current_file, 'w') as f:
-                    yaml.dump({"comportamenti": sorted_items}, f, 
-                            Dumper=CustomDumper, 
-                            default_flow_style=None, 
-                            sort_keys=False, 
-                            indent=1, 
-                            allow_unicode=True)
+                    dump_comportamenti(sorted_items, f)
                 self.update_window_title()
                 self.log_message(f"File salvato con successo: {self.current_file}")
             except Exception as e:
                 self.log_message(f"Errore nel salvataggio del file: {e}")
 
     def load_from_yaml(self, test_mode=False):
+        import yaml
         if not test_mode:
             last_dir = self.settings.get('last_open_directory')
             initial_dir = os.path.join(last_dir, '') if os.path.exists(last_dir) else ""
@@ -627,34 +733,34 @@ class MainWindow(QMainWindow):
                 self.settings.set('last_open_directory', str(Path(file_path).parent))
                 self.current_file = file_path
                 
-                with open(file_path, 'r') as f:
-                    data = yaml.safe_load(f)
-
-                self.scene.clear()
-                self.scene.num_tracks = len(data['comportamenti'])
-                self.scene.setSceneRect(0, 0, self.scene.sceneRect().width(),
-                                        (self.scene.num_tracks * self.scene.track_height))
-                self.scene.draw_tracks()
-
-                for i, item_data in enumerate(data['comportamenti']):
-                    processed_data = {}
-                    for key, value in item_data.items():
-                        if isinstance(value, list):
-                            processed_value = [str(item) if isinstance(item, str) else item for item in value]
-                            processed_data[key] = processed_value
-                        else:
-                            processed_data[key] = value
-
-                    x_pos = round(float(processed_data['cAttacco']) * self.scene.pixels_per_beat * self.scene.zoom_level, 2)
-                    width = float(processed_data['durata'][0] if isinstance(processed_data['durata'], (list, tuple)) 
-                                else processed_data['durata'])
-                    width *= round(self.scene.pixels_per_beat * self.scene.zoom_level, 2)
+                data = load_comportamenti(file_path)
+
+                with self.scene.batch_update():
+                    self.scene.clear()
+                    self.scene.num_tracks = len(data['comportamenti'])
+                    self.scene.setSceneRect(0, 0, self.scene.sceneRect().width(),
+                                            (self.scene.num_tracks * self.scene.track_height))
+                    self.scene.draw_tracks()
+                    style_registry(self.settings).refresh()
+
+                    for i, item_data in enumerate(data['comportamenti']):
+                        processed_data = {}
+                        for key, value in item_data.items():
+                            if isinstance(value, list):
+                                processed_value = [str(item) if isinstance(item, str) else item for item in value]
+                                processed_data[key] = processed_value
+                            else:
+                                processed_data[key] = value
+
+                        x_pos = round(float(processed_data['cAttacco']) * self.scene.pixels_per_beat * self.scene.zoom_level, 2)
+                        width = float(processed_data['durata'][0] if isinstance(processed_data['durata'], (list, tuple)) 
+                                    else processed_data['durata'])
+                        width *= round(self.scene.pixels_per_beat * self.scene.zoom_level, 2)
                     
-                    item = MusicItem(0, 0, width, "Clip", self.settings, self.scene.track_height)
-                    item.params = {k: (str(v) if isinstance(v, str) else v) for k, v in processed_data.items()}
-                    item.setPos(x_pos, (i * self.scene.track_height))
-                    self.scene.addItem(item)
-                    item.updateTextStyle()
+                        item = MusicItem(0, 0, width, "Clip", self.settings, self.scene.track_height)
+                        item.params = {k: (str(v) if isinstance(v, str) else v) for k, v in processed_data.items()}
+                        item.setPos(x_pos, (i * self.scene.track_height))
+                        self.scene.addItem(item)
 
                 self.update_window_title()
                 self.log_message(f"File caricato con successo: {file_path}")
@@ -747,15 +853,23 @@ class MainWindow(QMainWindow):
                 event.ignore()
                 return
 
+        self.live_make.stop()
+        self.live_search.stop()
+        self.settings.unsubscribe(self.apply_settings)
+        # Scollega le scrollbar sincronizzate prima della distruzione delle viste
+        self.timeline_container.close()
+
         # Salva le ultime directory usate
         last_open = self.settings.get('last_open_directory')
         self.settings.set('last_save_directory', last_open)
+        self.settings.flush()
         super().closeEvent(event)
 
     def update_all_items_style(self):
-        for item in self.scene.items():
-            if isinstance(item, MusicItem):
-                item.updateTextStyle()
+        # Lo stile delle etichette è condiviso: basta rileggere il tema
+        # una volta e ridisegnare la scena
+        style_registry(self.settings).refresh()
+        self.scene.update()
 
     def delete_selected_items(self):
         selected_items = self.scene.selectedItems()
@@ -763,41 +877,44 @@ class MainWindow(QMainWindow):
             if isinstance(item, MusicItem):
                 self.scene.removeItem(item)
                 
+    def search_results(self):
+        """
+        Clip che soddisfano la ricerca corrente: il valore del parametro
+        scelto (via param_index) oppure una query. Solleva ValueError/SyntaxError.
+        """
+        search = parse_search(self.search_value.text())
+        if isinstance(search, (int, float, list)):
+            return self.scene.param_index.find(self.search_param.currentText(), search)
+        return self.scene.query(search)
+
     def perform_search(self):
-        param = self.search_param.currentText()
-        value = self.search_value.text()
-        
+        """Evidenzia subito i clip trovati dalla ricerca"""
         try:
-            if value.startswith('[') and value.endswith(']'):
-                search_value = eval(value)
-            else:
-                search_value = float(value)
-                
-            self.clear_search()
-            
-            for item in self.scene.items():
-                if isinstance(item, MusicItem):
-                    item_value = item.params.get(param)
-                    
-                    if isinstance(item_value, (list, tuple)) and isinstance(search_value, (list, tuple)):
-                        if len(item_value) == len(search_value) and all(abs(a - b) < 0.001 for a, b in zip(item_value, search_value)):
-                            item.highlighted = True
-                    elif not isinstance(item_value, (list, tuple)) and not isinstance(search_value, (list, tuple)):
-                        if abs(item_value - search_value) < 0.001:
-                            item.highlighted = True
-            
-            self.scene.update()
+            results = self.search_results()
+            # Il risultato di una ricerca live ancora in corso non deve sovrascrivere questo
+            self.live_search.cancel()
+            self.scene.set_highlighted(results)
             
         except (ValueError, SyntaxError) as e:
             self.log_message(f"Errore nella ricerca: {str(e)}")
             QMessageBox.warning(self, "Search Error", f"Invalid search value: {str(e)}")
+
+    def select_search_results(self):
+        """Seleziona (ed evidenzia) i clip trovati dalla ricerca"""
+        try:
+            results = self.search_results()
+        except (ValueError, SyntaxError) as e:
+            self.log_message(f"Errore nella ricerca: {str(e)}")
+            QMessageBox.warning(self, "Search Error", f"Invalid search value: {str(e)}")
+            return
+        self.live_search.cancel()
+        self.scene.set_highlighted(results)
+        self.scene.select_items(results)
+        self.log_message(f"{len(results)} clip selezionati")
             
     def clear_search(self):
-        for item in self.scene.items():
-            if isinstance(item, MusicItem):
-                if hasattr(item, 'highlighted'):
-                    item.highlighted = False
-        self.scene.update()
+        self.live_search.cancel()
+        self.scene.set_highlighted(())
 
     def keyPressEvent(self, event):
         """Gestisce gli eventi da tastiera a livello di finestra"""
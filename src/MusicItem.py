@@ -1,14 +1,281 @@
-from PyQt5.QtCore import Qt, QPointF
-from PyQt5.QtGui import QPen, QColor
+from PyQt5.QtCore import Qt, QPointF, QRectF, QTimer
+from PyQt5.QtGui import QPen, QColor, QBrush, QFont, QFontMetricsF, QStaticText
 from PyQt5.QtWidgets import (
-    QGraphicsRectItem, QGraphicsTextItem, QGraphicsItem
+    QGraphicsRectItem, QGraphicsItem
 )
 """
 from ParamDialog import ParamDialog
 from Commands import MoveItemCommand
 """
-from src.ParamDialog import ParamDialog
-from src.Commands import MoveItemCommand
+from src.Commands import MoveItemsCommand
+from src.Params import default_params, ClipParams
+from src.ClipStyle import style_registry, label_style, shared_color, shared_font
+
+# Penne comuni a tutti i clip, create una volta sola
+BORDER_PEN = QPen(Qt.black)
+SELECTION_PEN = QPen(Qt.blue, 2, Qt.DashLine)
+HIGHLIGHT_PEN = QPen(QColor(255, 165, 0), 3)
+HIGHLIGHT_BRUSH = QBrush(QColor(255, 165, 0))
+DEFAULT_CLIP_COLOR = QColor(100, 150, 200)
+
+# Level of detail: larghezza del clip sullo schermo (pixel) sotto la quale
+# non si disegnano l'etichetta e, più in basso ancora, bordo e selezione
+LOD_LABEL_WIDTH = 24
+LOD_BORDER_WIDTH = 4
+
+# Intervallo minimo (ms) tra due aggiornamenti di un trascinamento: ~60 fps
+DRAG_FRAME_INTERVAL = 16
+
+# Brush (normale, hover, selezionato) per colore, condivisi tra i clip
+_state_brushes = {}
+
+
+def state_brushes(color):
+    """Brush precalcolati per i tre stati di un clip del colore dato"""
+    key = color.rgba()
+    brushes = _state_brushes.get(key)
+    if brushes is None:
+        brushes = (
+            QBrush(color),
+            QBrush(color.lighter(110)),  # hover: leggermente più chiaro
+            QBrush(color.lighter(140)),  # selezionato: molto più chiaro
+        )
+        _state_brushes[key] = brushes
+    return brushes
+
+
+# Etichette elise già impaginate, chiave (testo, larghezza, font)
+_label_cache = {}
+_LABEL_CACHE_SIZE = 4096
+_font_metrics = {}
+
+
+def font_metrics(font):
+    key = font.key()
+    metrics = _font_metrics.get(key)
+    if metrics is None:
+        metrics = _font_metrics[key] = QFontMetricsF(font)
+    return metrics
+
+
+def elided_label(text, width, font):
+    """QStaticText del testo eliso alla larghezza data, condiviso tra i clip"""
+    key = (text, int(width), font.key())
+    static = _label_cache.get(key)
+    if static is None:
+        if len(_label_cache) >= _LABEL_CACHE_SIZE:
+            _label_cache.clear()
+        elided = font_metrics(font).elidedText(text, Qt.ElideRight, int(width))
+        static = QStaticText(elided)
+        static.setTextFormat(Qt.PlainText)
+        static.setPerformanceHint(QStaticText.AggressiveCaching)
+        static.prepare(font=font)
+        _label_cache[key] = static
+    return static
+
+
+class ClipLabel:
+    """
+    Etichetta di un MusicItem, disegnata direttamente in MusicItem.paint.
+
+    Sostituisce il QGraphicsTextItem figlio mantenendone la parte di API
+    usata nel progetto (testo, font, colore, posizione). Il testo viene
+    eliso alla larghezza del clip con QFontMetricsF.elidedText e il
+    risultato è memorizzato in una cache condivisa.
+
+    Font, colore e penna non sono dell'etichetta: arrivano dal
+    StyleRegistry delle settings come LabelStyle condiviso, risolto di
+    nuovo solo quando il tema cambia. setFont e setDefaultTextColor
+    fissano un font o un colore esplicito (anch'essi condivisi).
+    """
+    MARGIN = 5
+
+    def __init__(self, item, text, registry=None):
+        self._item = item
+        self._text = text
+        self._pos = QPointF(self.MARGIN, 0)
+        self._registry = registry or style_registry()
+        self._height = None  # Altezza a cui scalare il font del tema (updateHeight)
+        self._font = None  # Font esplicito, altrimenti quello del tema
+        self._color = None  # Colore esplicito, altrimenti quello del tema
+        self._style = None
+        self._version = -1
+
+    @property
+    def registry(self):
+        return self._registry
+
+    @property
+    def style(self):
+        """LabelStyle condiviso in uso"""
+        registry = self._registry
+        if self._style is None or self._version != registry.version:
+            self._style = label_style(self._font or registry.font(self._height),
+                                      self._color or registry.color)
+            self._version = registry.version
+        return self._style
+
+    def _restyle(self):
+        self._style = None
+        self._item.update()
+
+    def toPlainText(self):
+        return self._text
+
+    def setPlainText(self, text):
+        self._text = text
+        self._item.update()
+
+    def font(self):
+        return QFont(self.style.font)
+
+    def setFont(self, font):
+        self._font = shared_font(font)
+        self._restyle()
+
+    def defaultTextColor(self):
+        return QColor(self.style.color)
+
+    def setDefaultTextColor(self, color):
+        self._color = shared_color(color)
+        self._restyle()
+
+    def scale_to(self, height):
+        """Usa il font del tema scalato all'altezza del clip"""
+        self._height = height
+        self._font = None
+        self._restyle()
+
+    def follow_theme(self):
+        """Torna al font e al colore del tema, senza scala né valori espliciti"""
+        self._height = self._font = self._color = None
+        self._restyle()
+
+    def pos(self):
+        return QPointF(self._pos)
+
+    def setPos(self, x, y=None):
+        self._pos = QPointF(x) if y is None else QPointF(x, y)
+        self._item.update()
+
+    def boundingRect(self):
+        """Rettangolo del testo completo (non eliso)"""
+        metrics = font_metrics(self.style.font)
+        return QRectF(0, 0, metrics.horizontalAdvance(self._text), metrics.height())
+
+    def paint(self, painter, rect):
+        available_width = rect.right() - self._pos.x() - self.MARGIN
+        if available_width <= 0 or not self._text:
+            return
+        style = self.style
+        painter.setFont(style.font)
+        painter.setPen(style.pen)
+        painter.drawStaticText(self._pos, elided_label(self._text, available_width, style.font))
+
+
+class GroupDrag:
+    """
+    Trascinamento dei clip selezionati come un unico blocco.
+
+    Al primo movimento i clip diventano figli di un item contenitore
+    temporaneo: ogni spostamento del mouse diventa un solo setPos del
+    gruppo, applicato al massimo una volta per frame (DRAG_FRAME_INTERVAL).
+    Posizioni, tracce e cAttacco dei singoli clip vengono scritti una
+    volta sola in `finish`, che restituisce il comando annullabile.
+    """
+    def __init__(self, scene, anchor, items, origin):
+        self.scene = scene
+        self.items = list(items)
+        self.origin = QPointF(origin)
+        self.anchor = anchor
+        self.anchor_pos = anchor.pos()
+        self.excluded = set(self.items)
+        self.start_positions = [item.pos() for item in self.items]
+        tracks = [self._track_of(pos.y()) for pos in self.start_positions]
+        self.min_x = min(pos.x() for pos in self.start_positions)
+        self.min_track = min(tracks)
+        self.max_track = max(tracks)
+        self.offset = QPointF(0, 0)
+        self.updates = 0
+        self._pending = None
+
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DRAG_FRAME_INTERVAL)
+        self._timer.timeout.connect(self.flush)
+
+        # Contenitore senza contenuto: a differenza di QGraphicsItemGroup
+        # lascia gli eventi del mouse al clip afferrato
+        scene.group_drag = self
+        self.group = QGraphicsRectItem()
+        self.group.setFlag(QGraphicsItem.ItemHasNoContents)
+        scene.addItem(self.group)
+        for item in self.items:
+            item.setParentItem(self.group)
+
+    def _track_of(self, y):
+        return max(0, min(int(y / self.scene.track_height), self.scene.num_tracks - 1))
+
+    def move_to(self, scene_pos):
+        """Registra la posizione del mouse; il gruppo si sposta al prossimo frame"""
+        self._pending = QPointF(scene_pos)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def constrain(self, delta):
+        """
+        Spostamento del gruppo: il clip afferrato si aggancia ai bordi
+        degli altri clip o alle tacche del righello se vicini, altrimenti
+        alla griglia; niente x negative, solo tracce valide.
+        """
+        target_x = self.anchor_pos.x() + delta.x()
+        left = target_x + self.anchor.rect().x()
+        correction = None
+        if hasattr(self.scene, 'magnetic_snap'):
+            correction = self.scene.magnetic_snap((left, left + self.anchor.rect().width()), self.excluded)
+        if correction is not None:
+            target_x += correction
+        else:
+            grid_size = (self.scene.pixels_per_beat * self.scene.zoom_level) / 16
+            target_x = 0 if target_x < grid_size else round(target_x / grid_size) * grid_size
+        dx = max(target_x - self.anchor_pos.x(), -self.min_x)
+
+        anchor_track = self._track_of(self.anchor_pos.y())
+        target_track = int((self.anchor_pos.y() + delta.y()) // self.scene.track_height)
+        track_delta = max(-self.min_track,
+                          min(target_track - anchor_track,
+                              self.scene.num_tracks - 1 - self.max_track))
+        return QPointF(dx, track_delta * self.scene.track_height)
+
+    def flush(self):
+        """Applica l'ultima posizione registrata con un solo setPos del contenitore"""
+        if self._pending is None:
+            return
+        offset = self.constrain(self._pending - self.origin)
+        self._pending = None
+        if offset != self.offset:
+            self.offset = offset
+            self.group.setPos(offset)
+            self.updates += 1
+
+    def finish(self):
+        """Scioglie il gruppo e restituisce il comando di spostamento (None se fermo)"""
+        self._timer.stop()
+        self.flush()
+        try:
+            # Tornando figli della scena i clip riprendono la posizione di
+            # partenza: quella finale la scrive move_items
+            for item in self.items:
+                item.setParentItem(None)
+            self.scene.removeItem(self.group)
+        finally:
+            self.scene.group_drag = None
+        if self.offset == QPointF(0, 0):
+            return None
+        new_positions = [pos + self.offset for pos in self.start_positions]
+        self.scene.move_items(self.items, new_positions)
+        return MoveItemsCommand(self.items, self.start_positions, new_positions)
+
 
 class MusicItem(QGraphicsRectItem):
     def __init__(self, x, y, width, name="Clip", settings = None, track_height=40):
@@ -18,28 +285,54 @@ class MusicItem(QGraphicsRectItem):
         self.setFlag(QGraphicsItem.ItemIsMovable)
         self.setFlag(QGraphicsItem.ItemIsSelectable)  # Abilita la selezione
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges)
-        self.color = QColor(100, 150, 200)  # Default color
-        self.setBrush(self.color)
-        self.setPen(QPen(Qt.black))
+        self.color = DEFAULT_CLIP_COLOR
+        self.setPen(BORDER_PEN)
+        self.highlighted = False  # Evidenziazione della ricerca
         self.track_index = 0  # inizializza
+        self.text = ClipLabel(self, name, style_registry(settings))
         self.name = name
-        self.text = QGraphicsTextItem(self.name, self)
         self.text.setPos(5, track_height/4)
         self.drag_start = None
+        self._drag = None  # GroupDrag in corso
         self.track_index = 0  # inizializza
         self.setAcceptHoverEvents(True)  # Aggiungi questa riga
         self.is_hovered = False  # Aggiungi questa riga
-        if settings:
-            self.text.setDefaultTextColor(QColor(settings.get('text_color', '#000000')))        
-        self.params = {
-            "cAttacco": 0.0,
-            "durataArmonica": 26,
-            "ritmo": [7,15],
-            "durata": 5.0,
-            "ampiezza": [-30,-0.25],
-            "frequenza": [6,1],
-            "posizione": -8
-        }
+        self.params = default_params()
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+        self.text.setPlainText(value)
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        # Colore e brush degli stati sono condivisi tra i clip dello stesso colore
+        self._color = shared_color(value)
+        self._brushes = state_brushes(self._color)
+        self.setBrush(self._brushes[0])
+
+    @property
+    def params(self):
+        return self._params
+
+    @params.setter
+    def params(self, value):
+        # ClipParams avvisa l'indice dei parametri della scena a ogni modifica
+        self._params = ClipParams(value, on_change=self._params_changed)
+        self._params_changed()
+
+    def _params_changed(self):
+        index = getattr(self.scene(), 'param_index', None)
+        if index is not None:
+            index.touch(self)
 
     @property
     def cAttacco(self):
@@ -63,6 +356,16 @@ class MusicItem(QGraphicsRectItem):
             new_width = float(value) * self.scene().pixels_per_beat * self.scene().zoom_level
             self.setRect(0, 0, new_width, self.rect().height())
 
+    def setRect(self, *args):
+        super().setRect(*args)
+        self._invalidate_index(self.scene())
+
+    @staticmethod
+    def _invalidate_index(scene):
+        index = getattr(scene, 'clip_index', None)
+        if index is not None:
+            index.invalidate()
+
     def updateHeight(self, new_height):
         """
         Aggiorna l'altezza dell'item e scala il testo proporzionalmente
@@ -72,53 +375,32 @@ class MusicItem(QGraphicsRectItem):
         current_rect = self.rect()
         self.setRect(0, 0, current_rect.width(), new_height)
         
-        # Calcola la dimensione del testo proporzionale all'altezza
-        base_text_size = self.settings.get('item_text_size', 12)
-        height_ratio = new_height / 50  # 50 è l'altezza di default
-        new_text_size = max(8, min(base_text_size * height_ratio, 24))  # Limita tra 8 e 24
-        
-        # Aggiorna il font del testo
-        font = self.text.font()
-        font.setPointSize(int(new_text_size))
-        self.text.setFont(font)
-        
-        # Centra verticalmente il testo nel nuovo spazio
-        text_height = self.text.boundingRect().height()
+        # Il font del tema viene scalato con l'altezza (tra 8 e 24 punti)
+        self.text.scale_to(new_height)
+
+        # Centra verticalmente il testo nel nuovo spazio; l'elisione
+        # alla larghezza del clip avviene in paint
+        text_height = font_metrics(self.text.style.font).height()
         vertical_center = (new_height - text_height) / 2
         self.text.setPos(5, vertical_center)
-        
-        # Se il testo è troppo largo, aggiungi dei puntini di sospensione
-        text_width = self.text.boundingRect().width()
-        available_width = current_rect.width() - 10  # 10 pixel di margine
-        
-        if text_width > available_width:
-            original_text = self.text.toPlainText()
-            # Trova la lunghezza massima del testo che si adatta
-            ellipsis = "..."
-            i = len(original_text)
-            while i > 0 and self.text.boundingRect().width() > available_width:
-                i -= 1
-                self.text.setPlainText(original_text[:i] + ellipsis)  
 
     def updateTextStyle(self):
-        if self.settings:
-            font = self.text.font()
-            font.setPointSize(self.settings.get('item_text_size', 12))
-            self.text.setFont(font)
-            self.text.setDefaultTextColor(QColor(self.settings.get('text_color', '#000000')))
+        """Riporta l'etichetta al tema delle settings"""
+        self.text.registry.refresh()
+        self.text.follow_theme()
 
     def mouseDoubleClickEvent(self, event):
         self.showParamDialog()
 
     def showParamDialog(self):
         """Mostra il dialog per modificare i parametri dell'item"""
+        from src.ParamDialog import ParamDialog
         dialog = ParamDialog(self.params, self.color)
         dialog.item = self
         if dialog.exec_():
             # Il dialogo si occupa già di aggiornare i params dell'item
             # poiché mantiene un riferimento al dizionario originale
             self.color = dialog.color
-            self.setBrush(self.color)
             
             if self.scene():
                 new_x = self.params['cAttacco'] * self.scene().pixels_per_beat * self.scene().zoom_level
@@ -134,6 +416,9 @@ class MusicItem(QGraphicsRectItem):
                 self.text.setPos(5, self.rect().height()/4)
                 
     def itemChange(self, change, value):
+        if change == QGraphicsItem.ItemPositionChange and getattr(self.scene(), 'exact_positions', False):
+            # Posizioni già calcolate (Timeline.move_items): niente snap
+            return super().itemChange(change, value)
         if change == QGraphicsItem.ItemPositionChange and self.scene():
             newPos = value
             grid_size = (self.scene().pixels_per_beat * self.scene().zoom_level) / 16
@@ -154,12 +439,16 @@ class MusicItem(QGraphicsRectItem):
             # Update cAttacco
             self.params['cAttacco'] = float(round(grid_x / (self.scene().pixels_per_beat * self.scene().zoom_level), 3))
             
-            if self.isSelected() and not hasattr(self, '_updating_group'):
+            # Lo spostamento di un clip selezionato trascina il resto della
+            # selezione; la guardia è sulla scena, così gli item spostati
+            # qui non propagano a loro volta
+            scene = self.scene()
+            if self.isSelected() and not getattr(scene, 'moving_group', False):
                 delta_x = round(grid_x - self.pos().x(),3)
                 delta_y = newPos.y() - self.pos().y()
                 delta = QPointF(delta_x, delta_y)
                 
-                self._updating_group = True
+                scene.moving_group = True
                 try:
                     for item in self.scene().selectedItems():
                         if item != self and isinstance(item, MusicItem):
@@ -174,79 +463,43 @@ class MusicItem(QGraphicsRectItem):
                             item.track_index = new_item_track
                             item.params['cAttacco'] = new_item_pos.x() / (self.scene().pixels_per_beat * self.scene().zoom_level)
                 finally:
-                    delattr(self, '_updating_group')
+                    scene.moving_group = False
             
             return QPointF(grid_x, track_y)
-            
+
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            self._invalidate_index(self.scene())
+            # La traccia è un campo delle query di ricerca
+            self._params_changed()
+        elif change == QGraphicsItem.ItemSceneChange:
+            self._invalidate_index(self.scene())
+            index = getattr(self.scene(), 'param_index', None)
+            if index is not None:
+                index.discard(self)
+        elif change == QGraphicsItem.ItemSceneHasChanged and value is not None:
+            self._invalidate_index(value)
+            self._params_changed()
+            # Cache per clip decisa dal profilo di rendering della vista
+            self.setCacheMode(getattr(value, 'item_cache_mode', QGraphicsItem.NoCache))
+
         return super().itemChange(change, value)
 
 
     def mouseMoveEvent(self, event):
-        if not self.drag_start:
+        if not self.drag_start or not self.isSelected():
             return
-            
-        # Calcola il delta rispetto all'ultimo movimento
-        delta = event.scenePos() - self.drag_start
-        grid_size = (self.scene().pixels_per_beat * self.scene().zoom_level) / 16
-        
-        if not self.isSelected():
-            return
-            
-        selected_items = [item for item in self.scene().selectedItems() if isinstance(item, MusicItem)]
-        
-        # Calcola la posizione più a sinistra tra tutti gli item selezionati dopo il movimento
-        leftmost_position = float('inf')
-        for item in selected_items:
-            proposed_x = item.pos().x() + delta.x()
-            if proposed_x < grid_size:
-                proposed_x = 0
-            else:
-                proposed_x = round(proposed_x / grid_size) * grid_size
-            leftmost_position = min(leftmost_position, proposed_x)
-        
-        # Se la posizione più a sinistra è <= 0, permetti solo movimento verticale
-        if leftmost_position <= 0:
-            for item in selected_items:
-                current_y = item.pos().y()
-                new_track = max(0, min(
-                    int((current_y + delta.y()) / self.scene().track_height),
-                    self.scene().num_tracks - 1
-                ))
-                new_y = new_track * self.scene().track_height
-                item.setPos(item.pos().x(), new_y)
-        else:
-            # Movimento normale in entrambe le direzioni
-            for item in selected_items:
-                current_x = item.pos().x()
-                current_y = item.pos().y()
-                
-                # Calcola nuova posizione x con snap alla griglia
-                proposed_x = current_x + delta.x()
-                if proposed_x < grid_size:
-                    new_x = 0
-                else:
-                    new_x = round(proposed_x / grid_size) * grid_size
-                
-                # Calcola la nuova traccia
-                new_track = max(0, min(
-                    int((current_y + delta.y()) / self.scene().track_height),
-                    self.scene().num_tracks - 1
-                ))
-                new_y = new_track * self.scene().track_height
-                
-                # Applica la nuova posizione
-                item.setPos(new_x, new_y)
-                item.params['cAttacco'] = round(new_x / (self.scene().pixels_per_beat * self.scene().zoom_level), 3)
-        
-        # Aggiorna il punto di riferimento per il prossimo movimento
-        self.drag_start = event.scenePos()
+
+        # Tutta la selezione si sposta come un blocco, al massimo una volta per frame
+        if self._drag is None:
+            selected_items = [item for item in self.scene().selectedItems() if isinstance(item, MusicItem)]
+            self._drag = GroupDrag(self.scene(), self, selected_items, self.drag_start)
+        self._drag.move_to(event.scenePos())
 
     def mousePressEvent(self, event):
         if event.modifiers() & Qt.MetaModifier:  # Command/Meta key
             self.showParamDialog()
             return 
         self.drag_start = event.scenePos()
-        self.initial_pos = self.pos()  # Salva la posizione iniziale
         
         if not event.modifiers() & Qt.ControlModifier:
             if not self.isSelected():
@@ -255,31 +508,17 @@ class MusicItem(QGraphicsRectItem):
                     for item in scene.selectedItems():
                         item.setSelected(False)
             self.setSelected(True)
-            
-        # Salva la posizione iniziale per tutti gli item selezionati
-        if self.scene():
-            for item in self.scene().selectedItems():
-                if isinstance(item, MusicItem):
-                    item.initial_drag_pos = item.pos()
         
         super().mousePressEvent(event)
 
     def mouseReleaseEvent(self, event):
-        # Rimuovi le posizioni iniziali salvate
-        if self.scene():
-            for item in self.scene().selectedItems():
-                if isinstance(item, MusicItem) and hasattr(item, 'initial_drag_pos'):
-                    delattr(item, 'initial_drag_pos')
-                    
-        if hasattr(self, 'initial_pos') and self.pos() != self.initial_pos:
-            # Trova la MainWindow per accedere al command_manager
-            main_window = None
-            view = self.scene().views()[0]
-            if view:
-                main_window = view.window()
-            
-            if main_window and hasattr(main_window, 'command_manager'):
-                command = MoveItemCommand(self, self.initial_pos, self.pos())
+        drag, self._drag = self._drag, None
+        if drag is not None:
+            # Parametri e comando annullabile vengono scritti una volta sola qui
+            command = drag.finish()
+            views = self.scene().views() if self.scene() else []
+            main_window = views[0].window() if views else None
+            if command and main_window and hasattr(main_window, 'command_manager'):
                 main_window.command_manager.execute(command)
                 main_window.update_undo_redo_actions()
 
@@ -299,31 +538,43 @@ class MusicItem(QGraphicsRectItem):
         super().hoverLeaveEvent(event)
         
     def paint(self, painter, option, widget):
-        # Salva il colore originale
-        original_brush = self.brush()
-        
-        if self.isSelected():
-            # Se selezionato, molto più chiaro (70% più luminoso)
-            lighter_color = self.color.lighter(140)
-            self.setBrush(lighter_color)
+        # Nessuna modifica allo stato dell'item qui: setBrush durante il
+        # paint programmerebbe un nuovo repaint
+        scene = self.scene()
+        if scene is not None and getattr(scene, 'density_mode', False):
+            # Zoom estremo: la Timeline disegna le barre di densità per traccia
+            return
+
+        selected = self.isSelected()
+        if selected:
+            brush = self._brushes[2]
         elif self.is_hovered:
-            # Se hover, leggermente più chiaro (20% più luminoso)
-            lighter_color = self.color.lighter(110)
-            self.setBrush(lighter_color)
-            
-        # Disegna l'item
-        super().paint(painter, option, widget)
-        
-        # Ripristina il colore originale
-        self.setBrush(original_brush)
-        
-        if hasattr(self, 'highlighted') and self.highlighted:
-            # Disegna l'evidenziazione della ricerca
-            pen = QPen(QColor(255, 165, 0), 3)
-            painter.setPen(pen)
-            painter.drawRect(self.rect())
-        elif self.isSelected():
-            # Disegna il bordo di selezione
-            pen = QPen(Qt.blue, 2, Qt.DashLine)
-            painter.setPen(pen)
-            painter.drawRect(self.rect())
\ No newline at end of file
+            brush = self._brushes[1]
+        else:
+            brush = self.brush()
+
+        rect = self.rect()
+        screen_width = rect.width() * option.levelOfDetailFromTransform(painter.worldTransform())
+        if screen_width < LOD_BORDER_WIDTH:
+            # Pochi pixel: solo il riempimento, l'evidenziazione resta visibile
+            painter.fillRect(rect, HIGHLIGHT_BRUSH if self.highlighted else brush)
+            return
+
+        painter.setPen(self.pen())
+        painter.setBrush(brush)
+        painter.drawRect(rect)
+
+        outline = None
+        if self.highlighted:
+            # Evidenziazione della ricerca
+            outline = HIGHLIGHT_PEN
+        elif selected:
+            # Bordo di selezione
+            outline = SELECTION_PEN
+        if outline is not None:
+            painter.setPen(outline)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(rect)
+
+        if screen_width >= LOD_LABEL_WIDTH:
+            self.text.paint(painter, rect)
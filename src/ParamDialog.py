@@ -4,6 +4,7 @@ from PyQt5.QtWidgets import (
     QDialog, QFormLayout, QLineEdit, QDialogButtonBox,
     QPushButton, QColorDialog, QMessageBox
 )
+from src.Params import FLOAT_PARAMS
 
 class ParamDialog(QDialog):
     def __init__(self, params, color=None, item=None, parent=None):
@@ -75,7 +76,7 @@ class ParamDialog(QDialog):
                 if isinstance(self.params[key], list):
                     input_text = input_field.text()
                     try:
-                        if key == 'cAttacco' or key == 'durata' or key == 'durataArmonica':  # Tratta cAttacco in modo speciale
+                        if key in FLOAT_PARAMS:  # Tratta cAttacco in modo speciale
                             self.params[key] = float(input_field.text())  # Forza float
                         elif isinstance(self.params[key], (int, float)):
                             self.params[key] = type(self.params[key])(input_field.text())
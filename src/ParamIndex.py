@@ -0,0 +1,194 @@
+"""
+Indice dei parametri dei clip per la ricerca.
+
+Per ogni parametro numerico (cAttacco, durata, ...) e per ogni
+posizione degli elementi delle liste (ritmo[0], ampiezza[1], ...)
+l'indice tiene un array ordinato dei valori con i clip corrispondenti:
+uguaglianza, intervalli e valore più vicino costano O(log n + k).
+
+I parametri dei clip sono ClipParams, che avvisano l'indice a ogni
+modifica; l'indice aggiorna solo le chiavi cambiate dei clip toccati,
+alla prima interrogazione successiva. Come ClipIndex non dipende da Qt.
+"""
+from bisect import bisect_left, bisect_right
+
+from src.Params import is_number
+
+# Tolleranza di default per l'uguaglianza tra float
+SEARCH_TOLERANCE = 1e-3
+
+
+def param_keys(params):
+    """Valori indicizzabili di un clip: {'durata': 5.0, 'ritmo[0]': 7.0, ...}"""
+    keys = {}
+    for name, value in params.items():
+        _flatten(name, value, keys)
+    return keys
+
+
+def _flatten(key, value, keys):
+    if isinstance(value, (list, tuple)):
+        for i, element in enumerate(value):
+            _flatten(f"{key}[{i}]", element, keys)
+    elif is_number(value):
+        keys[key] = float(value)
+
+
+class ParamIndex:
+    """
+    Array ordinati dei valori dei parametri, uno per chiave.
+
+    source() restituisce i clip da indicizzare. `touch` segna un clip
+    da reindicizzare, `discard` lo toglie subito; `invalidate` fa
+    ricostruire tutto alla prossima interrogazione (es. dopo clear()).
+    """
+    def __init__(self, source):
+        self._source = source
+        self._columns = {}  # chiave -> ([valori ordinati], [clip])
+        self._entries = {}  # clip -> {chiave: valore} attualmente nell'indice
+        self._pending = set()
+        self._dirty = True
+        self.rebuild_count = 0
+        # Cresce a ogni modifica: chi tiene copie dei parametri sa quando rifarle
+        self.version = 0
+
+    @property
+    def dirty(self):
+        return self._dirty
+
+    def invalidate(self):
+        self.version += 1
+        self._dirty = True
+        self._pending.clear()
+
+    def touch(self, item):
+        self.version += 1
+        if not self._dirty:
+            self._pending.add(item)
+
+    def discard(self, item):
+        self.version += 1
+        if self._dirty:
+            return
+        self._pending.discard(item)
+        for key, value in self._entries.pop(item, {}).items():
+            self._remove(key, value, item)
+
+    def _ensure(self):
+        if self._dirty:
+            self._rebuild()
+        elif self._pending:
+            pending, self._pending = self._pending, set()
+            for item in pending:
+                self._reindex(item)
+
+    def _rebuild(self):
+        self.rebuild_count += 1
+        self._pending.clear()
+        self._entries = {}
+        columns = {}
+        for item in self._source():
+            keys = param_keys(item.params)
+            self._entries[item] = keys
+            for key, value in keys.items():
+                columns.setdefault(key, []).append((value, item))
+        self._columns = {}
+        for key, pairs in columns.items():
+            pairs.sort(key=lambda pair: pair[0])
+            self._columns[key] = ([pair[0] for pair in pairs], [pair[1] for pair in pairs])
+        self._dirty = False
+
+    def _reindex(self, item):
+        # Solo le chiavi il cui valore è cambiato toccano gli array
+        old = self._entries.get(item, {})
+        new = param_keys(item.params)
+        for key, value in old.items():
+            if new.get(key) != value:
+                self._remove(key, value, item)
+        for key, value in new.items():
+            if old.get(key) != value:
+                self._insert(key, value, item)
+        self._entries[item] = new
+
+    def _insert(self, key, value, item):
+        values, items = self._columns.setdefault(key, ([], []))
+        i = bisect_right(values, value)
+        values.insert(i, value)
+        items.insert(i, item)
+
+    def _remove(self, key, value, item):
+        values, items = self._columns[key]
+        for i in range(bisect_left(values, value), bisect_right(values, value)):
+            if items[i] is item:
+                del values[i]
+                del items[i]
+                break
+        if not values:
+            del self._columns[key]
+
+    def __len__(self):
+        self._ensure()
+        return len(self._entries)
+
+    def keys(self):
+        """Chiavi indicizzate, es. ['ampiezza[0]', 'cAttacco', ...]"""
+        self._ensure()
+        return sorted(self._columns)
+
+    def values(self, key):
+        """Valori ordinati della chiave (copia)"""
+        self._ensure()
+        return list(self._columns.get(key, ((), ()))[0])
+
+    def in_range(self, key, low=None, high=None):
+        """Clip con low <= valore <= high (estremi None = illimitati), in ordine di valore"""
+        self._ensure()
+        if key not in self._columns:
+            return []
+        values, items = self._columns[key]
+        lo = 0 if low is None else bisect_left(values, low)
+        hi = len(values) if high is None else bisect_right(values, high)
+        return items[lo:hi]
+
+    def equal(self, key, value, tolerance=SEARCH_TOLERANCE):
+        """Clip il cui valore dista da value al più tolerance"""
+        return self.in_range(key, value - tolerance, value + tolerance)
+
+    def nearest(self, key, value, count=1):
+        """I count clip con il valore più vicino a value"""
+        self._ensure()
+        if key not in self._columns:
+            return []
+        values, items = self._columns[key]
+        right = bisect_left(values, value)
+        left = right - 1
+        result = []
+        while len(result) < count and (left >= 0 or right < len(values)):
+            if right >= len(values) or (left >= 0 and value - values[left] <= values[right] - value):
+                result.append(items[left])
+                left -= 1
+            else:
+                result.append(items[right])
+                right += 1
+        return result
+
+    def find(self, param, value, tolerance=SEARCH_TOLERANCE):
+        """
+        Clip con il parametro uguale a value: un numero confronta i
+        parametri scalari, una lista confronta elemento per elemento
+        le liste della stessa lunghezza.
+        """
+        if not isinstance(value, (list, tuple)):
+            return self.equal(param, float(value), tolerance)
+        keys = param_keys({param: list(value)})
+        if len(keys) != len(value) or not keys:
+            # Liste vuote o annidate: confronto diretto
+            self._ensure()
+            return [item for item in self._entries if item.params.get(param) == list(value)]
+        # Si parte dalla chiave più selettiva e si filtrano le altre
+        matches = sorted((self.equal(key, element, tolerance) for key, element in keys.items()), key=len)
+        candidates = set(matches[0])
+        for other in matches[1:]:
+            candidates.intersection_update(other)
+        return [item for item in candidates
+                if isinstance(item.params.get(param), (list, tuple)) and len(item.params[param]) == len(value)]
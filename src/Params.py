@@ -0,0 +1,290 @@
+"""
+Schema dei parametri dei comportamenti e I/O dei file YAML.
+
+Questo modulo non dipende da Qt: viene usato sia dall'interfaccia
+(ParamDialog, MusicItem, MainWindow) sia dalla CLI headless.
+
+PyYAML viene importato solo al primo caricamento/salvataggio, così
+l'avvio dell'interfaccia non ne paga il costo.
+"""
+import copy
+import functools
+from collections.abc import Mapping, MutableMapping
+
+# Ordine canonico dei parametri di un comportamento
+PARAM_NAMES = [
+    'cAttacco', 'durataArmonica', 'ritmo', 'durata',
+    'ampiezza', 'frequenza', 'posizione'
+]
+
+# Parametri che ParamDialog forza sempre a float
+FLOAT_PARAMS = ('cAttacco', 'durata', 'durataArmonica')
+
+# Parametri necessari per posizionare un clip sulla timeline
+REQUIRED_PARAMS = ('cAttacco', 'durata')
+
+DEFAULT_PARAMS = {
+    "cAttacco": 0.0,
+    "durataArmonica": 26,
+    "ritmo": [7, 15],
+    "durata": 5.0,
+    "ampiezza": [-30, -0.25],
+    "frequenza": [6, 1],
+    "posizione": -8
+}
+
+
+def _copy_value(value):
+    # Equivale a deepcopy per i valori dei parametri (scalari, stringhe e
+    # liste annidate) ma senza il suo costo, pagato per ogni clip creato
+    if isinstance(value, list):
+        return [_copy_value(element) for element in value]
+    return value
+
+
+def default_params():
+    """Restituisce una copia indipendente dei parametri di default"""
+    return {key: _copy_value(value) for key, value in DEFAULT_PARAMS.items()}
+
+
+_MISSING = object()
+_FIELDS = frozenset(PARAM_NAMES)
+
+
+class ClipParams(MutableMapping):
+    """
+    Parametri di un clip: un campo (slot) per ogni parametro noto e un
+    dizionario, creato solo se serve, per le chiavi extra. Si usa come
+    un dizionario (params['durata'], get, update, items...) e i parametri
+    noti sono anche attributi (params.durata). Occupa una frazione di un
+    dict e non ha __dict__.
+
+    on_change viene chiamato a ogni modifica (una volta per update); le
+    copie (copy, deepcopy, pickle) sono dizionari normali, senza il
+    legame con il clip.
+    """
+    __slots__ = tuple(PARAM_NAMES) + ('_extra', '_on_change')
+
+    def __init__(self, values=(), on_change=None):
+        self._extra = None
+        self._on_change = None
+        self.update(values)
+        self._on_change = on_change
+
+    def _changed(self):
+        if self._on_change is not None:
+            self._on_change()
+
+    def __setattr__(self, key, value):
+        # params.durata = 3 avvisa come params['durata'] = 3
+        if key in _FIELDS:
+            self[key] = value
+        else:
+            object.__setattr__(self, key, value)
+
+    def _set(self, key, value):
+        if key in _FIELDS:
+            object.__setattr__(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __getitem__(self, key):
+        if key in _FIELDS:
+            value = getattr(self, key, _MISSING)
+        else:
+            value = _MISSING if self._extra is None else self._extra.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        if key in _FIELDS:
+            return getattr(self, key, default)
+        return default if self._extra is None else self._extra.get(key, default)
+
+    def __contains__(self, key):
+        if key in _FIELDS:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __setitem__(self, key, value):
+        self._set(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        if key in _FIELDS and hasattr(self, key):
+            object.__delattr__(self, key)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+        self._changed()
+
+    def __iter__(self):
+        # Ordine canonico (PARAM_NAMES), poi le chiavi extra
+        for name in PARAM_NAMES:
+            if hasattr(self, name):
+                yield name
+        if self._extra:
+            yield from list(self._extra)
+
+    def __len__(self):
+        return sum(1 for name in PARAM_NAMES if hasattr(self, name)) + len(self._extra or ())
+
+    # Versioni dirette di keys/values/items: quelle di Mapping passano da
+    # __iter__ e __getitem__ per ogni chiave (indice, ricerca, salvataggio)
+    def items(self):
+        pairs = []
+        for name in PARAM_NAMES:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                pairs.append((name, value))
+        if self._extra:
+            pairs.extend(self._extra.items())
+        return pairs
+
+    def keys(self):
+        return [name for name, _ in self.items()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def update(self, *args, **kwargs):
+        values = dict(*args, **kwargs)
+        for key, value in values.items():
+            self._set(key, value)
+        self._changed()
+
+    def clear(self):
+        for name in PARAM_NAMES:
+            if hasattr(self, name):
+                object.__delattr__(self, name)
+        self._extra = None
+        self._changed()
+
+    def copy(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    def __reduce__(self):
+        return (dict, (self.copy(),))
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(self.copy(), memo)
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def first_value(value):
+    """Valore scalare di un parametro che può essere salvato anche come lista"""
+    if isinstance(value, (list, tuple)):
+        return value[0] if value else None
+    return value
+
+
+def _validate_element(key, value, errors, index):
+    if isinstance(value, list):
+        for sub in value:
+            _validate_element(key, sub, errors, index)
+    elif isinstance(value, str):
+        # ParamDialog tratta come stringa solo valori con lettere (es. GEN06),
+        # gli altri verrebbero convertiti silenziosamente in numeri
+        if not any(c.isalpha() for c in value):
+            errors.append(f"comportamento {index}: '{key}' contiene la stringa non valida {value!r}")
+    elif not is_number(value):
+        errors.append(f"comportamento {index}: '{key}' ha un valore non valido {value!r}")
+
+
+def validate_params(params, index=0):
+    """
+    Valida i parametri di un singolo comportamento con le stesse regole
+    applicate da ParamDialog e load_from_yaml.
+
+    Returns:
+        tuple (errors, warnings) di liste di messaggi
+    """
+    errors, warnings = [], []
+    if not isinstance(params, Mapping):
+        return [f"comportamento {index}: atteso un mapping, trovato {type(params).__name__}"], warnings
+
+    for key in REQUIRED_PARAMS:
+        if key not in params:
+            errors.append(f"comportamento {index}: parametro obbligatorio '{key}' mancante")
+
+    for key, value in params.items():
+        if key not in PARAM_NAMES:
+            warnings.append(f"comportamento {index}: parametro sconosciuto '{key}'")
+
+        if key in FLOAT_PARAMS:
+            scalar = first_value(value) if key == 'durata' else value
+            if not is_number(scalar):
+                errors.append(f"comportamento {index}: '{key}' deve essere numerico, trovato {value!r}")
+                continue
+            if key == 'cAttacco' and scalar < 0:
+                errors.append(f"comportamento {index}: 'cAttacco' negativo ({scalar})")
+            if key == 'durata' and scalar <= 0:
+                errors.append(f"comportamento {index}: 'durata' deve essere positiva ({scalar})")
+        else:
+            _validate_element(key, value, errors, index)
+
+    return errors, warnings
+
+
+def validate_document(data):
+    """Valida un documento YAML completo (mapping con la chiave 'comportamenti')"""
+    if not isinstance(data, dict) or 'comportamenti' not in data:
+        return ["chiave 'comportamenti' mancante"], []
+    comportamenti = data['comportamenti']
+    if not isinstance(comportamenti, list):
+        return ["'comportamenti' deve essere una lista"], []
+
+    errors, warnings = [], []
+    for i, params in enumerate(comportamenti):
+        item_errors, item_warnings = validate_params(params, i)
+        errors.extend(item_errors)
+        warnings.extend(item_warnings)
+    return errors, warnings
+
+
+@functools.lru_cache(maxsize=None)
+def comportamenti_dumper():
+    """Dumper che scrive in flow style le liste annidate (creato al primo uso)"""
+    import yaml
+
+    class ComportamentiDumper(yaml.SafeDumper):
+        def represent_sequence(self, tag, sequence, flow_style=None):
+            if len(sequence) > 0 and isinstance(sequence[0], list):
+                flow_style = True
+            return super().represent_sequence(tag, sequence, flow_style)
+
+    return ComportamentiDumper
+
+
+def sort_by_attack(items):
+    return sorted(items, key=lambda x: float(first_value(x['cAttacco'])))
+
+
+def load_comportamenti(path):
+    """Carica un file YAML di comportamenti. Solleva yaml.YAMLError/OSError"""
+    import yaml
+    # Il loader in C di libyaml, se disponibile, è molto più veloce sui file grandi
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=loader)
+
+
+def dump_comportamenti(items, stream):
+    """Scrive i comportamenti (già ordinati) nel formato usato da DPT"""
+    import yaml
+    yaml.dump({"comportamenti": items}, stream,
+              Dumper=comportamenti_dumper(),
+              default_flow_style=None,
+              sort_keys=False,
+              indent=1,
+              allow_unicode=True)
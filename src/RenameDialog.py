@@ -31,7 +31,6 @@ class RenameDialog(QDialog):
         new_name = self.name_input.text().strip()
         if new_name:  # Nome valido
             self.item.name = new_name
-            self.item.text.setPlainText(new_name)
             super().accept()
         else:  # Nome vuoto - mostra warning
             QMessageBox.warning(
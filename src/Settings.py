@@ -1,13 +1,47 @@
+import atexit
+import inspect
 import json
 import os
+import shutil
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
 
+# Ritardo (in secondi) con cui le modifiche vengono scritte su disco
+SAVE_DELAY = 0.5
+
+# Istanze con modifiche ancora da scrivere all'uscita dell'interprete
+_instances = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for settings in list(_instances):
+        settings.flush()
+
+
 class Settings:
-    def __init__(self):
+    """
+    Impostazioni dell'applicazione, salvate in settings.json.
+
+    `set` aggiorna solo la copia in memoria: le modifiche ravvicinate
+    vengono raggruppate e scritte una volta sola da un timer in
+    background (SAVE_DELAY), oppure subito con `flush()`. La scrittura
+    passa da un file temporaneo sostituito atomicamente, quindi il file
+    non resta mai a metà.
+
+    Chi deve reagire ai cambiamenti si registra con `subscribe`: la
+    callback riceve l'insieme delle chiavi cambiate, una volta per `set`
+    oppure una volta sola alla fine di una `transaction`.
+    """
+    def __init__(self, save_delay=SAVE_DELAY):
         # Ottiene il percorso della directory corrente dello script
         current_dir = Path(os.path.dirname(os.path.abspath(__file__)))
         self.settings_file = current_dir / 'settings.json'
-        
+        self.save_delay = save_delay
+
         self.default_settings = {
             'last_open_directory': str(current_dir),
             'last_save_directory': str(current_dir),
@@ -17,12 +51,27 @@ class Settings:
             'text_color': '#000000',
             'item_text_size': 12,
             'timeline_text_size': 14,
-            'timeline_background_color': '#F0F0F0',  
-            'track_background_color': '#F0F0F0'  
+            'timeline_background_color': '#F0F0F0',
+            'track_background_color': '#F0F0F0',
+            'render_profile': 'default',
+            'snap_to_edges': True
         }
         self.current_settings = {}
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._timer = None
+        self._transaction_depth = 0
+        self._listeners = []
+        self._changed = set()  # Chiavi cambiate nella transazione in corso
+        _instances.add(self)
         self.load_settings()
 
+    @property
+    def pending(self):
+        """True se ci sono modifiche non ancora scritte su disco"""
+        return self._dirty
+
     def load_settings(self):
         try:
             if self.settings_file.exists():
@@ -36,15 +85,114 @@ class Settings:
             self.current_settings = self.default_settings.copy()
 
     def save_settings(self):
-        try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.current_settings, f, indent=4)
-        except Exception as e:
-            print(f"Errore nel salvataggio delle impostazioni: {e}")
+        """Scrive subito le impostazioni su disco (sostituzione atomica)"""
+        # La copia va presa dentro il lock di scrittura: due salvataggi
+        # concorrenti non possono scrivere uno stato più vecchio per ultimo
+        with self._write_lock:
+            with self._lock:
+                self._cancel_timer()
+                snapshot = dict(self.current_settings)
+                self._dirty = False
+
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(
+                    prefix='.settings-', suffix='.tmp', dir=self.settings_file.parent
+                )
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(snapshot, f, indent=4)
+                if self.settings_file.exists():
+                    shutil.copymode(self.settings_file, tmp_path)
+                os.replace(tmp_path, self.settings_file)
+            except Exception as e:
+                print(f"Errore nel salvataggio delle impostazioni: {e}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                with self._lock:
+                    self._dirty = True
+
+    def flush(self):
+        """Scrive le modifiche in sospeso, se ce ne sono"""
+        if self._dirty:
+            self.save_settings()
 
     def get(self, key, default=None):
         return self.current_settings.get(key, default)
 
     def set(self, key, value):
-        self.current_settings[key] = value
-        self.save_settings()
\ No newline at end of file
+        with self._lock:
+            if key in self.current_settings and self.current_settings[key] == value:
+                return
+            self.current_settings[key] = value
+            self._dirty = True
+            if self._transaction_depth:
+                self._changed.add(key)
+                return
+            self._schedule_save()
+        self._notify({key})
+
+    @contextmanager
+    def transaction(self):
+        """
+        Raggruppa più `set` in un unico salvataggio e in un'unica
+        notifica, all'uscita del blocco più esterno.
+
+            with settings.transaction():
+                settings.set('text_color', '#000000')
+                settings.set('item_text_size', 12)
+        """
+        with self._lock:
+            self._transaction_depth += 1
+        changed = None
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    if self._dirty:
+                        self._schedule_save()
+                    changed, self._changed = self._changed, set()
+        if changed:
+            self._notify(changed)
+
+    def subscribe(self, callback):
+        """
+        Registra callback(chiavi) per i cambiamenti. I metodi sono tenuti
+        con un riferimento debole: un oggetto distrutto smette di riceverli.
+        """
+        ref = weakref.WeakMethod(callback) if inspect.ismethod(callback) else (lambda: callback)
+        with self._lock:
+            self._listeners.append(ref)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._listeners = [ref for ref in self._listeners if ref() not in (None, callback)]
+
+    def _notify(self, keys):
+        with self._lock:
+            self._listeners = [ref for ref in self._listeners if ref() is not None]
+            callbacks = [ref() for ref in self._listeners]
+        # Fuori dal lock: le callback possono leggere o modificare le settings
+        keys = frozenset(keys)
+        for callback in callbacks:
+            if callback is not None:
+                callback(keys)
+
+    def _schedule_save(self):
+        # Le modifiche successive alla prima finiscono nello stesso salvataggio
+        if self._timer is not None:
+            return
+        self._timer = threading.Timer(self.save_delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
     QLineEdit, QPushButton, QFileDialog, QTabWidget,
-    QWidget, QColorDialog, QSpinBox
+    QWidget, QColorDialog, QSpinBox, QComboBox
 )
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QColor
@@ -60,6 +60,22 @@ class SettingsDialog(QDialog):
         tracks_layout.addWidget(QLabel("Default Number of Tracks:"))
         tracks_layout.addWidget(self.default_tracks_spin)
         layout.addLayout(tracks_layout)
+
+        # Profilo di rendering della timeline
+        from src.TimelineView import RENDER_PROFILES, DEFAULT_RENDER_PROFILE
+        profile_layout = QHBoxLayout()
+        self.render_profile_combo = QComboBox()
+        self.render_profile_combo.addItems(list(RENDER_PROFILES))
+        current_profile = self.settings.get('render_profile', DEFAULT_RENDER_PROFILE)
+        if current_profile in RENDER_PROFILES:
+            self.render_profile_combo.setCurrentText(current_profile)
+        else:
+            # Profilo personalizzato in settings.json: non lo tocchiamo
+            self.render_profile_combo.insertItem(0, "custom")
+            self.render_profile_combo.setCurrentIndex(0)
+        profile_layout.addWidget(QLabel("Rendering Profile:"))
+        profile_layout.addWidget(self.render_profile_combo)
+        layout.addLayout(profile_layout)
         
         layout.addStretch()
 
@@ -220,17 +236,18 @@ class SettingsDialog(QDialog):
                 self.save_dir_edit.setText(dir_path)
 
     def accept(self):
-        self.settings.set('make_directory', self.make_dir_edit.text())
-        self.settings.set('last_open_directory', self.open_dir_edit.text())
-        self.settings.set('last_save_directory', self.save_dir_edit.text())
-        self.settings.set('text_color', self.text_color.name())
-        self.settings.set('item_text_size', self.item_text_size_spin.value())
-        self.settings.set('timeline_text_size', self.timeline_text_size_spin.value())
-        self.settings.set('track_background_color', self.track_color.name())
-        self.settings.set('timeline_background_color', self.timeline_color.name())
-        self.settings.set('default_track_count', self.default_tracks_spin.value())
-        # Forza il ridisegno delle tracce con il nuovo colore
-        self.settings.save_settings()
-        if self.parent() and hasattr(self.parent(), 'timeline_container'):
-            self.parent().timeline_container.timeline_view.scene().draw_tracks()
+        # Un solo salvataggio su disco e una sola notifica (MainWindow.apply_settings)
+        # per tutti i campi del dialogo
+        with self.settings.transaction():
+            self.settings.set('make_directory', self.make_dir_edit.text())
+            self.settings.set('last_open_directory', self.open_dir_edit.text())
+            self.settings.set('last_save_directory', self.save_dir_edit.text())
+            self.settings.set('text_color', self.text_color.name())
+            self.settings.set('item_text_size', self.item_text_size_spin.value())
+            self.settings.set('timeline_text_size', self.timeline_text_size_spin.value())
+            self.settings.set('track_background_color', self.track_color.name())
+            self.settings.set('timeline_background_color', self.timeline_color.name())
+            self.settings.set('default_track_count', self.default_tracks_spin.value())
+            if self.render_profile_combo.currentText() != "custom":
+                self.settings.set('render_profile', self.render_profile_combo.currentText())
         super().accept()
\ No newline at end of file
@@ -1,16 +1,40 @@
-import sys
-import yaml
-from PyQt5.QtCore import Qt, QPointF, QTimer
+import copy
+from contextlib import contextmanager
+from PyQt5.QtCore import Qt, QPointF, QRectF, QLineF
 from PyQt5.QtGui import QPen, QColor, QBrush
-from PyQt5.QtWidgets import (
-    QGraphicsScene, QGraphicsTextItem, QGraphicsRectItem, QGraphicsItem,
-    QApplication
-)
+from PyQt5.QtWidgets import QGraphicsScene, QGraphicsItem
+from PyQt5 import sip
 #from MusicItem import MusicItem
 from src.MusicItem import MusicItem
+from src.ClipIndex import ClipIndex
+from src.ParamIndex import ParamIndex
+from src.Params import first_value
+from src.TimelineRuler import ruler_interval
 
 MIN_SCENE_HEIGHT = 600  # Sposta qui la costante
 
+# Distanza (pixel) entro cui un clip trascinato si aggancia ai bordi degli
+# altri clip o alle tacche del righello
+SNAP_DISTANCE = 8
+
+# Sotto questo zoom (lo stesso del ruler a intervalli di 60s) i clip non
+# vengono disegnati singolarmente ma come barre di densità per traccia
+DENSITY_ZOOM = 0.05
+DENSITY_BIN = 4  # Larghezza in pixel di una barra
+DENSITY_SATURATION = 2.0  # Sovrapposizione a cui la barra è piena
+DENSITY_COLOR = QColor(100, 150, 200)
+SELECTED_MARK_COLOR = QColor(Qt.blue)
+HIGHLIGHT_MARK_COLOR = QColor(255, 165, 0)
+# Contorno dei clip nell'anteprima delle trasformazioni di sezione
+PREVIEW_PEN = QPen(QColor(200, 60, 60), 0, Qt.DashLine)
+
+# Sfondo delle tracce e griglia, disegnati in drawBackground
+TRACK_BORDER_PEN = QPen(Qt.black, 0)
+GRID_MINOR_PEN = QPen(QColor(0, 0, 0, 25), 0)
+GRID_MAJOR_PEN = QPen(QColor(0, 0, 0, 60), 0)
+GRID_BEAT_STEPS = (1, 2, 5, 10, 30, 60)  # Multipli di beat per le linee principali
+GRID_SUBDIVISIONS = (16, 8, 4, 2)  # Suddivisioni del beat, fino alla griglia di snap
+
 class Timeline(QGraphicsScene):
     def __init__(self,settings):
         super().__init__()
@@ -25,10 +49,71 @@ class Timeline(QGraphicsScene):
         self.track_height = 50
         self.num_tracks = self.settings.get('default_track_count', 8)
         self.setBackgroundBrush(QBrush(QColor(220, 220, 220)))
+        self._track_brush = None
+        # Modalità di cache dei clip, impostata dal profilo di rendering della vista
+        self.item_cache_mode = QGraphicsItem.NoCache
+        # Clip ordinati per inizio, per selezioni e ricerche per intervallo
+        self.clip_index = ClipIndex(self.clip_items)
+        self.param_index = ParamIndex(self.clip_items)
+        self.highlighted_items = set()  # Clip evidenziati dalla ricerca
+        # Trascinamento di gruppo in corso (MusicItem.GroupDrag) e guardia
+        # contro la propagazione degli spostamenti alla selezione
+        self.group_drag = None
+        self.moving_group = False
+        # Con exact_positions attivo itemChange non applica lo snap (move_items)
+        self.exact_positions = False
+        self.preview_rects = []  # Anteprima di una trasformazione (coordinate della scena)
+        self._batch_depth = 0  # batch_update annidati
         self.draw_tracks()
-        QTimer.singleShot(0,self.initialize_components)
 
 
+    @contextmanager
+    def batch_update(self):
+        """
+        Contesto per modifiche in blocco (caricamenti, incolla, tracce):
+        durante il blocco la scena non mantiene l'indice BSP (NoIndex), le
+        viste non si ridisegnano e i segnali della scena sono sospesi.
+        All'uscita l'indice viene ricostruito una volta, le viste
+        ridisegnate una volta e changed, sceneRectChanged e selectionChanged
+        emessi una sola volta se necessario. I blocchi annidati si fondono
+        con quello più esterno.
+        """
+        if self._batch_depth:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+
+        self._batch_depth = 1
+        index_method = self.itemIndexMethod()
+        scene_rect = self.sceneRect()
+        selected = set(self.selectedItems())
+        viewports = [view.viewport() for view in self.views()]
+        updates = [viewport.updatesEnabled() for viewport in viewports]
+        for viewport in viewports:
+            viewport.setUpdatesEnabled(False)
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        signals_blocked = self.blockSignals(True)
+        try:
+            yield self
+        finally:
+            self._batch_depth = 0
+            self.blockSignals(signals_blocked)
+            # Tornare al metodo precedente ricostruisce l'indice in un colpo solo
+            self.setItemIndexMethod(index_method)
+            for viewport, enabled in zip(viewports, updates):
+                if not sip.isdeleted(viewport):
+                    viewport.setUpdatesEnabled(enabled)
+                    viewport.update()
+            if not signals_blocked:
+                if self.sceneRect() != scene_rect:
+                    self.sceneRectChanged.emit(self.sceneRect())
+                self.changed.emit([self.sceneRect()])
+                if set(self.selectedItems()) != selected:
+                    self.selectionChanged.emit()
+
     def initialize_components(self):
         """Inizializza e aggiorna tutti i componenti necessari"""
         if self.views():
@@ -37,56 +122,169 @@ class Timeline(QGraphicsScene):
                 container = main_window.timeline_container
                 
                 # Aggiorna gli header delle tracce
-                container.track_header_view.update_tracks(
-                    self.num_tracks,
-                    self.track_height
-                )
-                
-                # Aggiorna e sincronizza il ruler
-                if hasattr(container, 'ruler_view') and container.ruler_view:
-                    ruler = container.ruler_view
-                    ruler.update_zoom(self.zoom_level)
-                    
-                    # Sincronizza lo scroll orizzontale
-                    if container.timeline_view:
-                        current_scroll = container.timeline_view.horizontalScrollBar().value()
-                        ruler.horizontalScrollBar().setValue(current_scroll)
-                    
-                    # Forza l'aggiornamento delle viste
-                    ruler.viewport().update()
-                    container.timeline_view.viewport().update()
+                container.update_track_headers()
+                # Ruler e scrollbar vengono riallineati dal container
+                container.initialize_views()
+
+    @property
+    def density_mode(self):
+        """True quando lo zoom è così basso da disegnare le barre di densità"""
+        return self.zoom_level < DENSITY_ZOOM
+
+    def drawForeground(self, painter, rect):
+        super().drawForeground(painter, rect)
+        if self.density_mode:
+            self.draw_density(painter, rect)
+        if self.preview_rects:
+            painter.setPen(PREVIEW_PEN)
+            painter.setBrush(Qt.NoBrush)
+            for preview in self.preview_rects:
+                if preview.intersects(rect):
+                    painter.drawRect(preview)
+
+    def draw_density(self, painter, rect):
+        """
+        Disegna per ogni traccia un istogramma della copertura dei clip,
+        a colonne di DENSITY_BIN pixel, limitato all'area esposta.
+        Clip selezionati ed evidenziati restano visibili come tacche.
+        """
+        first_bin = int(max(0.0, rect.left()) // DENSITY_BIN)
+        last_bin = int(max(0.0, rect.right()) // DENSITY_BIN)
+        num_bins = last_bin - first_bin + 1
+        tracks = {}
+        marks = []
+
+        for item in self.items(rect):
+            if not isinstance(item, MusicItem):
+                continue
+            x0 = item.pos().x() + item.rect().left()
+            x1 = x0 + item.rect().width()
+            track = int(item.pos().y() // self.track_height)
+            bins = tracks.get(track)
+            if bins is None:
+                bins = tracks[track] = [0.0] * num_bins
+            start = max(first_bin, int(x0 // DENSITY_BIN))
+            end = min(last_bin, int(x1 // DENSITY_BIN))
+            for b in range(start, end + 1):
+                overlap = min(x1, (b + 1) * DENSITY_BIN) - max(x0, b * DENSITY_BIN)
+                if overlap > 0:
+                    bins[b - first_bin] += overlap / DENSITY_BIN
+            if item.highlighted:
+                marks.append((x0, track, HIGHLIGHT_MARK_COLOR))
+            elif item.isSelected():
+                marks.append((x0, track, SELECTED_MARK_COLOR))
+
+        max_height = self.track_height * 0.8
+        for track, bins in tracks.items():
+            bottom = (track + 1) * self.track_height
+            for i, value in enumerate(bins):
+                if value <= 0:
+                    continue
+                height = max_height * min(1.0, value / DENSITY_SATURATION)
+                painter.fillRect(QRectF((first_bin + i) * DENSITY_BIN, bottom - height,
+                                        DENSITY_BIN, height), DENSITY_COLOR)
+
+        for x, track, color in marks:
+            painter.fillRect(QRectF(x, track * self.track_height, 2, self.track_height), color)
+
+    @property
+    def track_brush(self):
+        """Brush dello sfondo tracce, ricreato solo se cambia il colore nelle settings"""
+        color_name = self.settings.get('track_background_color', '#F0F0F0')
+        if self._track_brush is None or self._track_brush[0] != color_name:
+            self._track_brush = (color_name, QBrush(QColor(color_name)))
+        return self._track_brush[1]
+
+    def track_at(self, y):
+        """Numero della traccia alla coordinata y della scena, None se fuori"""
+        if y < 0:
+            return None
+        track = int(y // self.track_height)
+        return track if track < self.num_tracks else None
+
+    def track_rect(self, track_number):
+        return QRectF(0, track_number * self.track_height,
+                      self.sceneRect().width(), self.track_height)
+
+    def grid_spacing(self):
+        """
+        Distanza in pixel tra le linee principali (multipli di beat) e tra
+        quelle secondarie (suddivisioni del beat, None se troppo fitte)
+        """
+        beat = self.pixels_per_beat * self.zoom_level
+        major = beat * GRID_BEAT_STEPS[-1]
+        for step in GRID_BEAT_STEPS:
+            if beat * step >= self.min_grid_spacing:
+                major = beat * step
+                break
+        minor = None
+        if major == beat:
+            for division in GRID_SUBDIVISIONS:
+                if beat / division >= self.min_grid_spacing:
+                    minor = beat / division
+                    break
+        return major, minor
+
+    def drawBackground(self, painter, rect):
+        """Strisce delle tracce, bordi e griglia, solo per l'area esposta"""
+        super().drawBackground(painter, rect)
+        tracks_bottom = self.num_tracks * self.track_height
+        left = max(rect.left(), 0.0)
+        right = min(rect.right(), self.sceneRect().right())
+        top = max(rect.top(), 0.0)
+        bottom = min(rect.bottom(), tracks_bottom)
+        if right <= left or bottom <= top:
+            return
+
+        painter.fillRect(QRectF(left, top, right - left, bottom - top), self.track_brush)
+
+        major, minor = self.grid_spacing()
+        if minor is not None:
+            self._draw_vertical_lines(painter, GRID_MINOR_PEN, minor, left, right, top, bottom)
+        self._draw_vertical_lines(painter, GRID_MAJOR_PEN, major, left, right, top, bottom)
+
+        first = int(top // self.track_height)
+        last = min(self.num_tracks, int(bottom // self.track_height) + 1)
+        painter.setPen(TRACK_BORDER_PEN)
+        painter.drawLines([QLineF(left, i * self.track_height, right, i * self.track_height)
+                           for i in range(first, last + 1)])
+
+    def _draw_vertical_lines(self, painter, pen, spacing, left, right, top, bottom):
+        if spacing <= 0:
+            return
+        first = int(left // spacing)
+        last = int(right // spacing)
+        painter.setPen(pen)
+        painter.drawLines([QLineF(i * spacing, top, i * spacing, bottom)
+                           for i in range(first, last + 1)])
 
     def draw_tracks(self):
-        self.clear()
+        """
+        Adegua la scena al numero e all'altezza delle tracce. Le tracce non
+        sono item: sfondo e griglia li disegna drawBackground.
+        """
         required_height = (self.num_tracks * self.track_height)
         # Rimuovi min_height se num_tracks aumenta oltre il minimo
         current_height = required_height if required_height > self.min_height else self.min_height
         
         if current_height != self.sceneRect().height():
             self.setSceneRect(0, 0, self.sceneRect().width(), current_height)        
-        track_color = self.settings.get('track_background_color', '#F0F0F0')
-        
-        for i in range(self.num_tracks):
-            y = i * self.track_height
-            track = TrackItem(0, y, self.sceneRect().width(), self.track_height, i)
-            track.updateColors(track_color)  # Impostiamo i colori iniziali
-            track.setPen(QPen(Qt.black))
-            self.addItem(track)
-            
-            text = QGraphicsTextItem(f"Track {i+1}")
-            text.setPos(-70, y + 15)
-            self.addItem(text)
+        self.invalidate(self.sceneRect(), QGraphicsScene.BackgroundLayer)
+
         # Aggiorna gli header nella view
+        header_view = self.track_header_view()
+        if header_view is not None:
+            header_view.update_tracks(self.num_tracks, self.track_height)
+
+    def track_header_view(self):
+        """Vista degli header delle tracce della finestra, se c'è"""
         if self.views():
             view = self.views()[0]
             if view and view.window():
                 main_window = view.window()
                 if hasattr(main_window, 'timeline_container'):
-                    main_window.timeline_container.track_header_view.update_tracks(
-                        self.num_tracks,
-                        self.track_height
-                    )
-
+                    return main_window.timeline_container.track_header_view
+        return None
 
     def delete_track(self, track_number):
         # Salva gli item di tutte le tracce
@@ -105,31 +303,37 @@ class Timeline(QGraphicsScene):
                         })
             track_items.append(items)
         
-        # Rimuovi tutti gli item
-        self.clear()
+        with self.batch_update():
+            # Rimuovi tutti gli item
+            self.clear()
         
-        # Decrementa il numero di tracce
-        self.num_tracks -= 1
+            # Decrementa il numero di tracce
+            self.num_tracks -= 1
+
+            # Nome e stato delle tracce successive salgono con loro
+            header_view = self.track_header_view()
+            if header_view is not None:
+                header_view.scene.remove_track(track_number)
         
-        # Ridisegna le tracce
-        self.draw_tracks()
+            # Ridisegna le tracce
+            self.draw_tracks()
         
-        # Ripristina gli item, saltando la traccia cancellata e spostando quelle successive verso l'alto
-        for i in range(self.num_tracks + 1):
-            if i == track_number:
-                continue
+            # Ripristina gli item, saltando la traccia cancellata e spostando quelle successive verso l'alto
+            for i in range(self.num_tracks + 1):
+                if i == track_number:
+                    continue
             
-            new_track = i if i < track_number else i - 1
-            y = new_track * self.track_height
+                new_track = i if i < track_number else i - 1
+                y = new_track * self.track_height
             
-            for item_data in track_items[i]:
-                item = MusicItem(0, 0, item_data['width'], item_data['name'], 
-                            item_data['settings'], self.track_height)
-                item.params = item_data['params']
-                item.color = item_data['color']
-                item.setBrush(item_data['color'])
-                item.setPos(item.params['cAttacco'] * self.pixels_per_beat * self.zoom_level, y)
-                self.addItem(item)
+                for item_data in track_items[i]:
+                    item = MusicItem(0, 0, item_data['width'], item_data['name'], 
+                                item_data['settings'], self.track_height)
+                    item.params = item_data['params']
+                    item.color = item_data['color']
+                    item.setPos(item.params['cAttacco'] * self.pixels_per_beat * self.zoom_level, y)
+                    self.addItem(item)
+
         # Aggiorna gli header dopo la cancellazione
         if self.views():
             main_view = self.views()[0]
@@ -158,6 +362,36 @@ class Timeline(QGraphicsScene):
             self.addItem(item)
             return item
 
+    def add_clips(self, records, name="Clip", settings=None):
+        """
+        Crea e aggiunge in un solo passaggio i clip descritti dalle coppie
+        (params, traccia); posizione e larghezza vengono da cAttacco e durata.
+        """
+        settings = settings or self.settings
+        scale = self.pixels_per_beat * self.zoom_level
+        items = []
+        previous, self.exact_positions = self.exact_positions, True
+        try:
+            with self.batch_update():
+                for params, track in records:
+                    width = float(first_value(params['durata'])) * scale
+                    item = MusicItem(0, 0, width, name, settings, self.track_height)
+                    item.params = copy.deepcopy(params)
+                    item.track_index = track
+                    item.setPos(float(first_value(params['cAttacco'])) * scale, track * self.track_height)
+                    self.addItem(item)
+                    items.append(item)
+        finally:
+            self.exact_positions = previous
+        return items
+
+    def remove_clips(self, items):
+        """Rimuove i clip indicati ancora presenti nella scena"""
+        with self.batch_update():
+            for item in items:
+                if not sip.isdeleted(item) and item.scene() is self:
+                    self.removeItem(item)
+
     def scale_track_height(self, factor):
         """
         Ridimensiona l'altezza delle tracce mantenendo le proporzioni
@@ -190,23 +424,23 @@ class Timeline(QGraphicsScene):
         required_height = self.num_tracks * self.track_height
         new_height = max(required_height, self.min_height)
         
-        # Aggiorna la scena
-        self.setSceneRect(0, 0, self.sceneRect().width(), new_height)
-        self.clear()
-        self.draw_tracks()
+        with self.batch_update():
+            # Aggiorna la scena
+            self.setSceneRect(0, 0, self.sceneRect().width(), new_height)
+            self.clear()
+            self.draw_tracks()
         
-        # Ripristina gli item con le nuove proporzioni
-        for item_data in stored_items:
-            new_y = item_data['track_index'] * self.track_height
-            item = MusicItem(0, 0, item_data['width'], item_data['name'], 
-                            item_data['settings'], self.track_height)
-            # Usa il nuovo metodo updateHeight per gestire il ridimensionamento
-            item.updateHeight(self.track_height)
-            item.params = item_data['params']
-            item.color = item_data['color']
-            item.setBrush(item_data['color'])
-            item.setPos(item_data['x'], new_y)
-            self.addItem(item)
+            # Ripristina gli item con le nuove proporzioni
+            for item_data in stored_items:
+                new_y = item_data['track_index'] * self.track_height
+                item = MusicItem(0, 0, item_data['width'], item_data['name'], 
+                                item_data['settings'], self.track_height)
+                # Usa il nuovo metodo updateHeight per gestire il ridimensionamento
+                item.updateHeight(self.track_height)
+                item.params = item_data['params']
+                item.color = item_data['color']
+                item.setPos(item_data['x'], new_y)
+                self.addItem(item)
         
         # Notifica il cambiamento agli altri componenti
         if self.views():
@@ -254,24 +488,32 @@ class Timeline(QGraphicsScene):
                             command.new_pos = QPointF(command.new_pos.x() * factor, command.new_pos.y())
                             item_data['command'] = command
 
-        self.clear()
-        self.setSceneRect(0, 0, new_width, current_height)
-        self.draw_tracks()
+        with self.batch_update():
+            self.clear()
+            self.setSceneRect(0, 0, new_width, current_height)
+            self.draw_tracks()
 
-        # Ricrea gli item mantenendo i riferimenti
-        for item_data in stored_items:
-            new_item = MusicItem(0, 0, item_data['width'], item_data['name'], 
-                            item_data['settings'], self.track_height)
-            item_map[item_data['original_item']] = new_item
-            new_item.params = item_data['params']
-            new_item.color = item_data['color']
-            new_item.setBrush(item_data['color'])
-            new_item.setPos(item_data['x'], item_data['y'])
-            new_item.setSelected(item_data['selected'])
-            self.addItem(new_item)
+            # Ricrea gli item mantenendo i riferimenti
+            for item_data in stored_items:
+                new_item = MusicItem(0, 0, item_data['width'], item_data['name'], 
+                                item_data['settings'], self.track_height)
+                item_map[item_data['original_item']] = new_item
+                new_item.params = item_data['params']
+                new_item.color = item_data['color']
+                new_item.setPos(item_data['x'], item_data['y'])
+                new_item.setSelected(item_data['selected'])
+                self.addItem(new_item)
             
-            if 'command' in item_data:
-                item_data['command'].item = new_item
+                if 'command' in item_data:
+                    item_data['command'].item = new_item
+
+        # I comandi su più item seguono gli item ricreati
+        if self.views():
+            main_window = self.views()[0].window()
+            if hasattr(main_window, 'command_manager'):
+                for command in main_window.command_manager._undo_stack + main_window.command_manager._redo_stack:
+                    if hasattr(command, 'remap'):
+                        command.remap(item_map, factor)
 
         # Aggiorna il ruler
         if self.views():
@@ -324,31 +566,212 @@ class Timeline(QGraphicsScene):
         self.update_track(track_number)
         self.update_track(new_position)
 
+        # Anche nome e stato della traccia la seguono
+        header_view = self.track_header_view()
+        if header_view is not None:
+            header_view.scene.swap_tracks(track_number, new_position)
+
     def update_track(self, track_number):
-        # Trova la traccia corrispondente al numero di traccia specificato
-        track_item = None
-        for item in self.items():
-            if isinstance(item, TrackItem) and item.track_number == track_number:
-                track_item = item
-                break
+        """Ridisegna lo sfondo della traccia indicata"""
+        if 0 <= track_number < self.num_tracks:
+            self.invalidate(self.track_rect(track_number), QGraphicsScene.BackgroundLayer)
 
-        if track_item:
-            # Aggiorna la posizione e le dimensioni della traccia
-            y = track_number * self.track_height
-            track_item.setRect(0, y, self.sceneRect().width(), self.track_height)
-            
-            # Ottieni il colore di base delle tracce dalle impostazioni
-            track_color = self.settings.get('track_background_color', '#F0F0F0')
-            track_item.updateColors(track_color)  # Aggiorna i colori della traccia
-
-class TrackItem(QGraphicsRectItem):
-    def __init__(self, x, y, width, height, track_number):
-        super().__init__(x, y, width, height)
-        self.track_number = track_number
-        self.setAcceptHoverEvents(True)
-        self.base_color = None  # Colore di base dalla settings
-        self.hover_color = None # Colore per hover
-        
-    def updateColors(self, base_color):
-        self.base_color = QColor(base_color)
-        self.setBrush(QBrush(self.base_color))
+    def clear(self):
+        # clear() distrugge gli item senza notificarli: gli indici vanno scartati qui
+        self.clip_index.invalidate()
+        self.param_index.invalidate()
+        self.highlighted_items = set()
+        self.preview_rects = []
+        super().clear()
+
+    def set_highlighted(self, items):
+        """
+        Evidenzia esattamente gli item indicati (risultati di una ricerca).
+        Si ridisegnano solo i clip il cui stato cambia, non l'intera scena.
+        Restituisce il numero di clip cambiati.
+        """
+        new = {item for item in items if not sip.isdeleted(item) and item.scene() is self}
+        old = {item for item in self.highlighted_items if not sip.isdeleted(item)}
+        changed = new ^ old
+        for item in changed:
+            item.highlighted = item in new
+            item.update()
+        self.highlighted_items = new
+        return len(changed)
+
+    def move_items(self, items, positions):
+        """
+        Sposta più clip in un solo passaggio aggiornando traccia e
+        cAttacco, senza propagare ogni spostamento al resto della selezione.
+        """
+        scale = self.pixels_per_beat * self.zoom_level
+        previous, self.exact_positions = self.exact_positions, True
+        try:
+            for item, pos in zip(items, positions):
+                item.setPos(pos)
+                item.track_index = max(0, min(int(item.pos().y() / self.track_height), self.num_tracks - 1))
+                item.params['cAttacco'] = round(item.pos().x() / scale, 3)
+        finally:
+            self.exact_positions = previous
+
+    def apply_params(self, items, values):
+        """
+        Scrive in più clip i valori di primo livello indicati (uno per clip)
+        e riallinea posizione e larghezza se cambiano cAttacco o durata.
+        """
+        scale = self.pixels_per_beat * self.zoom_level
+        previous, self.exact_positions = self.exact_positions, True
+        try:
+            for item, changes in zip(items, values):
+                item.params.update(copy.deepcopy(changes))
+                if 'cAttacco' in changes:
+                    item.setPos(float(first_value(item.params['cAttacco'])) * scale, item.pos().y())
+                if 'durata' in changes:
+                    width = float(first_value(item.params['durata'])) * scale
+                    item.setRect(0, 0, width, item.rect().height())
+        finally:
+            self.exact_positions = previous
+
+    def transform_plan(self, operation, items, **options):
+        """
+        Calcola una trasformazione di sezione (vedi Transforms) sui clip
+        indicati senza modificarli. Restituisce le quadruple
+        (item, inizio, durata, traccia) dei soli clip che cambiano.
+        Solleva ValueError per opzioni non valide.
+        """
+        from src.Transforms import apply_transform
+        items = list(items)
+        if not items:
+            return []
+        scale = self.pixels_per_beat * self.zoom_level
+        starts = [item.pos().x() / scale for item in items]
+        durations = [item.rect().width() / scale for item in items]
+        tracks = [max(0, min(int(item.pos().y() // self.track_height), self.num_tracks - 1))
+                  for item in items]
+        new_starts, new_durations, new_tracks = apply_transform(
+            operation, starts, durations, tracks, self.num_tracks, **options)
+        plan = []
+        for item, start, duration, track, *new in zip(items, starts, durations, tracks,
+                                                      new_starts.tolist(), new_durations.tolist(),
+                                                      new_tracks.tolist()):
+            if abs(new[0] - start) > 1e-6 or abs(new[1] - duration) > 1e-6 or new[2] != track:
+                plan.append((item, new[0], new[1], new[2]))
+        return plan
+
+    def set_preview(self, plan):
+        """Mostra tratteggiati i clip come sarebbero dopo la trasformazione (plan vuoto: nasconde)"""
+        scale = self.pixels_per_beat * self.zoom_level
+        old = self.preview_rects
+        self.preview_rects = [QRectF(start * scale, track * self.track_height + 1,
+                                     duration * scale, self.track_height - 2)
+                              for _, start, duration, track in plan]
+        for rects in (old, self.preview_rects):
+            if rects:
+                bounds = rects[0]
+                for preview in rects[1:]:
+                    bounds = bounds.united(preview)
+                self.update(bounds.adjusted(-1, -1, 1, 1))
+
+    def nearest_marker(self, x):
+        """Tacca del righello (anche le suddivisioni) più vicina a x"""
+        interval, subdivisions = ruler_interval(self.zoom_level)
+        spacing = self.pixels_per_beat * self.zoom_level * interval / subdivisions
+        return round(x / spacing) * spacing
+
+    def magnetic_snap(self, edges, exclude=(), tolerance=SNAP_DISTANCE):
+        """
+        Correzione minima che porta uno dei bordi `edges` (coordinate x)
+        sul bordo di un altro clip o su una tacca del righello.
+        Restituisce None se niente è entro tolerance o lo snap è disattivato.
+        """
+        if not self.settings.get('snap_to_edges', True):
+            return None
+        best = None
+        for edge in edges:
+            for target in (self.clip_index.nearest_edge(edge, tolerance, exclude),
+                           self.nearest_marker(edge)):
+                if target is None or abs(target - edge) > tolerance:
+                    continue
+                if best is None or abs(target - edge) < abs(best):
+                    best = target - edge
+        return best
+
+    def clip_items(self):
+        """Tutti i clip della scena"""
+        return [item for item in self.items() if isinstance(item, MusicItem)]
+
+    def select_items(self, items, extend=False):
+        """
+        Seleziona gli item indicati con una sola notifica selectionChanged.
+        Con extend=False deseleziona tutto il resto.
+        """
+        items = list(items)
+        targets = set(items)
+        changed = False
+        self.blockSignals(True)
+        try:
+            if not extend:
+                for item in self.selectedItems():
+                    if item not in targets:
+                        item.setSelected(False)
+                        changed = True
+            for item in items:
+                if not item.isSelected():
+                    item.setSelected(True)
+                    changed = True
+        finally:
+            self.blockSignals(False)
+        if changed:
+            self.selectionChanged.emit()
+        return items
+
+    def select_time_range(self, start, end, tracks=None, extend=False):
+        """Seleziona i clip che si sovrappongono a [start, end) secondi"""
+        scale = self.pixels_per_beat * self.zoom_level
+        items = self.clip_index.overlapping(start * scale, end * scale)
+        if tracks is not None:
+            tracks = set(tracks)
+            items = [item for item in items if self.track_at(item.pos().y()) in tracks]
+        return self.select_items(items, extend)
+
+    def select_tracks(self, tracks, extend=False):
+        """Seleziona tutti i clip delle tracce indicate"""
+        tracks = set(tracks)
+        return self.select_items(
+            [item for item in self.clip_index if self.track_at(item.pos().y()) in tracks],
+            extend
+        )
+
+    def select_where(self, predicate, extend=False):
+        """Seleziona i clip i cui parametri soddisfano predicate(params)"""
+        return self.select_items(
+            [item for item in self.clip_index if predicate(item.params)],
+            extend
+        )
+
+    def query_records(self, items):
+        """Coppie (params, traccia) per ClipQuery"""
+        return [(item.params, self.track_at(item.pos().y())) for item in items]
+
+    def query(self, query):
+        """
+        Clip che soddisfano una query (testo o ClipQuery già compilata),
+        es. "durata > 3 and track in {2,4}". Solleva QuerySyntaxError.
+        """
+        from src.ClipQuery import compile_query
+        if isinstance(query, str):
+            query = compile_query(query)
+        items = list(self.clip_index)
+        return [items[i] for i in query.indices(self.query_records(items))]
+
+    def select_query(self, query, extend=False):
+        """Seleziona i clip che soddisfano la query"""
+        return self.select_items(self.query(query), extend)
+
+    def select_rect(self, rect, extend=False):
+        """Seleziona i clip che intersecano il rettangolo (coordinate della scena)"""
+        items = [
+            item for item in self.clip_index.overlapping(rect.left(), rect.right())
+            if item.sceneBoundingRect().intersects(rect)
+        ]
+        return self.select_items(items, extend)
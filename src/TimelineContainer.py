@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QSizePolicy, QGraphicsView, QSplitter
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QObject, pyqtSlot
 
 """from TimelineView import TimelineView
 from TrackHeaderView import TrackHeaderView
@@ -8,6 +8,7 @@ from TimelineRuler import TimelineRuler
 from src.TimelineView import TimelineView
 from src.TrackHeaderView import TrackHeaderView
 from src.TimelineRuler import TimelineRuler
+from src.TimelineMinimap import TimelineMinimap
 
 
 class TimelineRulerView(QGraphicsView):
@@ -44,7 +45,7 @@ class TimelineRulerView(QGraphicsView):
             print(f"Range: {timeline_scroll.minimum()} to {timeline_scroll.maximum()}")
 
     def wheelEvent(self, event):
-        self.debug_scroll_state("Before Wheel Event")
+        #self.debug_scroll_state("Before Wheel Event")
         #print("\n=== Debug TimelineRulerView Wheel Event ===")
         if self.timeline_view:
             #print("Delegating wheel event to timeline view")
@@ -52,7 +53,7 @@ class TimelineRulerView(QGraphicsView):
         else:
             #print("No timeline view to delegate to, handling locally")
             super().wheelEvent(event)
-        self.debug_scroll_state("After Wheel Event")
+        #self.debug_scroll_state("After Wheel Event")
 
     def update_zoom(self, zoom_level):
         """Delega l'aggiornamento dello zoom alla scena"""
@@ -69,10 +70,95 @@ class TimelineRulerView(QGraphicsView):
         else:
             super().keyPressEvent(event)
 
+class ViewSyncController(QObject):
+    """
+    Sincronizza le scrollbar delle viste della timeline.
+
+    Ogni coppia (primaria, secondaria) ha esattamente una connessione per
+    direzione sui valori e una sui range: collegare di nuovo la stessa
+    coppia non ha effetto, quindi uno scroll costa sempre un solo handler.
+    Il range della secondaria segue quello della primaria anche quando la
+    view secondaria lo ricalcola da sola.
+
+    Le scrollbar sono collegate a slot Qt del controller: Qt scioglie i
+    collegamenti quando il controller viene distrutto, e `unlink` li
+    scioglie alla chiusura della timeline.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pairs = []
+        self._syncing = False
+
+    @property
+    def pairs(self):
+        return list(self._pairs)
+
+    def link(self, primary, follower):
+        """Collega due scrollbar. Restituisce False se la coppia esiste già"""
+        if (primary, follower) in self._pairs:
+            return False
+        self._pairs.append((primary, follower))
+
+        for scroll_bar in (primary, follower):
+            scroll_bar.valueChanged.connect(self._value_changed, Qt.UniqueConnection)
+            scroll_bar.rangeChanged.connect(self._range_changed, Qt.UniqueConnection)
+
+        self._sync_range(primary, follower)
+        self._sync_value(follower, primary.value())
+        return True
+
+    def unlink(self):
+        """Scollega tutte le coppie di scrollbar"""
+        linked = {scroll_bar for pair in self._pairs for scroll_bar in pair}
+        self._pairs = []
+        for scroll_bar in linked:
+            scroll_bar.valueChanged.disconnect(self._value_changed)
+            scroll_bar.rangeChanged.disconnect(self._range_changed)
+
+    def sync(self):
+        """Allinea subito range e valori di tutte le coppie alla primaria"""
+        for primary, follower in self._pairs:
+            self._sync_range(primary, follower)
+            self._sync_value(follower, primary.value())
+
+    @pyqtSlot(int)
+    def _value_changed(self, value):
+        sender = self.sender()
+        for primary, follower in self._pairs:
+            if sender is primary:
+                self._sync_value(follower, value)
+            elif sender is follower:
+                self._sync_value(primary, value)
+
+    @pyqtSlot(int, int)
+    def _range_changed(self, minimum, maximum):
+        sender = self.sender()
+        for primary, follower in self._pairs:
+            if sender is primary or sender is follower:
+                self._sync_range(primary, follower)
+
+    def _sync_value(self, target, value):
+        if self._syncing:
+            return
+        self._syncing = True
+        try:
+            target.setValue(value)
+        finally:
+            self._syncing = False
+
+    def _sync_range(self, primary, follower):
+        if (follower.minimum(), follower.maximum()) != (primary.minimum(), primary.maximum()):
+            follower.setRange(primary.minimum(), primary.maximum())
+        follower.setPageStep(primary.pageStep())
+
+
 class TimelineContainer(QWidget):
     """
     Container principale che gestisce il layout dell'intera timeline,
-    inclusi ruler, track headers e la timeline principale
+    inclusi ruler, track headers e la timeline principale.
+
+    L'inizializzazione avviene in un solo passaggio nel costruttore: le
+    scrollbar sono collegate una volta sola tramite ViewSyncController.
     """
     def __init__(self, scene):
         super().__init__()
@@ -80,17 +166,17 @@ class TimelineContainer(QWidget):
         self._track_header_view = TrackHeaderView()
         self._timeline_view = TimelineView(self._scene)
         self._track_header_view.set_timeline_view(self._timeline_view)
-        self._ruler_scene = TimelineRuler(self._scene.settings, self._scene)
-        self._ruler_view = TimelineRulerView(self._ruler_scene, self._timeline_view)
+        self._ruler_scene = None
+        self._ruler_view = None
+        self._minimap = None
         self._is_closing = False    
-        # Imposta dimensioni minime
-        self._track_header_view.setMinimumWidth(80)
-        self._track_header_view.setMaximumWidth(200)
+        # Imposta dimensioni minime (i limiti dell'header li fissa TrackHeaderView)
         self._timeline_view.setMinimumWidth(50)
         self.splitter_handle_width = 1
+        self.sync_controller = ViewSyncController(self)
 
         self.setup_ui()
-        QTimer.singleShot(10, self.setup_connections)
+        self.setup_connections()
 
         # Aggiorna le tracce se la scena esiste
         if self._scene:
@@ -98,30 +184,7 @@ class TimelineContainer(QWidget):
                 self._scene.num_tracks,
                 self._scene.track_height
             )
-        QTimer.singleShot(0, self.initialize_views)
-
-        QTimer.singleShot(100, self.setup_scroll_sync)  # Aggiungiamo questo
-
-    def setup_scroll_sync(self):
-        """Setup della sincronizzazione dello scroll dopo l'inizializzazione"""
-        if self._timeline_view and self._ruler_view:
-            timeline_scroll = self._timeline_view.horizontalScrollBar()
-            ruler_scroll = self._ruler_view.horizontalScrollBar()
-            
-            # Sincronizza i range
-            max_range = max(timeline_scroll.maximum(), ruler_scroll.maximum())
-            page_step = max(timeline_scroll.pageStep(), ruler_scroll.pageStep())
-            
-            timeline_scroll.setMaximum(max_range)
-            ruler_scroll.setMaximum(max_range)
-            timeline_scroll.setPageStep(page_step)
-            ruler_scroll.setPageStep(page_step)
-            
-            # Connetti gli scroll
-            timeline_scroll.valueChanged.connect(
-                lambda value: ruler_scroll.setValue(value))
-            ruler_scroll.valueChanged.connect(
-                lambda value: timeline_scroll.setValue(value))
+        self.initialize_views()
 
     @property
     def scene(self):
@@ -143,31 +206,16 @@ class TimelineContainer(QWidget):
     def ruler_scene(self):
         return self._ruler_scene
 
+    @property
+    def minimap(self):
+        return self._minimap
+
     def closeEvent(self, event):
         """Gestisce la pulizia durante la chiusura"""
         self._is_closing = True
+        self.sync_controller.unlink()
         super().closeEvent(event)
 
-    def connect_scrollbars(self):
-        """Connette le scrollbar tra timeline e ruler"""
-        """print("\n=== Connecting Scrollbars ===")
-        print(f"Timeline view exists: {self._timeline_view is not None}")
-        print(f"Ruler view exists: {hasattr(self, '_ruler_view')}")
-        
-        if not hasattr(self, '_ruler_view'):
-            print("Ruler view not yet initialized, skipping connection")
-            return
-        """    
-        if self._timeline_view and self._ruler_view:
-            #print("Both views exist, connecting scrollbars")
-            # Connessione per lo scroll orizzontale con controllo di sicurezza
-            def safe_scroll_sync(value):
-                if hasattr(self, '_ruler_view') and self._ruler_view:
-                    self._ruler_view.horizontalScrollBar().setValue(value)
-                    
-            self._timeline_view.horizontalScrollBar().valueChanged.connect(safe_scroll_sync)
-            print("Horizontal scrollbar connection established")     
-
     def debug_view_state(self):
         """Debug helper per lo stato completo delle viste"""
         """print("\n=== Complete View State Debug ===")
@@ -211,8 +259,23 @@ class TimelineContainer(QWidget):
 
             timeline_container = self.create_timeline_section()
             main_layout.addWidget(timeline_container)
-            #print("About to connect scrollbars")
-            QTimer.singleShot(0, self.connect_scrollbars)
+
+            # Panoramica di tutta la timeline per navigare senza zoomare
+            self._minimap = TimelineMinimap(self._scene, self._timeline_view)
+            main_layout.addWidget(self._minimap)
+
+    def setup_connections(self):
+        """
+        Collega le scrollbar: orizzontale timeline -> ruler e verticale
+        timeline -> track header. Può essere richiamato senza duplicare
+        le connessioni.
+        """
+        if self._timeline_view and self._ruler_view:
+            self.sync_controller.link(self._timeline_view.horizontalScrollBar(),
+                                      self._ruler_view.horizontalScrollBar())
+        if self._timeline_view and self._track_header_view:
+            self.sync_controller.link(self._timeline_view.verticalScrollBar(),
+                                      self._track_header_view.verticalScrollBar())
 
     def _safe_update_ruler(self):
         """Metodo sicuro per aggiornare il ruler"""
@@ -249,45 +312,21 @@ class TimelineContainer(QWidget):
 
         self._ruler_scene = TimelineRuler(self._scene.settings, self._scene)
         self._ruler_view = TimelineRulerView(self._ruler_scene, self._timeline_view)
-        #print(f"Ruler view created: {self._ruler_view is not None}")
-        
-        """
-        # Forza stesso viewport width tra ruler e timeline
-        if self._timeline_view:
-            viewport_width = self._timeline_view.viewport().width()
-            self._ruler_view.setViewportMargins(0, 0, 0, 0)
-            self._ruler_view.setFixedWidth(viewport_width)
-            self._ruler_view.viewport().setFixedWidth(viewport_width)
-            
-            # Aggiorna il range della scrollbar per riflettere il nuovo viewport
-            ruler_scrollbar = self._ruler_view.horizontalScrollBar()
-            timeline_scrollbar = self._timeline_view.horizontalScrollBar()
-            ruler_scrollbar.setRange(0, timeline_scrollbar.maximum())
-            ruler_scrollbar.setPageStep(timeline_scrollbar.pageStep())
-        """
         ruler_layout.addWidget(self._ruler_view)
 
-        # Forza l'aggiornamento dopo la creazione
-        QTimer.singleShot(0, lambda: self._ruler_view.viewport().update())
-
         return ruler_container
 
     def resizeEvent(self, event):
         """Gestisce il ridimensionamento della finestra"""
         super().resizeEvent(event)
         
-        # Aggiorna la larghezza del ruler quando la timeline viene ridimensionata
+        # Aggiorna la larghezza del ruler quando la timeline viene ridimensionata;
+        # i range delle scrollbar li riallinea il sync controller
         if self._timeline_view and self._ruler_view:
             viewport_width = self._timeline_view.viewport().width()
             self._ruler_view.setFixedWidth(viewport_width)
             self._ruler_view.viewport().setFixedWidth(viewport_width)
             
-            # Ricalcola i range delle scrollbar
-            ruler_scrollbar = self._ruler_view.horizontalScrollBar()
-            timeline_scrollbar = self._timeline_view.horizontalScrollBar()
-            ruler_scrollbar.setRange(0, timeline_scrollbar.maximum())
-            ruler_scrollbar.setPageStep(timeline_scrollbar.pageStep())
-            
     def create_timeline_section(self):
         timeline_container = QWidget()
         timeline_layout = QHBoxLayout(timeline_container)
@@ -308,6 +347,8 @@ class TimelineContainer(QWidget):
         # Imposta i fattori di stretch
         splitter.setStretchFactor(0, 0)  # header view non si estende
         splitter.setStretchFactor(1, 1)  # timeline view si estende
+        # Larghezza iniziale dell'header; il resto va alla timeline
+        splitter.setSizes([self._track_header_view.current_width, self.width()])
         
         timeline_layout.addWidget(splitter)
         return timeline_container
@@ -319,31 +360,6 @@ class TimelineContainer(QWidget):
             self.track_header_view.current_width = pos
             self.track_header_view.update_tracks_width()
 
-    def handle_horizontal_scroll(self, value):
-        #print("\n=== Debug Horizontal Scroll Sync ===")
-        #print(f"handle_horizontal_scroll called with value: {value}")
-        
-        # Debug timeline scrollbar
-        timeline_scroll_value = self._timeline_view.horizontalScrollBar().value()
-        #print(f"Timeline scrollbar value: {timeline_scroll_value}")
-        
-        # Debug ruler view
-        ruler_view = getattr(self, '_ruler_view', None)
-        #print(f"Ruler view exists: {ruler_view is not None}")
-        
-        """if ruler_view:
-            print(f"Before update - Ruler scrollbar value: {ruler_view.horizontalScrollBar().value()}")
-            ruler_view.horizontalScrollBar().setValue(value)
-            print(f"After update - Ruler scrollbar value: {ruler_view.horizontalScrollBar().value()}")
-            print(f"Timeline scroll range: {self._timeline_view.horizontalScrollBar().minimum()} to {self._timeline_view.horizontalScrollBar().maximum()}")
-            print(f"Ruler scroll range: {ruler_view.horizontalScrollBar().minimum()} to {ruler_view.horizontalScrollBar().maximum()}")
-            
-            ruler_view.viewport().update()
-        else:
-            print("No ruler_view found!")
-"""
-            
-    # In TimelineContainer.py
     def debug_scroll_state(self):
         """Debug helper per lo stato delle scrollbar"""
         #print("\n=== Scroll State Debug ===")
@@ -365,175 +381,19 @@ class TimelineContainer(QWidget):
             print(f"  Single Step: {ruler_scroll.singleStep()}")
 """
     def initialize_views(self):
-        """Inizializza e sincronizza le viste dopo la costruzione"""
         """
-        print("\n=== Debug View Initialization ===")
-        
+        Allinea lo zoom del ruler alla timeline e sincronizza le scrollbar.
+        Non crea connessioni, quindi può essere richiamato dopo cambi di
+        tracce o di zoom.
+        """
         if self._is_closing:
-            print("View initialization aborted - container is closing")
             return
-            
-        # Debug dello stato delle viste
-        print(f"Timeline view exists: {self._timeline_view is not None}")
-        print(f"Ruler view exists: {self._ruler_view is not None}")
-        print(f"Track header view exists: {self._track_header_view is not None}")
-"""
-        # Sincronizza i range orizzontali
-        if self._timeline_view and self._ruler_view:
-            timeline_scroll = self._timeline_view.horizontalScrollBar()
-            ruler_scroll = self._ruler_view.horizontalScrollBar()
-            
-            # Debug stato iniziale
-            #print("\nInitial Scroll State:")
-            #print(f"Timeline scroll - Range: {timeline_scroll.minimum()} to {timeline_scroll.maximum()}, Page Step: {timeline_scroll.pageStep()}")
-            #print(f"Ruler scroll - Range: {ruler_scroll.minimum()} to {ruler_scroll.maximum()}, Page Step: {ruler_scroll.pageStep()}")
-            
-            # Usa il range più grande tra i due
-            max_range = max(timeline_scroll.maximum(), ruler_scroll.maximum())
-            page_step = max(timeline_scroll.pageStep(), ruler_scroll.pageStep())
-            
-            #print(f"\nSynchronizing horizontal scroll ranges to max: {max_range}, page step: {page_step}")
-            
-            # Imposta gli stessi valori per entrambe le scrollbar
-            timeline_scroll.setMaximum(max_range)
-            ruler_scroll.setMaximum(max_range)
-            timeline_scroll.setPageStep(page_step)
-            ruler_scroll.setPageStep(page_step)
-            
-            # Sincronizza il valore iniziale
-            current_value = timeline_scroll.value()
-            ruler_scroll.setValue(current_value)
-            
-            #print(f"Initial sync complete - Timeline: {timeline_scroll.value()}, Ruler: {ruler_scroll.value()}")
-
-        # Sincronizza i range verticali
-        if self._timeline_view and self._track_header_view:
-            timeline_v_scroll = self._timeline_view.verticalScrollBar()
-            header_v_scroll = self._track_header_view.verticalScrollBar()
-            
-            # Debug stato verticale iniziale
-            #print("\nInitial Vertical Scroll State:")
-            #print(f"Timeline vertical scroll - Range: {timeline_v_scroll.minimum()} to {timeline_v_scroll.maximum()}")
-            #print(f"Header vertical scroll - Range: {header_v_scroll.minimum()} to {header_v_scroll.maximum()}")
-            
-            max_v_range = max(timeline_v_scroll.maximum(), header_v_scroll.maximum())
-            v_page_step = max(timeline_v_scroll.pageStep(), header_v_scroll.pageStep())
-            
-            # Imposta gli stessi valori per le scrollbar verticali
-            timeline_v_scroll.setMaximum(max_v_range)
-            header_v_scroll.setMaximum(max_v_range)
-            timeline_v_scroll.setPageStep(v_page_step)
-            header_v_scroll.setPageStep(v_page_step)
-            
-            # Sincronizza il valore verticale iniziale
-            v_current_value = timeline_v_scroll.value()
-            header_v_scroll.setValue(v_current_value)
-            
-            #print(f"Vertical sync complete - Timeline: {timeline_v_scroll.value()}, Header: {header_v_scroll.value()}")
 
         # Aggiorna il ruler con il livello di zoom corrente
-        if self._ruler_view and not self._is_closing:
+        if self._ruler_view:
             try:
                 self._ruler_view.update_zoom(self._scene.zoom_level)
-                self._ruler_view.viewport().update()
-                #print(f"\nRuler zoom updated to: {self._scene.zoom_level}")
             except RuntimeError as e:
                 print(f"Error updating ruler zoom: {e}")
 
-        # Sincronizza lo scroll orizzontale iniziale
-        if self._timeline_view and self._ruler_view and not self._is_closing:
-            try:
-                current_scroll = self._timeline_view.horizontalScrollBar().value()
-                self._ruler_view.horizontalScrollBar().setValue(current_scroll)
-                #print(f"\nInitial horizontal scroll sync - Value: {current_scroll}")
-            except RuntimeError as e:
-                print(f"Error in initial horizontal scroll sync: {e}")
-        # Imposta il valore iniziale delle scrollbar verticali a 0
-        if self._timeline_view and not self._is_closing:
-            self._timeline_view.verticalScrollBar().setValue(0)
-            #print("\nTimeline vertical scroll reset to 0")
-                
-        if self._track_header_view and not self._is_closing:
-            self._track_header_view.verticalScrollBar().setValue(0)
-            #print("Track header vertical scroll reset to 0")
-
-        if self._timeline_view and self._ruler_view:
-            current_scroll = self._timeline_view.horizontalScrollBar().value()
-            self._ruler_view.horizontalScrollBar().setValue(current_scroll)
-        """# Verifica finale dello stato
-        if self._timeline_view and self._ruler_view:
-            print("\nFinal Scroll State:")
-            print(f"Timeline horizontal value: {self._timeline_view.horizontalScrollBar().value()}")
-            print(f"Ruler horizontal value: {self._ruler_view.horizontalScrollBar().value()}")
-            if self._track_header_view:
-                print(f"Header vertical value: {self._track_header_view.verticalScrollBar().value()}")
-"""
-    def setup_connections(self):
-        """Configura le connessioni tra i vari componenti"""
-        # Verifica presenza delle view necessarie
-        """if not hasattr(self, '_timeline_view') or not hasattr(self, '_track_header_view'):
-            print("Views non inizializzate, skip connessioni")
-            return
-"""
-        # 1. Configurazione scrollbar verticali
-        timeline_scroll = self._timeline_view.verticalScrollBar()
-        header_scroll = self._track_header_view.verticalScrollBar()
-
-        # Sincronizza i range
-        max_value = max(timeline_scroll.maximum(), header_scroll.maximum())
-        page_step = max(timeline_scroll.pageStep(), header_scroll.pageStep())
-        
-        timeline_scroll.setMaximum(max_value)
-        header_scroll.setMaximum(max_value)
-        timeline_scroll.setPageStep(page_step)
-        header_scroll.setPageStep(page_step)
-
-        # 2. Connessione bidirezionale delle scrollbar
-        # Da timeline a header
-        timeline_scroll.valueChanged.connect(header_scroll.setValue)
-        # Da header a timeline
-        header_scroll.valueChanged.connect(timeline_scroll.setValue)
-
-        # 3. Configurazione scrollbar orizzontali per ruler
-        if hasattr(self, '_ruler_view'):
-            timeline_h_scroll = self._timeline_view.horizontalScrollBar()
-            ruler_h_scroll = self._ruler_view.horizontalScrollBar()
-
-            # Sincronizza range orizzontali
-            h_max = max(timeline_h_scroll.maximum(), ruler_h_scroll.maximum())
-            h_page = max(timeline_h_scroll.pageStep(), ruler_h_scroll.pageStep())
-            
-            timeline_h_scroll.setMaximum(h_max)
-            ruler_h_scroll.setMaximum(h_max)
-            timeline_h_scroll.setPageStep(h_page)
-            ruler_h_scroll.setPageStep(h_page)
-
-            # Connessione bidirezionale orizzontale
-            timeline_h_scroll.valueChanged.connect(ruler_h_scroll.setValue)
-            ruler_h_scroll.valueChanged.connect(timeline_h_scroll.setValue)
-
-        # 4. Connessione track header view alla timeline
-        self._track_header_view.set_timeline_view(self._timeline_view)
-        """
-        # 5. Debug output
-        print(f"Connections setup complete")
-        print(f"Vertical range: max={max_value}, page_step={page_step}")
-        if hasattr(self, '_ruler_view'):
-            print(f"Horizontal range: max={h_max}, page_step={h_page}")"""
-    
-        if hasattr(self, '_ruler_view'):
-            timeline_h_scroll = self._timeline_view.horizontalScrollBar()
-            ruler_h_scroll = self._ruler_view.horizontalScrollBar()
-
-            # Sincronizza i range
-            h_max = max(timeline_h_scroll.maximum(), ruler_h_scroll.maximum())
-            h_page = max(timeline_h_scroll.pageStep(), ruler_h_scroll.pageStep())
-            
-            timeline_h_scroll.setMaximum(h_max)
-            ruler_h_scroll.setMaximum(h_max)
-            timeline_h_scroll.setPageStep(h_page)
-            ruler_h_scroll.setPageStep(h_page)
-
-            # Connetti gli scroll
-            timeline_h_scroll.valueChanged.connect(ruler_h_scroll.setValue)
-            ruler_h_scroll.valueChanged.connect(timeline_h_scroll.setValue)
\ No newline at end of file
+        self.sync_controller.sync()
@@ -0,0 +1,146 @@
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, QRectF, QPointF
+from PyQt5.QtGui import QImage, QPainter, QPen, QColor, QTransform
+
+from src.MusicItem import MusicItem
+
+MINIMAP_HEIGHT = 60
+# Oltre questo numero di regioni modificate conviene ridisegnare tutto
+MAX_DIRTY_REGIONS = 32
+VIEWPORT_PEN = QPen(QColor(220, 40, 40), 1)
+VIEWPORT_FILL = QColor(220, 40, 40, 30)
+
+
+class TimelineMinimap(QWidget):
+    """
+    Panoramica dell'intera timeline sotto la vista principale.
+
+    I clip sono disegnati una volta in un'immagine ridotta alla
+    dimensione del widget; quando la scena cambia vengono ridisegnate
+    solo le regioni modificate. Sopra l'immagine è mostrato il
+    rettangolo visibile della vista: un click (o un trascinamento)
+    centra la vista sul punto scelto senza cambiare lo zoom.
+    """
+    def __init__(self, scene, view, parent=None):
+        super().__init__(parent)
+        self._scene = scene
+        self._view = view
+        self._image = None
+        self._image_key = None
+        self._dirty_regions = []
+        self.rebuild_count = 0
+        self.setFixedHeight(MINIMAP_HEIGHT)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setCursor(Qt.PointingHandCursor)
+
+        scene.changed.connect(self.on_scene_changed)
+        scene.sceneRectChanged.connect(self.invalidate)
+        for scrollbar in (view.horizontalScrollBar(), view.verticalScrollBar()):
+            scrollbar.valueChanged.connect(self.update)
+            scrollbar.rangeChanged.connect(self.update)
+
+    def scene_transform(self):
+        """Trasformazione dalle coordinate della scena a quelle del widget"""
+        rect = self._scene.sceneRect()
+        if rect.width() <= 0 or rect.height() <= 0 or self.width() <= 0:
+            return QTransform()
+        sx = self.width() / rect.width()
+        sy = self.height() / rect.height()
+        return QTransform(sx, 0, 0, sy, -rect.x() * sx, -rect.y() * sy)
+
+    def invalidate(self, *args):
+        """Scarta l'immagine: verrà ricostruita al prossimo paint"""
+        self._image = None
+        self._dirty_regions = []
+        self.update()
+
+    def on_scene_changed(self, regions):
+        if self._image is None:
+            return
+        self._dirty_regions.extend(regions)
+        if len(self._dirty_regions) > MAX_DIRTY_REGIONS:
+            self.invalidate()
+        else:
+            self.update()
+
+    def render_image(self):
+        """Restituisce l'immagine dei clip, aggiornando solo ciò che è cambiato"""
+        key = (self.width(), self.height(), self._scene.zoom_level,
+               tuple(self._scene.sceneRect().getRect()))
+        if self._image is None or key != self._image_key:
+            self.rebuild()
+            self._image_key = key
+        elif self._dirty_regions:
+            regions, self._dirty_regions = self._dirty_regions, []
+            transform = self.scene_transform()
+            for region in regions:
+                # Allarga ai pixel interi: il pixel copre più di una regione della scena
+                target = transform.mapRect(region).toAlignedRect().adjusted(-1, -1, 1, 1)
+                self._draw_region(QRectF(target), transform)
+        return self._image
+
+    def rebuild(self):
+        """Ridisegna da zero l'immagine ridotta"""
+        self.rebuild_count += 1
+        self._dirty_regions = []
+        self._image = QImage(max(1, self.width()), max(1, self.height()), QImage.Format_RGB32)
+        self._draw_region(QRectF(self._image.rect()), self.scene_transform())
+
+    def _draw_region(self, target, transform):
+        target = target.intersected(QRectF(self._image.rect()))
+        if target.isEmpty():
+            return
+        inverse, invertible = transform.inverted()
+        if not invertible:
+            return
+        scene_rect = inverse.mapRect(target)
+
+        painter = QPainter(self._image)
+        try:
+            painter.setClipRect(target)
+            painter.fillRect(target, self._scene.backgroundBrush().color())
+            for item in self._scene.items(scene_rect):
+                if isinstance(item, MusicItem):
+                    rect = transform.mapRect(item.sceneBoundingRect())
+                    # Anche i clip più stretti di un pixel restano visibili
+                    rect.setWidth(max(rect.width(), 1.0))
+                    painter.fillRect(rect, item.color)
+        finally:
+            painter.end()
+
+    def viewport_rect(self):
+        """Rettangolo visibile della vista, in coordinate del widget"""
+        visible = self._view.mapToScene(self._view.viewport().rect()).boundingRect()
+        return self.scene_transform().mapRect(visible)
+
+    def jump_to(self, pos):
+        """Centra la vista principale sul punto del widget indicato"""
+        inverse, invertible = self.scene_transform().inverted()
+        if invertible:
+            self._view.centerOn(inverse.map(QPointF(pos)))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawImage(0, 0, self.render_image())
+        painter.setPen(VIEWPORT_PEN)
+        painter.setBrush(VIEWPORT_FILL)
+        painter.drawRect(self.viewport_rect().adjusted(0, 0, -1, -1))
+        painter.end()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.invalidate()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.jump_to(event.pos())
+            event.accept()
+        else:
+            super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton:
+            self.jump_to(event.pos())
+            event.accept()
+        else:
+            super().mouseMoveEvent(event)
@@ -2,6 +2,26 @@ from PyQt5.QtWidgets import QGraphicsScene, QGraphicsTextItem
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QPen, QColor, QBrush
 
+def ruler_interval(zoom_level):
+    """Intervallo (secondi) tra le tacche principali e numero di suddivisioni"""
+    if zoom_level < 0.05:
+        return 60, 2
+    elif zoom_level < 0.15:
+        return 60, 6
+    elif zoom_level < 0.2:
+        return 30, 6
+    elif zoom_level < 0.75:
+        return 10, 5
+    elif zoom_level < 1.25:
+        return 5, 5
+    elif zoom_level < 3:
+        return 1, 4
+    elif zoom_level < 4:
+        return 0.5, 4
+    else:
+        return 0.1, 2
+
+
 class TimelineRuler(QGraphicsScene):
     """
     Gestisce il righello temporale sopra la timeline principale.
@@ -45,30 +65,7 @@ class TimelineRuler(QGraphicsScene):
         width = int(self.sceneRect().width())
         
         # Determina l'intervallo in base allo zoom
-        if self.zoom_level < 0.05:
-            interval = 60
-            subdivisions = 2
-        elif self.zoom_level < 0.15:
-            interval = 60
-            subdivisions = 6
-        elif self.zoom_level < 0.2:
-            interval = 30
-            subdivisions = 6
-        elif self.zoom_level < 0.75:
-            interval = 10
-            subdivisions = 5
-        elif self.zoom_level < 1.25:
-            interval = 5
-            subdivisions = 5
-        elif self.zoom_level < 3:
-            interval = 1
-            subdivisions = 4
-        elif self.zoom_level < 4:
-            interval = 0.5
-            subdivisions = 4
-        else:
-            interval = 0.1
-            subdivisions = 2
+        interval, subdivisions = ruler_interval(self.zoom_level)
             
         # Disegna la griglia temporale
         current_time = 0
@@ -1,13 +1,63 @@
-from PyQt5.QtWidgets import QGraphicsView
-from PyQt5.QtCore import Qt, QTimer, QPointF
+from PyQt5.QtWidgets import QGraphicsView, QGraphicsItem, QRubberBand
+from PyQt5.QtCore import Qt, QTimer, QPointF, QRect, QRectF
 from PyQt5.QtGui import QPainter
 
 """
 from MusicItem import MusicItem
-from Timeline import TrackItem
 """
 from src.MusicItem import MusicItem
-from src.Timeline import TrackItem
+
+# Profili di rendering selezionabili da Settings ('render_profile').
+# 'default' riproduce il comportamento storico della vista; 'large_project'
+# rinuncia all'antialiasing e usa le cache di Qt per progetti con
+# migliaia di clip.
+DEFAULT_RENDER_PROFILE = 'default'
+RENDER_PROFILES = {
+    'default': {
+        'update_mode': 'minimal',
+        'antialiasing': True,
+        'dont_save_painter_state': False,
+        'dont_adjust_for_antialiasing': False,
+        'cache_background': False,
+        'item_cache': False,
+    },
+    'large_project': {
+        'update_mode': 'smart',
+        'antialiasing': False,
+        'dont_save_painter_state': True,
+        'dont_adjust_for_antialiasing': True,
+        'cache_background': True,
+        'item_cache': True,
+    },
+}
+
+VIEWPORT_UPDATE_MODES = {
+    'full': QGraphicsView.FullViewportUpdate,
+    'minimal': QGraphicsView.MinimalViewportUpdate,
+    'smart': QGraphicsView.SmartViewportUpdate,
+    'bounding': QGraphicsView.BoundingRectViewportUpdate,
+    'none': QGraphicsView.NoViewportUpdate,
+}
+
+
+def render_profile_options(profile):
+    """
+    Opzioni complete di un profilo: accetta il nome di un preset oppure
+    un dizionario con 'base' (preset di partenza) e le singole opzioni
+    da sovrascrivere.
+    """
+    if isinstance(profile, dict):
+        base = RENDER_PROFILES.get(profile.get('base'), RENDER_PROFILES[DEFAULT_RENDER_PROFILE])
+        options = dict(base)
+        options.update({key: value for key, value in profile.items() if key in options})
+    else:
+        base = RENDER_PROFILES.get(profile, RENDER_PROFILES[DEFAULT_RENDER_PROFILE])
+        options = dict(base)
+    if options['update_mode'] not in VIEWPORT_UPDATE_MODES:
+        # Modalità sconosciuta: resta quella del preset di partenza
+        options['update_mode'] = base['update_mode']
+    return options
+
 
 class TimelineView(QGraphicsView):
     """
@@ -16,6 +66,7 @@ class TimelineView(QGraphicsView):
     """
     def __init__(self, scene):
         super().__init__(scene)
+        self.render_options = None
         self.setup_view()
         self.setup_appearance()
         self.setup_selection()
@@ -23,12 +74,44 @@ class TimelineView(QGraphicsView):
 
     def setup_appearance(self):
         """Configura le impostazioni di rendering"""
-        self.setRenderHint(QPainter.Antialiasing)
+        settings = getattr(self.scene(), 'settings', None)
+        profile = settings.get('render_profile', DEFAULT_RENDER_PROFILE) if settings else DEFAULT_RENDER_PROFILE
+        self.apply_render_profile(profile)
+
+    def apply_render_profile(self, profile):
+        """
+        Applica un profilo di rendering (nome di un preset di
+        RENDER_PROFILES o dizionario di opzioni) alla vista e ai clip.
+        """
+        options = render_profile_options(profile)
+        self.render_options = options
+
+        self.setViewportUpdateMode(VIEWPORT_UPDATE_MODES[options['update_mode']])
+        self.setRenderHint(QPainter.Antialiasing, options['antialiasing'])
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState, options['dont_save_painter_state'])
+        self.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing, options['dont_adjust_for_antialiasing'])
+        self.setCacheMode(QGraphicsView.CacheBackground if options['cache_background'] else QGraphicsView.CacheNone)
+        self.resetCachedContent()
+
+        # I clip creati in seguito leggono la modalità dalla scena (MusicItem.itemChange)
+        scene = self.scene()
+        if scene is not None:
+            cache_mode = QGraphicsItem.DeviceCoordinateCache if options['item_cache'] else QGraphicsItem.NoCache
+            scene.item_cache_mode = cache_mode
+            for item in scene.items():
+                if isinstance(item, MusicItem):
+                    item.setCacheMode(cache_mode)
+        self.viewport().update()
 
     def setup_selection(self):
         """Configura le impostazioni di selezione"""
         self.setDragMode(QGraphicsView.RubberBandDrag)
         self.setRubberBandSelectionMode(Qt.IntersectsItemShape)
+        # Selezione ad area con Ctrl: il rettangolo lo disegna la view e la
+        # selezione passa da Timeline.select_rect al rilascio, invece che da
+        # Qt un item alla volta a ogni movimento
+        self._rubber_band = QRubberBand(QRubberBand.Rectangle, self.viewport())
+        self._band_origin = None
 
     def setup_zoom(self):
         """Configura le impostazioni dello zoom"""
@@ -58,9 +141,7 @@ class TimelineView(QGraphicsView):
 
     def enable_zoom(self):
         """Riattiva la possibilità di zoomare"""
-        print("enable_zoom chiamato")  # debug
         self.can_zoom = True
-        print(f"can_zoom impostato a: {self.can_zoom}")  # debug
 
     def keyPressEvent(self, event):
         if event.modifiers() & Qt.AltModifier:
@@ -98,69 +179,67 @@ class TimelineView(QGraphicsView):
             # Ottieni il riferimento alla MainWindow
             main_window = self.window()
             
-            # Prima controlla se c'è una traccia selezionata
-            for item in self.scene().selectedItems():
-                if isinstance(item, TrackItem):
-                    if hasattr(main_window, 'delete_selected_track'):
-                        main_window.delete_selected_track()
-                    return
-            
-            # Se non ci sono tracce selezionate, procedi con la cancellazione degli item
+            # Le tracce si eliminano con Alt+Delete: qui solo gli item selezionati
             if hasattr(main_window, 'delete_selected_items'):
                 main_window.delete_selected_items()
         else:
             super().keyPressEvent(event)
 
     def mousePressEvent(self, event):
+        self._band_origin = None
         if event.modifiers() & Qt.ControlModifier:
             self.setDragMode(QGraphicsView.RubberBandDrag)
-            if not self.scene().selectedItems():
+            if event.button() == Qt.LeftButton and not isinstance(self.itemAt(event.pos()), MusicItem):
+                self._band_origin = event.pos()
+                self._rubber_band.setGeometry(QRect(event.pos(), event.pos()))
+                self._rubber_band.show()
+                event.accept()
+            elif not self.scene().selectedItems():
                 super().mousePressEvent(event)
         else:
             self.setDragMode(QGraphicsView.NoDrag)
             super().mousePressEvent(event)
 
+    def mouseMoveEvent(self, event):
+        if self._band_origin is not None:
+            self._rubber_band.setGeometry(QRect(self._band_origin, event.pos()).normalized())
+            event.accept()
+            return
+        super().mouseMoveEvent(event)
+
     def mouseReleaseEvent(self, event):
-        super().mouseReleaseEvent(event)
+        if self._band_origin is not None:
+            rect = QRect(self._band_origin, event.pos()).normalized()
+            self._band_origin = None
+            self._rubber_band.hide()
+            self.handleRubberBandSelection(QRectF(rect), self.mapToScene(rect.topLeft()),
+                                           self.mapToScene(rect.bottomRight()))
+            event.accept()
+        else:
+            super().mouseReleaseEvent(event)
         self.setDragMode(QGraphicsView.NoDrag)
 
     def handleRubberBandSelection(self, rubberBandRect, fromScenePoint, toScenePoint):
         selectionRect = self.mapToScene(rubberBandRect.toRect()).boundingRect()
-        items = self.scene().items(selectionRect)
-        
-        for item in items:
-            if isinstance(item, MusicItem):
-                item.setSelected(True)
-
-
+        # Selezione in blocco tramite l'indice dei clip: una sola notifica
+        self.scene().select_rect(selectionRect, extend=True)
 
     def setup_view(self):
         """Configura le impostazioni base della view"""
-        #print("\n=== Debug TimelineView Setup ===")
-        
-        # Debug allineamento
-        #print("Setting alignment...")
+        # Allineamento
         self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
         
-        # Debug scrollbar policies
-        print("Setting scrollbar policies...")
+        # Politiche delle scrollbar
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         
-        # Debug margins
-        #print("Setting margins...")
+        # Margini
         self.setViewportMargins(0, 0, 0, 0)
         self.setContentsMargins(0, 0, 0, 0)
-        #print(f"Viewport margins: {self.viewportMargins()}")
-        #print(f"Contents margins: {self.contentsMargins()}")
         
-        # Debug viewport margins
-        #print("Checking viewport...")
+        # Margini del viewport
         if self.viewport():
             self.viewport().setContentsMargins(0, 0, 0, 0)
-            print(f"Viewport content margins: {self.viewport().contentsMargins()}")
-        else:
-            print("Warning: Viewport not available")
         
         # Debug scrollbar state
         h_scrollbar = self.horizontalScrollBar()
@@ -1,12 +1,34 @@
+from collections.abc import Sequence
 from PyQt5.QtWidgets import (
     QGraphicsView, QGraphicsScene, QGraphicsRectItem, 
     QGraphicsTextItem, QGraphicsItem, QLineEdit
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QRectF, QTimer, QEvent, QPointF, QPoint
+from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QRectF, QEvent, QPointF, QPoint
 from PyQt5.QtGui import QPen, QColor, QBrush, QFont, QPainter, QMouseEvent
 #from Timeline import MIN_SCENE_HEIGHT
 from src.Timeline import MIN_SCENE_HEIGHT
 from PyQt5.QtWidgets import QGraphicsSceneMouseEvent
+
+# Header materializzati oltre l'area visibile, sopra e sotto
+HEADER_OVERSCAN = 2
+BUTTON_WIDTH = 20
+BUTTON_MARGIN = 5
+
+
+class TrackRecord:
+    """Stato di una traccia, indipendente dall'header che la mostra"""
+    __slots__ = ('name', 'muted', 'soloed', 'selected')
+
+    def __init__(self, name=None):
+        self.name = name  # None: "Track N" secondo la posizione
+        self.muted = False
+        self.soloed = False
+        self.selected = False
+
+    def label(self, track_number):
+        return self.name or f"Track {track_number + 1}"
+
+
 class EditableTextItem(QGraphicsTextItem):
     """Testo editabile per l'header della traccia"""
     def __init__(self, text, parent=None):
@@ -18,6 +40,14 @@ class EditableTextItem(QGraphicsTextItem):
         font.setPointSize(10)
         self.setFont(font)
         self.setAcceptHoverEvents(True)
+        self._label = None
+        self.set_label(text)
+
+    def set_label(self, text):
+        """Imposta il testo solo se è cambiato (gli header vengono riciclati)"""
+        if text == self._label:
+            return
+        self._label = text
         # Usa HTML per avere testo bianco su sfondo nero
         self.setHtml(f'<div style="background-color: black; color: white; padding: 0px;">{text}</div>')
 
@@ -36,6 +66,13 @@ class EditableTextItem(QGraphicsTextItem):
 
     def focusOutEvent(self, event):
         self.setTextInteractionFlags(Qt.NoTextInteraction)
+        # Il nome modificato vive nel record della traccia, non nell'header
+        header = self.parentItem()
+        record = getattr(header, 'record', None)
+        if record is not None:
+            text = self.toPlainText()
+            record.name = None if text == f"Track {header.track_number + 1}" else text
+            self._label = text
         super().focusOutEvent(event)
 
 
@@ -44,6 +81,7 @@ class TrackHeaderItem(QGraphicsRectItem):
     def __init__(self, x, y, width, height, track_number):
         super().__init__(x, y, width, height)
         self.track_number = track_number
+        self.record = None  # TrackRecord mostrato, se l'header è gestito dalla scena
         self.setAcceptHoverEvents(True)
         self.base_color = QColor(240, 240, 240)
         self.hover_color = QColor(220, 220, 220)
@@ -53,18 +91,32 @@ class TrackHeaderItem(QGraphicsRectItem):
         self.setPen(QPen(Qt.black))
         
         self.text = EditableTextItem(f"Track {track_number + 1}", self)
-        text_y = ((height - self.text.boundingRect().height()) / 2) + y
-        self.text.setPos(10, text_y)
         
         # Aggiungi i pulsanti Mute e Solo
-        button_y = text_y
-        button_width = 20
-        button_margin = 5
         self.mute_button = TrackButton("M", self)
         self.solo_button = TrackButton("S", self)
-        # Posiziona i pulsanti nell'angolo destro della traccia corrente
-        self.mute_button.setPos(width - (2 * button_width + button_margin), button_y)
-        self.solo_button.setPos(width - button_width - button_margin, button_y)
+        self.layout_children()
+
+    def layout_children(self):
+        """Centra il nome e porta i pulsanti nell'angolo destro dell'header"""
+        rect = self.rect()
+        text_y = ((rect.height() - self.text.boundingRect().height()) / 2) + rect.y()
+        self.text.setPos(10, text_y)
+        self.mute_button.setPos(rect.width() - (2 * BUTTON_WIDTH + BUTTON_MARGIN), text_y)
+        self.solo_button.setPos(rect.width() - BUTTON_WIDTH - BUTTON_MARGIN, text_y)
+
+    def bind(self, track_number, record, y, width, height):
+        """Mostra la traccia indicata riusando l'header (senza emettere segnali)"""
+        self.track_number = track_number
+        self.record = record
+        self.setRect(0, y, width, height)
+        self.text.set_label(record.label(track_number))
+        self.mute_button.set_active(record.muted)
+        self.solo_button.set_active(record.soloed)
+        self.is_selected = record.selected
+        self.setBrush(QBrush(self.selected_color if self.is_selected else self.base_color))
+        self.layout_children()
+        self.setVisible(True)
 
     def hoverEnterEvent(self, event):
         if not self.is_selected:
@@ -93,33 +145,140 @@ class TrackHeaderItem(QGraphicsRectItem):
         if scene:
             # Gestisci la selezione multipla con CTRL/CMD
             if not (event.modifiers() & Qt.ControlModifier):
-                for item in scene.items():
-                    if isinstance(item, TrackHeaderItem):
-                        item.setSelected(False)
+                scene.deselect_all()
             self.setSelected(not self.is_selected)
         super().mousePressEvent(event)
                 
     def setSelected(self, selected):
         self.is_selected = selected
+        if self.record is not None:
+            self.record.selected = selected
         self.setBrush(QBrush(self.selected_color if selected else self.base_color))
         # Emetti il segnale attraverso la scena
         if self.scene():
             self.scene().track_selection_changed.emit(self.track_number, selected)
 
+class TrackHeaderList(Sequence):
+    """
+    Gli header di tutte le tracce come sequenza: l'header di una traccia
+    non visibile viene materializzato solo quando lo si chiede.
+    """
+    def __init__(self, scene):
+        self._scene = scene
+
+    def __len__(self):
+        return len(self._scene.tracks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("track header index out of range")
+        return self._scene.header_for(index)
+
+
 class TrackHeaderScene(QGraphicsScene):
-    """Scena che contiene gli header delle tracce"""
+    """
+    Scena che contiene gli header delle tracce.
+
+    Lo stato di ogni traccia (nome, mute, solo, selezione) è in un
+    TrackRecord; gli header grafici esistono solo per le tracce visibili
+    e vengono riciclati da un pool durante lo scroll.
+    """
     track_selection_changed = pyqtSignal(int, bool)  # (track_number, is_selected)
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, parent=None):
+        super().__init__(parent)
         self.setBackgroundBrush(QBrush(QColor(240, 240, 240)))
-        self.header_items = []
+        self.tracks = []
+        self.track_height = 50
+        self.header_width = 200
+        self._active = {}  # numero traccia -> header materializzato
+        self._pool = []    # header nascosti pronti per essere riusati
+        self.header_items = TrackHeaderList(self)
+
+    @property
+    def active_headers(self):
+        return dict(self._active)
+
+    def reset(self, num_tracks, track_height, width):
+        """Adegua i record al numero di tracce; gli header si riassegnano dopo"""
+        del self.tracks[num_tracks:]
+        self.tracks.extend(TrackRecord() for _ in range(num_tracks - len(self.tracks)))
+        self.track_height = track_height
+        self.header_width = width
+        for track_number in list(self._active):
+            self._release(track_number)
+
+    def header_for(self, track_number):
+        """Header della traccia, preso dal pool o creato se necessario"""
+        header = self._active.get(track_number)
+        if header is None:
+            if self._pool:
+                header = self._pool.pop()
+            else:
+                header = TrackHeaderItem(0, 0, self.header_width, self.track_height, track_number)
+                self.addItem(header)
+            header.bind(track_number, self.tracks[track_number],
+                        track_number * self.track_height, self.header_width, self.track_height)
+            self._active[track_number] = header
+        return header
+
+    def materialize(self, first, last):
+        """Tiene materializzati solo gli header delle tracce da first a last"""
+        first = max(0, first)
+        last = min(len(self.tracks) - 1, last)
+        for track_number in [n for n in self._active if not first <= n <= last]:
+            self._release(track_number)
+        for track_number in range(first, last + 1):
+            self.header_for(track_number)
+
+    def _release(self, track_number):
+        header = self._active.pop(track_number)
+        header.setVisible(False)
+        header.record = None
+        self._pool.append(header)
+
+    def selected_tracks(self):
+        return [n for n, record in enumerate(self.tracks) if record.selected]
+
+    def deselect_all(self):
+        """Deseleziona tutte le tracce, anche quelle senza header"""
+        for header in self._active.values():
+            if header.is_selected:
+                header.setSelected(False)
+        for track_number, record in enumerate(self.tracks):
+            if record.selected:
+                record.selected = False
+                self.track_selection_changed.emit(track_number, False)
+
+    def remove_track(self, track_number):
+        """Elimina il record di una traccia: le successive salgono di una posizione"""
+        if 0 <= track_number < len(self.tracks):
+            del self.tracks[track_number]
+            for number in list(self._active):
+                self._release(number)
+
+    def swap_tracks(self, first, second):
+        """Scambia i record di due tracce (spostamento di traccia)"""
+        if 0 <= first < len(self.tracks) and 0 <= second < len(self.tracks):
+            self.tracks[first], self.tracks[second] = self.tracks[second], self.tracks[first]
+            for number in (first, second):
+                if number in self._active:
+                    self._release(number)
+                    self.header_for(number)
 
 class TrackHeaderView(QGraphicsView):
     """Vista principale per gli header delle tracce"""
     def __init__(self, timeline_view=None):
-        self.scene = TrackHeaderScene()
-        super().__init__(self.scene)
+        super().__init__()
+        # La scena appartiene alla vista e viene distrutta dopo di lei: la
+        # scena elimina gli header prima di staccarsi dalle viste, e una
+        # scena distrutta per prima li toglierebbe a una vista ancora attiva
+        self.scene = TrackHeaderScene(self)
+        self.setScene(self.scene)
         self.timeline_view = timeline_view  # Salviamo il riferimento alla timeline
         self._min_width = 150
         self._max_width = 600        
@@ -134,19 +293,15 @@ class TrackHeaderView(QGraphicsView):
         self.setViewportMargins(0, 0, 0, 0)
         self.viewport().setContentsMargins(0, 0, 0, 0)
         self.scene.setSceneRect(0, 0, self.current_width, MIN_SCENE_HEIGHT)
-        
-        # Aggiungiamo un metodo per forzare i limiti
-        def enforceConstraints():
-            if self.minimumWidth() != 150 or self.maximumWidth() != 600:
-                self.setMinimumWidth(150)
-                self.setMaximumWidth(600)
-        
-        # Chiamiamo questo metodo dopo un breve delay
-        QTimer.singleShot(0, enforceConstraints)
+        # Lo scroll riassegna gli header riciclati alle tracce visibili.
+        # update_visible_headers è uno slot Qt: Qt scioglie il collegamento
+        # quando la vista viene distrutta
+        self.verticalScrollBar().valueChanged.connect(self.update_visible_headers)
 
     def resizeEvent(self, event):
         """Override per mantenere i constraints durante il resize"""
         super().resizeEvent(event)
+        self.update_visible_headers()
         current = event.size().width()
         
         if current < self._min_width:
@@ -157,22 +312,20 @@ class TrackHeaderView(QGraphicsView):
     def keyPressEvent(self, event):
         """Gestisce gli eventi da tastiera per la TrackHeaderView"""
         if event.modifiers() & Qt.AltModifier and event.key() in [Qt.Key_Delete, Qt.Key_Backspace]:
-            # Trova gli header selezionati
-            selected_headers = [item for item in self.scene.items() 
-                            if isinstance(item, TrackHeaderItem) and item.is_selected]
-            
-            # Se ci sono header selezionati, elimina le tracce corrispondenti
-            if selected_headers:
+            # Se ci sono tracce selezionate, elimina le tracce corrispondenti
+            if self.scene.selected_tracks():
                 main_window = self.window()
                 if hasattr(main_window, 'delete_selected_track'):
-                    for header in selected_headers:
-                        main_window.delete_selected_track()
+                    main_window.delete_selected_track()
                 event.accept()
                 return
         super().keyPressEvent(event)
 
     def set_timeline_view(self, timeline_view):
-        """Imposta il riferimento alla timeline view"""
+        """
+        Imposta il riferimento alla timeline view. La sincronizzazione
+        delle scrollbar è gestita da TimelineContainer.sync_controller
+        """
         self.timeline_view = timeline_view
 
     def update_tracks_width(self):
@@ -181,30 +334,35 @@ class TrackHeaderView(QGraphicsView):
         self.current_width = max(self._min_width, min(self.current_width, self._max_width))
         self.setFixedWidth(self.current_width)
         
-        # Update headers
-        for header in self.scene.header_items:
-            if isinstance(header, TrackHeaderItem):
-                header.setRect(0, header.rect().y(), self.current_width, header.rect().height())
-                button_width = 20
-                button_margin = 5
-                header.mute_button.setPos(self.current_width - (2 * button_width + button_margin), 
-                                        header.mute_button.pos().y())
-                header.solo_button.setPos(self.current_width - button_width - button_margin, 
-                                        header.solo_button.pos().y())
+        # Update headers (quelli nel pool si adeguano quando vengono riusati)
+        self.scene.header_width = self.current_width
+        for header in self.scene.active_headers.values():
+            header.setRect(0, header.rect().y(), self.current_width, header.rect().height())
+            header.layout_children()
 
     def update_tracks(self, num_tracks, track_height):
-        """Aggiorna gli header delle tracce"""
-        self.scene.clear()
-        self.scene.header_items.clear()
-        
+        """
+        Aggiorna gli header delle tracce. Non ricrea nulla: adegua i record
+        e riassegna gli header alle sole tracce visibili.
+        """
         total_height = max(MIN_SCENE_HEIGHT, num_tracks * track_height)
         self.scene.setSceneRect(0, 0, self.current_width, total_height)
-        
-        for i in range(num_tracks):
-            y_pos = i * track_height
-            header = TrackHeaderItem(0, y_pos, self.current_width, track_height, i)
-            self.scene.addItem(header)
-            self.scene.header_items.append(header)
+
+        if not isinstance(self.scene.header_items, TrackHeaderList):
+            self.scene.header_items = TrackHeaderList(self.scene)
+        self.scene.reset(num_tracks, track_height, self.current_width)
+        self.update_visible_headers()
+
+    def visible_track_range(self):
+        """Prima e ultima traccia da materializzare (area visibile + margine)"""
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        track_height = self.scene.track_height
+        return (int(visible.top() // track_height) - HEADER_OVERSCAN,
+                int(visible.bottom() // track_height) + HEADER_OVERSCAN)
+
+    @pyqtSlot()
+    def update_visible_headers(self):
+        self.scene.materialize(*self.visible_track_range())
 
     def wheelEvent(self, event):
         if event.modifiers() == Qt.ShiftModifier and self.timeline_view:
@@ -231,12 +389,6 @@ class TrackHeaderView(QGraphicsView):
         if self.verticalScrollBar().value() != value:
             self.verticalScrollBar().setValue(value)
 
-    def set_timeline_view(self, timeline_view):
-        """Imposta il riferimento alla timeline view e configura le connessioni"""
-        self.timeline_view = timeline_view
-        if timeline_view:
-            # Connetti il segnale della timeline alla sincronizzazione
-            timeline_view.verticalScrollBar().valueChanged.connect(self.sync_with_timeline)
 
 class TrackButton(QGraphicsRectItem):
     """Pulsante per mute/solo"""
@@ -246,6 +398,8 @@ class TrackButton(QGraphicsRectItem):
         self.setBrush(QBrush(QColor(200, 200, 200)))
         self.setPen(QPen(Qt.black))
         self.is_active = False
+        # Campo del TrackRecord in cui salvare lo stato
+        self.record_field = {'M': 'muted', 'S': 'soloed'}.get(text)
         
         # Aggiungi il testo del pulsante
         self.text_item = QGraphicsTextItem(text, self)
@@ -257,14 +411,22 @@ class TrackButton(QGraphicsRectItem):
         self.text_item.setPos(text_x, text_y)
         
 
+    def set_active(self, active):
+        self.is_active = active
+        self.setBrush(QBrush(QColor(150, 150, 150) if self.is_active else QColor(200, 200, 200)))
+
+    def toggle(self):
+        self.set_active(not self.is_active)
+        record = getattr(self.parentItem(), 'record', None)
+        if record is not None and self.record_field:
+            setattr(record, self.record_field, self.is_active)
+
     def toggleForTest(self):
         """Metodo speciale per i test che simula un click"""
-        self.is_active = not self.is_active
-        self.setBrush(QBrush(QColor(150, 150, 150) if self.is_active else QColor(200, 200, 200)))
+        self.toggle()
 
     def mousePressEvent(self, event):
-        self.is_active = not self.is_active
-        self.setBrush(QBrush(QColor(150, 150, 150) if self.is_active else QColor(200, 200, 200)))
+        self.toggle()
         super().mousePressEvent(event)
         
     def hoverEnterEvent(self, event):
@@ -0,0 +1,143 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QDialog, QFormLayout, QComboBox, QDoubleSpinBox, QSpinBox, QCheckBox,
+    QLabel, QDialogButtonBox, QMessageBox
+)
+
+from src.BulkEditDialog import TARGETS
+from src.Transforms import TRANSFORMS
+
+
+def _time_spin(value, minimum=0.0, maximum=1e6, step=1.0, decimals=3):
+    spin = QDoubleSpinBox()
+    spin.setDecimals(decimals)
+    spin.setRange(minimum, maximum)
+    spin.setSingleStep(step)
+    spin.setValue(value)
+    return spin
+
+
+class TransformDialog(QDialog):
+    """
+    Trasformazioni di sezione (stretch, quantizzazione, ripple, tracce)
+    con anteprima tratteggiata nella timeline finché il dialogo è aperto.
+    """
+    def __init__(self, window, parent=None):
+        super().__init__(parent or window)
+        self.setWindowTitle("Transform Section")
+        self.main_window = window
+        self.scene = window.scene
+        self.command = None
+
+        self.form = QFormLayout()
+        self.operation = QComboBox()
+        for operation, (label, _) in TRANSFORMS.items():
+            self.operation.addItem(label, operation)
+        self.form.addRow("Transform:", self.operation)
+
+        self.target = QComboBox()
+        self.target.addItems(list(TARGETS))
+        self.form.addRow("Apply to:", self.target)
+
+        # Opzione -> widget; le righe non usate dall'operazione vengono nascoste
+        self.options = {
+            'start': _time_spin(0.0),
+            'end': _time_spin(0.0),
+            'factor': _time_spin(2.0, 0.01, 100.0, 0.1),
+            'grid': _time_spin(0.25, 0.001, 60.0, 0.125),
+            'attacks': QCheckBox("Attack"),
+            'durations': QCheckBox("Duration"),
+            'amount': _time_spin(1.0, 0.001),
+            'offset': QSpinBox(),
+        }
+        self.options['attacks'].setChecked(True)
+        self.options['durations'].setChecked(True)
+        self.options['offset'].setRange(-1000, 1000)
+        self.options['offset'].setValue(1)
+        labels = {'start': "Start (s):", 'end': "End (s):", 'factor': "Factor:",
+                  'grid': "Grid (s):", 'attacks': "Quantize:", 'durations': "",
+                  'amount': "Amount (s):", 'offset': "Tracks:"}
+        for name, widget in self.options.items():
+            self.form.addRow(labels[name], widget)
+            signal = widget.toggled if isinstance(widget, QCheckBox) else widget.valueChanged
+            signal.connect(self.update_preview)
+
+        self.count_label = QLabel()
+        self.form.addRow("", self.count_label)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Apply | QDialogButtonBox.Cancel)
+        buttons.button(QDialogButtonBox.Apply).clicked.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        self.form.addWidget(buttons)
+        self.setLayout(self.form)
+
+        if not TARGETS['Selected clips'](window):
+            self.target.setCurrentText('All clips')
+        self.set_range_from_targets()
+        self.operation.currentIndexChanged.connect(self.update_rows)
+        self.target.currentIndexChanged.connect(self.update_preview)
+        self.update_rows()
+
+    def set_range_from_targets(self):
+        """Intervallo iniziale: dal primo inizio all'ultima fine dei clip coinvolti"""
+        items = self.target_items()
+        if not items:
+            return
+        scale = self.scene.pixels_per_beat * self.scene.zoom_level
+        start = min(item.pos().x() for item in items) / scale
+        end = max(item.pos().x() + item.rect().width() for item in items) / scale
+        self.options['start'].setValue(start)
+        self.options['end'].setValue(end)
+
+    def target_items(self):
+        return TARGETS[self.target.currentText()](self.main_window)
+
+    def current_options(self):
+        """Opzioni dell'operazione scelta, lette dai widget"""
+        operation = self.operation.currentData()
+        values = {}
+        for name in TRANSFORMS[operation][1]:
+            widget = self.options[name]
+            values[name] = widget.isChecked() if isinstance(widget, QCheckBox) else widget.value()
+        return operation, values
+
+    def update_rows(self, *args):
+        used = TRANSFORMS[self.operation.currentData()][1]
+        for name, widget in self.options.items():
+            widget.setVisible(name in used)
+            label = self.form.labelForField(widget)
+            if label is not None:
+                label.setVisible(name in used)
+        self.update_preview()
+
+    def update_preview(self, *args):
+        operation, options = self.current_options()
+        try:
+            plan = self.scene.transform_plan(operation, self.target_items(), **options)
+        except ValueError as e:
+            self.scene.set_preview([])
+            self.count_label.setText(str(e))
+            return
+        self.scene.set_preview(plan)
+        self.count_label.setText(f"{len(plan)} clip")
+
+    def keyPressEvent(self, event):
+        if (event.modifiers() & (Qt.ControlModifier | Qt.MetaModifier)) and event.key() == Qt.Key_W:
+            self.reject()
+        else:
+            super().keyPressEvent(event)
+
+    def done(self, result):
+        # L'anteprima sparisce comunque si chiuda il dialogo
+        self.scene.set_preview([])
+        super().done(result)
+
+    def accept(self):
+        """Applica la trasformazione come un solo comando annullabile"""
+        operation, options = self.current_options()
+        try:
+            self.command = self.main_window.transform_clips(operation, self.target_items(), **options)
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Transform", str(e), QMessageBox.Ok)
+            return
+        super().accept()
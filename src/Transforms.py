@@ -0,0 +1,127 @@
+"""
+Trasformazioni di sezione sui tempi dei clip: stretch di un intervallo,
+quantizzazione, inserimento e cancellazione di tempo (ripple) e
+spostamento di traccia.
+
+Ogni trasformazione lavora su colonne NumPy (inizi, durate, tracce) di
+tutti i clip coinvolti in un solo passaggio e restituisce le nuove
+colonne senza toccare la scena: la stessa funzione serve all'anteprima
+e al comando. I tempi sono in secondi, come cAttacco e durata.
+"""
+import numpy as np
+
+from src.Params import first_value
+from src.ClipQuery import write_field
+
+# Arrotondamento dei tempi scritti nei parametri (come BulkEdit)
+TIME_DECIMALS = 6
+
+# Operazione -> (etichetta, opzioni usate)
+TRANSFORMS = {
+    'stretch': ('Stretch time range', ('start', 'end', 'factor')),
+    'quantize': ('Quantize to grid', ('grid', 'attacks', 'durations')),
+    'insert': ('Insert time', ('start', 'amount')),
+    'delete': ('Delete time', ('start', 'end')),
+    'shift_tracks': ('Shift tracks', ('offset',)),
+}
+
+
+def _map_stretch(times, start, end, factor):
+    # Mappa lineare a tratti: prima invariato, dentro scalato da start,
+    # dopo traslato della variazione di lunghezza dell'intervallo
+    return np.where(times <= start, times,
+                    np.where(times <= end, start + (times - start) * factor,
+                             times + (end - start) * (factor - 1)))
+
+
+def stretch(starts, durations, start, end, factor):
+    """Allunga (factor > 1) o comprime l'intervallo [start, end]; i clip successivi scorrono"""
+    if end <= start or factor <= 0:
+        raise ValueError("stretch needs start < end and a positive factor")
+    new_starts = _map_stretch(starts, start, end, factor)
+    new_ends = _map_stretch(starts + durations, start, end, factor)
+    return new_starts, new_ends - new_starts
+
+
+def quantize(starts, durations, grid, attacks=True, durations_=True):
+    """Porta inizi e/o durate sul multiplo di grid più vicino (durata minima: grid)"""
+    if grid <= 0:
+        raise ValueError("quantize needs a positive grid")
+    if attacks:
+        starts = np.round(starts / grid) * grid
+    if durations_:
+        durations = np.maximum(np.round(durations / grid), 1) * grid
+    return starts, durations
+
+
+def insert_time(starts, durations, at, amount):
+    """Inserisce amount secondi in at: i clip che iniziano da at in poi scorrono"""
+    if amount <= 0:
+        raise ValueError("insert needs a positive amount")
+    return np.where(starts >= at, starts + amount, starts), durations
+
+
+def delete_time(starts, durations, start, end):
+    """
+    Elimina l'intervallo [start, end] chiudendo il vuoto. I clip a cavallo
+    vengono accorciati; quelli interamente dentro finiscono in start con
+    la loro durata (nessun clip viene rimosso).
+    """
+    if end <= start:
+        raise ValueError("delete needs start < end")
+    span = end - start
+
+    def shift(times):
+        return np.where(times <= start, times, np.where(times >= end, times - span, start))
+
+    new_starts = shift(starts)
+    new_durations = shift(starts + durations) - new_starts
+    collapsed = new_durations <= 0
+    return new_starts, np.where(collapsed, durations, new_durations)
+
+
+def shift_tracks(tracks, offset, num_tracks):
+    """Sposta di offset tracce, restando entro le tracce esistenti"""
+    return np.clip(tracks + int(offset), 0, num_tracks - 1)
+
+
+def apply_transform(operation, starts, durations, tracks, num_tracks, **options):
+    """
+    Applica l'operazione alle colonne e restituisce (inizi, durate, tracce).
+    Solleva ValueError per operazioni o opzioni non valide.
+    """
+    starts = np.asarray(starts, dtype=float)
+    durations = np.asarray(durations, dtype=float)
+    tracks = np.asarray(tracks, dtype=int)
+    if operation == 'stretch':
+        starts, durations = stretch(starts, durations, options['start'], options['end'], options['factor'])
+    elif operation == 'quantize':
+        starts, durations = quantize(starts, durations, options['grid'],
+                                     options.get('attacks', True), options.get('durations', True))
+    elif operation == 'insert':
+        starts, durations = insert_time(starts, durations, options['start'], options['amount'])
+    elif operation == 'delete':
+        starts, durations = delete_time(starts, durations, options['start'], options['end'])
+    elif operation == 'shift_tracks':
+        tracks = shift_tracks(tracks, options['offset'], num_tracks)
+    else:
+        raise ValueError(f"unknown transform {operation!r}")
+    return (np.maximum(np.round(starts, TIME_DECIMALS), 0.0),
+            np.round(durations, TIME_DECIMALS), tracks)
+
+
+def time_changes(params_list, starts, durations):
+    """
+    Valori di primo livello di cAttacco e durata da scrivere per ogni
+    clip ({} se il clip non cambia), pronti per EditParamsCommand.
+    """
+    changes = []
+    for params, start, duration in zip(params_list, starts.tolist(), durations.tolist()):
+        values = {}
+        for name, new in (('cAttacco', start), ('durata', duration)):
+            old = params.get(name)
+            current = first_value(old)
+            if current is None or abs(float(current) - new) > 10 ** -TIME_DECIMALS:
+                values[name] = write_field(old, (), new)
+        changes.append(values)
+    return changes
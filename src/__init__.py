@@ -1,45 +1,86 @@
 # src/__init__.py
-# Import dei moduli principali
-from .Commands import Command, CommandManager, MoveItemCommand
-from .MainWindow import MainWindow
-from .MusicItem import MusicItem
-from .Timeline import Timeline, TrackItem
-from .TimelineView import TimelineView
-from .TimelineRuler import TimelineRuler
-from .TimelineContainer import TimelineContainer
-from .TrackHeaderView import TrackHeaderView, TrackHeaderItem, TrackHeaderScene
-from .ParamDialog import ParamDialog
-from .RenameDialog import RenameDialog
-from .Settings import Settings
-from .SettingsDialog import SettingsDialog
-
-__all__ = [
+# Import dei moduli principali.
+# Gli import sono risolti in modo lazy: `import src.cli` o
+# `import src.Params` non devono caricare PyQt5.
+import importlib
+import sys
+import types
+
+_EXPORTS = {
     # Command Pattern
-    'Command',
-    'CommandManager',
-    'MoveItemCommand',
-    
+    'Command': 'Commands',
+    'CommandManager': 'Commands',
+    'MoveItemCommand': 'Commands',
+    'MoveItemsCommand': 'Commands',
+    'EditParamsCommand': 'Commands',
+    'AddItemsCommand': 'Commands',
+
     # Main Components
-    'MainWindow',
-    'MusicItem',
-    
+    'MainWindow': 'MainWindow',
+    'MusicItem': 'MusicItem',
+    'StyleRegistry': 'ClipStyle',
+    'style_registry': 'ClipStyle',
+
     # Timeline Components
-    'Timeline',
-    'TrackItem',
-    'TimelineView',
-    'TimelineRuler',
-    'TimelineContainer',
-    
+    'Timeline': 'Timeline',
+    'TimelineView': 'TimelineView',
+    'TimelineRuler': 'TimelineRuler',
+    'TimelineContainer': 'TimelineContainer',
+    'TimelineMinimap': 'TimelineMinimap',
+
     # Track Header Components
-    'TrackHeaderView',
-    'TrackHeaderItem',
-    'TrackHeaderScene',
-    
+    'TrackHeaderView': 'TrackHeaderView',
+    'TrackHeaderItem': 'TrackHeaderView',
+    'TrackHeaderScene': 'TrackHeaderView',
+
     # Dialogs
-    'ParamDialog',
-    'RenameDialog',
-    'SettingsDialog',
-    
+    'ParamDialog': 'ParamDialog',
+    'RenameDialog': 'RenameDialog',
+    'SettingsDialog': 'SettingsDialog',
+    'BulkEditDialog': 'BulkEditDialog',
+    'TransformDialog': 'TransformDialog',
+    'GenerateDialog': 'GenerateDialog',
+
+    # Indici
+    'ClipIndex': 'ClipIndex',
+    'ParamIndex': 'ParamIndex',
+    'ClipParams': 'Params',
+    'ClipQuery': 'ClipQuery',
+    'ParamEdit': 'BulkEdit',
+    'ClipGenerator': 'Generate',
+
     # Settings
-    'Settings'
-]
\ No newline at end of file
+    'Settings': 'Settings',
+
+    # Build
+    'LiveMake': 'LiveMake',
+    'LiveSearch': 'LiveSearch',
+}
+
+__all__ = list(_EXPORTS)
+
+
+class _LazyPackage(types.ModuleType):
+    """
+    Package che risolve i nomi esportati al primo accesso.
+    L'import di un sottomodulo (es. `src.MainWindow`) registra il modulo
+    come attributo del package: qui restituiamo comunque la classe
+    omonima, come facevano gli import espliciti.
+    """
+    def __getattr__(self, name):
+        module_name = _EXPORTS.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        return getattr(importlib.import_module(f'.{module_name}', __name__), name)
+
+    def __getattribute__(self, name):
+        value = super().__getattribute__(name)
+        if name in _EXPORTS and isinstance(value, types.ModuleType):
+            return getattr(value, name)
+        return value
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(__all__))
+
+
+sys.modules[__name__].__class__ = _LazyPackage
@@ -0,0 +1,284 @@
+"""
+Entry point headless di DPT per la validazione, la conversione e le
+statistiche dei file di comportamenti, senza Qt.
+
+Esempi:
+    python -m src.cli validate sezioni/*.yaml
+    python -m src.cli stats sezioni/*.yaml --json
+    python -m src.cli convert sezioni/*.yaml --to json -o out/
+
+I file vengono elaborati in parallelo con un pool di processi (--jobs).
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+from src.Params import (
+    PARAM_NAMES, is_number, validate_document, sort_by_attack,
+    load_comportamenti, dump_comportamenti
+)
+
+FORMATS = {
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.json': 'json',
+    '.csv': 'csv',
+}
+
+
+def detect_format(path):
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"formato non riconosciuto: {path}")
+    return fmt
+
+
+def _csv_columns(items):
+    extra = []
+    for params in items:
+        for key in params:
+            if key not in PARAM_NAMES and key not in extra:
+                extra.append(key)
+    present = [key for key in PARAM_NAMES if any(key in params for params in items)]
+    return present + extra
+
+
+def _csv_cell(value):
+    if isinstance(value, list):
+        return yaml.safe_dump(value, default_flow_style=True, width=math.inf).strip()
+    return value
+
+
+def read_document(path):
+    """Legge un documento di comportamenti da YAML, JSON o CSV"""
+    fmt = detect_format(path)
+    if fmt == 'yaml':
+        return load_comportamenti(path)
+    if fmt == 'json':
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    # CSV: una riga per comportamento, le liste sono scritte in flow style YAML
+    items = []
+    with open(path, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            items.append({key: yaml.safe_load(cell) for key, cell in row.items() if cell != ''})
+    return {'comportamenti': items}
+
+
+def write_document(data, path):
+    """Scrive un documento di comportamenti nel formato dato dall'estensione"""
+    fmt = detect_format(path)
+    items = data['comportamenti']
+    with open(path, 'w', newline='' if fmt == 'csv' else None) as f:
+        if fmt == 'yaml':
+            dump_comportamenti(items, f)
+        elif fmt == 'json':
+            json.dump(data, f, indent=1)
+        else:
+            columns = _csv_columns(items)
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            for params in items:
+                writer.writerow({key: _csv_cell(value) for key, value in params.items()})
+
+
+def collect_stats(items):
+    """
+    Accumulatori per parametro: [count, sum, sum_sq, min, max].
+    Le liste producono una voce per posizione, es. 'ritmo[0]'.
+    """
+    stats = {}
+
+    def add(key, value):
+        if not is_number(value):
+            return
+        acc = stats.get(key)
+        if acc is None:
+            stats[key] = [1, value, value * value, value, value]
+        else:
+            acc[0] += 1
+            acc[1] += value
+            acc[2] += value * value
+            acc[3] = min(acc[3], value)
+            acc[4] = max(acc[4], value)
+
+    for params in items:
+        if not isinstance(params, dict):
+            continue
+        for key, value in params.items():
+            if isinstance(value, list):
+                for i, element in enumerate(value):
+                    add(f"{key}[{i}]", element)
+            else:
+                add(key, value)
+    return stats
+
+
+def merge_stats(total, stats):
+    for key, acc in stats.items():
+        current = total.get(key)
+        if current is None:
+            total[key] = list(acc)
+        else:
+            current[0] += acc[0]
+            current[1] += acc[1]
+            current[2] += acc[2]
+            current[3] = min(current[3], acc[3])
+            current[4] = max(current[4], acc[4])
+    return total
+
+
+def summarize_stats(stats):
+    summary = {}
+    for key, (count, total, total_sq, minimum, maximum) in stats.items():
+        mean = total / count
+        variance = max(0.0, total_sq / count - mean * mean)
+        summary[key] = {
+            'count': count,
+            'min': minimum,
+            'max': maximum,
+            'mean': mean,
+            'std': math.sqrt(variance),
+        }
+    return summary
+
+
+def _stats_sort_key(key):
+    name, _, index = key.partition('[')
+    order = PARAM_NAMES.index(name) if name in PARAM_NAMES else len(PARAM_NAMES)
+    return (order, name, int(index.rstrip(']')) if index else -1)
+
+
+def process_file(path, command='validate', to_format=None, output_dir=None):
+    """
+    Elabora un singolo file. Eseguita nei processi worker: restituisce
+    solo dati serializzabili.
+    """
+    result = {'path': path, 'errors': [], 'warnings': [], 'count': 0,
+              'stats': {}, 'output': None}
+    try:
+        data = read_document(path)
+    except (OSError, ValueError, yaml.YAMLError, csv.Error) as e:
+        result['errors'].append(f"lettura fallita: {e}")
+        return result
+
+    errors, warnings = validate_document(data)
+    result['errors'].extend(errors)
+    result['warnings'].extend(warnings)
+    if isinstance(data, dict) and isinstance(data.get('comportamenti'), list):
+        result['count'] = len(data['comportamenti'])
+    if errors:
+        return result
+
+    items = data['comportamenti']
+
+    if command == 'stats':
+        result['stats'] = collect_stats(items)
+    elif command == 'convert':
+        base = os.path.splitext(os.path.basename(path))[0]
+        directory = output_dir or os.path.dirname(path)
+        output = os.path.join(directory, f"{base}.{to_format}")
+        if os.path.abspath(output) == os.path.abspath(path):
+            result['errors'].append("il file di destinazione coincide con il sorgente")
+            return result
+        try:
+            write_document({'comportamenti': sort_by_attack(items)}, output)
+        except OSError as e:
+            result['errors'].append(f"scrittura fallita: {e}")
+            return result
+        result['output'] = output
+    return result
+
+
+def run(paths, command='validate', jobs=None, to_format=None, output_dir=None):
+    """Elabora i file, in parallelo se ci sono più file e più worker"""
+    jobs = jobs or os.cpu_count() or 1
+    args = [(path, command, to_format, output_dir) for path in paths]
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as executor:
+            return list(executor.map(process_file, *zip(*args)))
+    return [process_file(*a) for a in args]
+
+
+def _print_report(results, command, out):
+    for result in results:
+        status = 'FAIL' if result['errors'] else 'OK'
+        line = f"{status} {result['path']} ({result['count']} comportamenti)"
+        if result['output']:
+            line += f" -> {result['output']}"
+        print(line, file=out)
+        for message in result['errors']:
+            print(f"  error: {message}", file=out)
+        for message in result['warnings']:
+            print(f"  warning: {message}", file=out)
+
+    if command == 'stats':
+        total = {}
+        for result in results:
+            merge_stats(total, result['stats'])
+        summary = summarize_stats(total)
+        print(f"\n{'parametro':<18}{'count':>8}{'min':>12}{'max':>12}{'mean':>12}{'std':>12}", file=out)
+        for key in sorted(summary, key=_stats_sort_key):
+            s = summary[key]
+            print(f"{key:<18}{s['count']:>8}{s['min']:>12.4g}{s['max']:>12.4g}"
+                  f"{s['mean']:>12.4g}{s['std']:>12.4g}", file=out)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m src.cli',
+        description="DPT headless: validate, convert and summarize comportamenti files"
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('files', nargs='+', help="YAML/JSON/CSV files")
+    common.add_argument('-j', '--jobs', type=int, default=None,
+                        help="number of worker processes (default: CPU count)")
+    common.add_argument('--json', action='store_true', help="print results as JSON")
+
+    subparsers.add_parser('validate', parents=[common],
+                          help="validate files against the parameter schema")
+    subparsers.add_parser('stats', parents=[common],
+                          help="per-parameter statistics across all files")
+    convert = subparsers.add_parser('convert', parents=[common],
+                                    help="convert files between yaml, json and csv")
+    convert.add_argument('--to', dest='to_format', required=True,
+                         choices=sorted(set(FORMATS.values())))
+    convert.add_argument('-o', '--output-dir', default=None,
+                         help="output directory (default: next to each source file)")
+    return parser
+
+
+def main(argv=None, out=sys.stdout):
+    args = build_parser().parse_args(argv)
+    if getattr(args, 'output_dir', None):
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    results = run(args.files, args.command, args.jobs,
+                  getattr(args, 'to_format', None), getattr(args, 'output_dir', None))
+
+    if args.json:
+        payload = {'files': [{k: v for k, v in r.items() if k != 'stats'} for r in results]}
+        if args.command == 'stats':
+            total = {}
+            for result in results:
+                merge_stats(total, result['stats'])
+            payload['stats'] = summarize_stats(total)
+        json.dump(payload, out, indent=1)
+        print(file=out)
+    else:
+        _print_report(results, args.command, out)
+
+    return 1 if any(r['errors'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
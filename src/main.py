@@ -1,24 +1,88 @@
 import sys
-from PyQt5.QtWidgets import (
-    QApplication
-)
-from PyQt5.QtGui import QIcon
 import os
-#from MainWindow import MainWindow
-from src.MainWindow import MainWindow
+import time
 
+PROFILE_FLAG = '--profile-startup'
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    app.setApplicationName("Delta Parser Timeline") 
-    app.setApplicationDisplayName("DPT")  
+
+class StartupProfiler:
+    """
+    Misura le fasi dell'avvio (attivato con --profile-startup).
+
+    Ogni fase registra il tempo trascorso e i moduli importati nel
+    frattempo, così è facile accorgersi di import non necessari
+    all'apertura della finestra.
+    """
+    def __init__(self, enabled=False, stream=None):
+        self.enabled = enabled
+        self.stream = stream or sys.stderr
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.known_modules = set(sys.modules)
+        self.phases = []
+
+    def mark(self, label):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        loaded = sorted(set(sys.modules) - self.known_modules)
+        self.known_modules.update(loaded)
+        self.phases.append((label, now - self.last, loaded))
+        self.last = now
+
+    def report(self):
+        if not self.enabled:
+            return
+        print("\n=== DPT startup profile ===", file=self.stream)
+        for label, elapsed, loaded in self.phases:
+            local = [name for name in loaded if name.startswith('src.')]
+            print(f"{label:<24}{elapsed * 1000:>9.1f} ms  "
+                  f"{len(loaded):>4} moduli", file=self.stream)
+            if local:
+                print(f"{'':<24}{', '.join(local)}", file=self.stream)
+        total = self.last - self.start
+        print(f"{'totale':<24}{total * 1000:>9.1f} ms", file=self.stream)
+
+
+def main(argv=None):
+    argv = list(sys.argv if argv is None else argv)
+    profiler = StartupProfiler(PROFILE_FLAG in argv)
+    argv = [arg for arg in argv if arg != PROFILE_FLAG]
+
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QIcon
+    profiler.mark("import PyQt5")
+
+    app = QApplication(argv)
+    app.setApplicationName("Delta Parser Timeline")
+    app.setApplicationDisplayName("DPT")
     app.setOrganizationName("DeltaResearch")
 
     # Imposta l'icona dell'applicazione
-    icon_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'icon.icns')
+    icon_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'icon.icns')
     if os.path.exists(icon_path):
         app.setWindowIcon(QIcon(icon_path))
-    
+    profiler.mark("QApplication")
+
+    #from MainWindow import MainWindow
+    from src.MainWindow import MainWindow
+    profiler.mark("import MainWindow")
+
     window = MainWindow()
+    profiler.mark("MainWindow()")
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    profiler.mark("show()")
+
+    if profiler.enabled:
+        # Il primo giro dell'event loop include il primo paint della finestra
+        def first_paint():
+            profiler.mark("primo event loop")
+            profiler.report()
+        QTimer.singleShot(0, first_paint)
+
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+# tests/cli/__init__.py
+import os
+import sys
+import json
+import tempfile
+import unittest
+import subprocess
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "integration" / "fixtures"
+
+__all__ = [
+    # Python standard
+    'os',
+    'sys',
+    'json',
+    'tempfile',
+    'unittest',
+    'subprocess',
+    'StringIO',
+    'Path',
+    'patch',
+
+    # Fixtures
+    'FIXTURES_DIR'
+]
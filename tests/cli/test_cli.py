@@ -0,0 +1,104 @@
+# tests/cli/test_cli.py
+from tests.cli import (
+    os, sys, json, tempfile, unittest, subprocess, patch,
+    StringIO, Path,
+    FIXTURES_DIR
+)
+import yaml
+from src import cli
+from src.Params import validate_params, default_params, load_comportamenti
+
+
+class CliTest(unittest.TestCase):
+    """Test della CLI headless (non richiede QApplication)"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.valid = str(FIXTURES_DIR / "test_file.yaml")
+        self.invalid = str(self.dir / "invalid.yaml")
+        with open(self.invalid, 'w') as f:
+            f.write("comportamenti:\n- cAttacco: -1\n  durata: 'lungo'\n  ritmo: [7, '15']\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_cli(self, *args):
+        out = StringIO()
+        code = cli.main(list(args), out=out)
+        return code, out.getvalue()
+
+    def test_default_params_are_valid(self):
+        """I parametri di default di MusicItem rispettano lo schema"""
+        errors, warnings = validate_params(default_params())
+        self.assertEqual(errors, [])
+        self.assertEqual(warnings, [])
+
+    def test_validate(self):
+        """Test validazione di file validi e invalidi"""
+        code, output = self.run_cli('validate', self.valid, '-j', '1')
+        self.assertEqual(code, 0)
+        self.assertIn("OK", output)
+
+        code, output = self.run_cli('validate', self.valid, self.invalid, '-j', '1')
+        self.assertEqual(code, 1)
+        self.assertIn("'cAttacco' negativo", output)
+        self.assertIn("'durata' deve essere numerico", output)
+        self.assertIn("stringa non valida '15'", output)
+
+    def test_stats_parallel(self):
+        """Test statistiche aggregate con pool di processi"""
+        second = str(self.dir / "second.yaml")
+        with open(second, 'w') as f:
+            yaml.safe_dump({'comportamenti': [{'cAttacco': 4, 'durata': 1.0, 'ritmo': [1, 3]}]}, f)
+
+        code, output = self.run_cli('stats', self.valid, second, '-j', '2', '--json')
+        self.assertEqual(code, 0)
+        stats = json.loads(output)['stats']
+        self.assertEqual(stats['cAttacco']['count'], 2)
+        self.assertEqual(stats['cAttacco']['max'], 4)
+        self.assertAlmostEqual(stats['durata']['mean'], 3.0)
+        self.assertEqual(stats['ritmo[0]']['min'], 1)
+        self.assertEqual(stats['ritmo[1]']['max'], 15)
+
+    def test_load_uses_c_loader(self):
+        """load_comportamenti usa il loader in C se c'è, altrimenti quello Python"""
+        with open(self.valid) as f:
+            expected = yaml.safe_load(f)
+        loaders = []
+        load = yaml.load
+
+        def record_load(stream, Loader):
+            loaders.append(Loader)
+            return load(stream, Loader=Loader)
+
+        with patch('yaml.load', side_effect=record_load):
+            self.assertEqual(load_comportamenti(self.valid), expected)
+            with patch.dict(yaml.__dict__):
+                yaml.__dict__.pop('CSafeLoader', None)
+                self.assertEqual(load_comportamenti(self.valid), expected)
+        self.assertEqual(loaders, [getattr(yaml, 'CSafeLoader', yaml.SafeLoader), yaml.SafeLoader])
+
+    def test_convert_roundtrip(self):
+        """Test conversione yaml -> csv -> json senza perdita di dati"""
+        code, _ = self.run_cli('convert', self.valid, '--to', 'csv', '-o', str(self.dir))
+        self.assertEqual(code, 0)
+        csv_path = str(self.dir / "test_file.csv")
+        code, _ = self.run_cli('convert', csv_path, '--to', 'json', '-o', str(self.dir))
+        self.assertEqual(code, 0)
+
+        with open(self.valid) as f:
+            original = yaml.safe_load(f)
+        with open(self.dir / "test_file.json") as f:
+            converted = json.load(f)
+        self.assertEqual(converted, original)
+
+    def test_no_qt_import(self):
+        """La CLI non deve importare PyQt5"""
+        root = Path(__file__).resolve().parent.parent.parent
+        code = ("import sys; from src import cli; "
+                "cli.main(['validate', sys.argv[1], '-j', '1']); "
+                "sys.exit(1 if 'PyQt5' in sys.modules else 0)")
+        result = subprocess.run([sys.executable, '-c', code, self.valid],
+                                cwd=root, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
@@ -61,4 +61,20 @@ class CommandsTest(BaseTest):
 
         # Test undo
         self.window.command_manager.undo()
-        self.assertEqual(item.pos(), initial_pos)
\ No newline at end of file
+        self.assertEqual(item.pos(), initial_pos)
+
+    def test_command_listeners(self):
+        """Test notifica dei listener su execute/undo/redo"""
+        item = self.timeline.add_music_item(0, 0, 3, "Test", self.window.settings)
+        received = []
+        self.command_manager.add_listener(received.append)
+
+        cmd = MoveItemCommand(item, QPointF(0, 0), QPointF(100, 0))
+        self.command_manager.execute(cmd)
+        self.command_manager.undo()
+        self.command_manager.redo()
+        self.assertEqual(received, [cmd, cmd, cmd])
+
+        self.command_manager.remove_listener(received.append)
+        self.command_manager.undo()
+        self.assertEqual(len(received), 3)
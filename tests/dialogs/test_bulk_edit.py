@@ -0,0 +1,111 @@
+# tests/dialogs/test_bulk_edit.py
+import time
+from tests.dialogs import BaseTest, patch, QMessageBox
+from src.BulkEdit import compile_edit
+from src.ClipQuery import QuerySyntaxError
+from src.BulkEditDialog import BulkEditDialog
+
+
+class BulkEditTest(BaseTest):
+    def setUp(self):
+        self.patcher = patch('PyQt5.QtWidgets.QMessageBox.question', return_value=QMessageBox.No)
+        self.patcher.start()
+        super().setUp()
+        self.items = [self.timeline.add_music_item(i * 4, i % 3, 2, f"Clip{i}", self.window.settings)
+                      for i in range(5)]
+
+    def tearDown(self):
+        self.patcher.stop()
+        super().tearDown()
+
+    def test_edit_semantics(self):
+        """Operatori, indici, linspace e clip saltati"""
+        params = [
+            {'durata': 2.0, 'ampiezza': [-30, -0.25], 'posizione': -8},
+            {'durata': [4.0], 'ampiezza': [-20], 'posizione': 'GEN06'},
+            {'durata': 1.0, 'ampiezza': 5, 'posizione': 0},
+        ]
+        changes = compile_edit("durata *= 1.5; ampiezza[1] += 3\nposizione = linspace(-8, 8)").apply(params)
+        # posizione resta -8 (primo valore di linspace): non è un cambiamento
+        self.assertEqual(changes[0], {'durata': 3.0, 'ampiezza': [-30, 2.75]})
+        self.assertEqual(changes[1], {'durata': [6.0]})  # Lista: primo elemento
+        self.assertEqual(changes[2], {'durata': 1.5, 'posizione': 8})
+        self.assertIsInstance(changes[2]['posizione'], int)
+        # I parametri originali non vengono toccati
+        self.assertEqual(params[0]['durata'], 2.0)
+
+    def test_statements_see_previous_results(self):
+        changes = compile_edit("durata *= 2\ndurata -= 1").apply([{'durata': 3.0}])
+        self.assertEqual(changes, [{'durata': 5.0}])
+
+    def test_invalid_results_skipped(self):
+        """Divisioni per zero e tempi negativi non vengono scritti"""
+        params = [{'durata': 2.0, 'posizione': 1}]
+        self.assertEqual(compile_edit("posizione /= 0").apply(params), [{}])
+        self.assertEqual(compile_edit("durata -= 5").apply(params), [{}])
+        self.assertEqual(compile_edit("missing = 3").apply(params), [{}])
+
+    def test_syntax_errors(self):
+        for text in ("", "durata", "durata *= ", "durata ** 2", "durata = sqrt(2, 3)",
+                     "durata = linspace(1)", "__import__('os')"):
+            with self.assertRaises(QuerySyntaxError, msg=text):
+                compile_edit(text)
+
+    def test_single_undoable_command(self):
+        """La modifica è un solo comando; undo e redo riallineano anche la geometria"""
+        scale = self.timeline.pixels_per_beat * self.timeline.zoom_level
+        before = [dict(item.params) for item in self.items]
+        command = self.window.bulk_edit("durata *= 2; cAttacco += 1", self.items[:3])
+        self.assertEqual(len(self.window.command_manager._undo_stack), 1)
+        for item, old in zip(self.items[:3], before):
+            self.assertAlmostEqual(item.params['durata'], old['durata'] * 2)
+            self.assertAlmostEqual(item.rect().width(), item.params['durata'] * scale)
+            self.assertAlmostEqual(item.pos().x(), (old['cAttacco'] + 1) * scale)
+        self.assertEqual(self.items[3].params, before[3])
+        self.assertEqual(len(command.items), 3)
+
+        self.window.command_manager.undo()
+        for item, old in zip(self.items, before):
+            self.assertEqual(dict(item.params), old)
+            self.assertAlmostEqual(item.pos().x(), old['cAttacco'] * scale)
+        self.window.command_manager.redo()
+        self.assertAlmostEqual(self.items[0].params['durata'], before[0]['durata'] * 2)
+
+        # Nessun cambiamento: nessun comando
+        self.assertIsNone(self.window.bulk_edit("posizione *= 1", self.items))
+
+    def test_linspace_follows_time_order(self):
+        self.window.bulk_edit("posizione = linspace(0, 8)", list(reversed(self.items)))
+        self.assertEqual([item.params['posizione'] for item in self.items], [0, 2, 4, 6, 8])
+
+    def test_dialog(self):
+        """Il dialogo applica la modifica ai clip selezionati o trovati"""
+        self.items[1].setSelected(True)
+        dialog = BulkEditDialog(self.window)
+        self.assertEqual(dialog.count_label.text(), "1 clip")
+        dialog.expression.setPlainText("posizione = 3")
+        dialog.accept()
+        self.assertEqual(self.items[1].params['posizione'], 3)
+        self.assertIsNotNone(dialog.command)
+
+        self.items[1].setSelected(False)
+        self.timeline.set_highlighted(self.items[2:4])
+        dialog = BulkEditDialog(self.window)
+        self.assertEqual(dialog.target.currentText(), 'Search results')
+        dialog.expression.setPlainText("posizione ==")
+        with patch('src.BulkEditDialog.QMessageBox.warning') as mock_warning:
+            dialog.accept()
+        mock_warning.assert_called_once()
+        self.assertFalse(dialog.result())
+
+    def test_bulk_edit_benchmark(self):
+        """Benchmark: calcolo di una modifica su 10000 comportamenti"""
+        params = [{'durata': 1.0 + i % 5, 'ampiezza': [-30, -0.25], 'posizione': i % 9}
+                  for i in range(10000)]
+        edit = compile_edit("durata *= 1.5; ampiezza[0] += 3; posizione = linspace(-8, 8)")
+        start = time.perf_counter()
+        changes = edit.apply(params)
+        elapsed = time.perf_counter() - start
+        print(f"\nmodifica in blocco su 10000 comportamenti: {elapsed * 1000:.1f}ms")
+        self.assertEqual(len(changes), 10000)
+        self.assertLess(elapsed, 1.0)
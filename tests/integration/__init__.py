@@ -5,11 +5,9 @@ from tests import (
     # PyQt components
     Qt, QPointF, QCloseEvent, QMessageBox, QColor
 )
-from src.MusicItem import MoveItemCommand
 from src.Commands import MoveItemCommand, CommandManager
 from src.Timeline import Timeline
 from src.MusicItem import MusicItem
-from src.Timeline import TrackItem
 from src.ParamDialog import ParamDialog
 from src.SettingsDialog import SettingsDialog
 
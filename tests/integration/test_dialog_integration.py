@@ -2,7 +2,7 @@
 from tests.integration import (
     BaseTest, 
     ParamDialog, SettingsDialog,
-    TrackItem, Qt,
+    Qt,
     QColor
 )
 
@@ -30,7 +30,5 @@ class DialogIntegrationTest(BaseTest):
         dialog.track_color = QColor(new_color)
         dialog.accept()
         
-        # Verifica che le tracce siano aggiornate
-        for item in self.timeline.items():
-            if isinstance(item, TrackItem):
-                self.assertEqual(item.base_color.name().lower(), new_color.lower())
\ No newline at end of file
+        # Verifica che lo sfondo delle tracce usi il nuovo colore
+        self.assertEqual(self.timeline.track_brush.color().name().lower(), new_color.lower())
\ No newline at end of file
@@ -0,0 +1,62 @@
+# tests/integration/test_live_make.py
+from tests.integration import (
+    BaseTest, QTest, patch,
+    QPointF
+)
+from unittest.mock import MagicMock
+from src.Commands import MoveItemCommand
+
+
+class LiveMakeTest(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.live_make = self.window.live_make
+        self.window.current_file = "sezione.yaml"
+        self.window.live_make_action.setChecked(True)
+
+    def tearDown(self):
+        self.live_make.set_enabled(False)
+        self.window.current_file = None
+        super().tearDown()
+
+    def test_commands_are_debounced(self):
+        """Test che modifiche ravvicinate producano una sola build"""
+        item = self.timeline.add_music_item(0, 0, 3, "Test", self.window.settings)
+
+        with patch('src.LiveMake.QProcess') as mock_process_class, \
+             patch.object(self.window, 'save_to_yaml'):
+            for i in range(5):
+                command = MoveItemCommand(item, QPointF(i, 0), QPointF(i + 1, 0))
+                self.window.command_manager.execute(command)
+            QTest.qWait(self.live_make.delay + 100)
+            self.assertEqual(mock_process_class.call_count, 1)
+
+    def test_disabled_does_not_schedule(self):
+        """Test che senza live make attivo non venga programmata alcuna build"""
+        self.window.live_make_action.setChecked(False)
+        with patch('src.LiveMake.QProcess') as mock_process_class:
+            self.live_make.on_command()
+            QTest.qWait(self.live_make.delay + 100)
+            mock_process_class.assert_not_called()
+
+    def test_builds_are_coalesced(self):
+        """Test al massimo una build in esecuzione e una in attesa"""
+        with patch('src.LiveMake.QProcess') as mock_process_class, \
+             patch.object(self.window, 'save_to_yaml') as mock_save:
+            mock_process_class.return_value = MagicMock()
+
+            for _ in range(4):
+                self.live_make.start_build()
+            self.assertTrue(self.live_make.is_running)
+            self.assertTrue(self.live_make.has_pending)
+            self.assertEqual(mock_process_class.call_count, 1)
+
+            # La prima build termina: parte esattamente la build in attesa
+            self.live_make._on_finished(0)
+            self.assertTrue(self.live_make.is_running)
+            self.assertFalse(self.live_make.has_pending)
+            self.assertEqual(mock_process_class.call_count, 2)
+
+            self.live_make._on_finished(0)
+            self.assertFalse(self.live_make.is_running)
+            self.assertEqual(mock_save.call_count, 2)
@@ -2,7 +2,6 @@
 from tests.integration import (
     BaseTest,
     MusicItem,
-    TrackItem,
     Qt
 )
 
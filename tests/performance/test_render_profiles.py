@@ -0,0 +1,89 @@
+# tests/performance/test_render_profiles.py
+from tests.performance import (
+    BaseTest,
+    time
+)
+from PyQt5.QtWidgets import QGraphicsView, QGraphicsItem
+from PyQt5.QtGui import QPainter
+from src.TimelineView import RENDER_PROFILES, render_profile_options
+
+FRAMES = 20
+
+
+class RenderProfileTest(BaseTest):
+    def populate(self, count=2000):
+        for i in range(count):
+            self.timeline.add_music_item(i * 2, i % self.timeline.num_tracks, 3,
+                                         f"Clip{i}", self.window.settings)
+
+    def frame_times(self, view):
+        """Tempo medio (ms) di un frame fermo e di un frame durante lo scroll"""
+        viewport = view.viewport()
+        scrollbar = view.horizontalScrollBar()
+        viewport.repaint()  # Riempie le cache prima di misurare
+
+        start = time.perf_counter()
+        for _ in range(FRAMES):
+            viewport.repaint()
+        still = (time.perf_counter() - start) / FRAMES * 1000
+
+        start = time.perf_counter()
+        for i in range(FRAMES):
+            scrollbar.setValue(scrollbar.value() + (40 if i % 2 == 0 else -40))
+            viewport.repaint()
+        scroll = (time.perf_counter() - start) / FRAMES * 1000
+        return still, scroll
+
+    def test_large_project_preset(self):
+        """Il preset 'large_project' configura vista e clip"""
+        self.populate(10)
+        view = self.window.timeline_container.timeline_view
+        view.apply_render_profile('large_project')
+
+        self.assertEqual(view.viewportUpdateMode(), QGraphicsView.SmartViewportUpdate)
+        self.assertFalse(view.renderHints() & QPainter.Antialiasing)
+        self.assertTrue(view.optimizationFlags() & QGraphicsView.DontSavePainterState)
+        self.assertTrue(view.optimizationFlags() & QGraphicsView.DontAdjustForAntialiasing)
+        self.assertEqual(view.cacheMode(), QGraphicsView.CacheBackground)
+
+        items = [i for i in self.timeline.items() if hasattr(i, 'params')]
+        self.assertTrue(all(i.cacheMode() == QGraphicsItem.DeviceCoordinateCache for i in items))
+        # Anche i clip creati dopo
+        item = self.timeline.add_music_item(100, 0, 3, "New", self.window.settings)
+        self.assertEqual(item.cacheMode(), QGraphicsItem.DeviceCoordinateCache)
+
+        view.apply_render_profile('default')
+        self.assertTrue(view.renderHints() & QPainter.Antialiasing)
+        self.assertEqual(item.cacheMode(), QGraphicsItem.NoCache)
+
+    def test_custom_profile_overrides(self):
+        """Un profilo personalizzato parte da un preset e cambia singole opzioni"""
+        view = self.window.timeline_container.timeline_view
+        view.apply_render_profile({'base': 'large_project', 'antialiasing': True,
+                                   'update_mode': 'bogus'})
+        self.assertTrue(view.renderHints() & QPainter.Antialiasing)
+        self.assertEqual(view.cacheMode(), QGraphicsView.CacheBackground)
+        # update_mode non valido: resta quello del preset di partenza
+        self.assertEqual(view.viewportUpdateMode(), QGraphicsView.SmartViewportUpdate)
+        self.assertEqual(render_profile_options({'update_mode': 'bogus'})['update_mode'],
+                         RENDER_PROFILES['default']['update_mode'])
+
+    def test_frame_times_per_preset(self):
+        """Benchmark: tempo per frame di ogni preset su 2000 clip"""
+        self.populate()
+        self.window.resize(1200, 700)
+        self.window.show()
+        self.app.processEvents()
+        view = self.window.timeline_container.timeline_view
+        results = {}
+        for name in RENDER_PROFILES:
+            view.apply_render_profile(name)
+            results[name] = self.frame_times(view)
+
+        print("\nprofilo            fermo (ms)  scroll (ms)")
+        for name, (still, scroll) in results.items():
+            print(f"{name:<18}{still:>10.2f}{scroll:>13.2f}")
+
+        for still, scroll in results.values():
+            self.assertLess(still, 100)  # Non più di 100ms per frame
+            self.assertLess(scroll, 100)
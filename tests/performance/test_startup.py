@@ -0,0 +1,71 @@
+# tests/performance/test_startup.py
+import json
+import subprocess
+import sys
+
+from tests.performance import (
+    BaseTest,
+    os,
+)
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# L'avvio va misurato in un interprete pulito: nel processo dei test
+# PyQt5 e i moduli di src sono già importati.
+COLD_START_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv)
+from src.MainWindow import MainWindow
+window = MainWindow()
+window.show()
+app.processEvents()
+elapsed = time.perf_counter() - start
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+PROFILE_SCRIPT = """
+import sys
+from PyQt5.QtWidgets import QApplication
+# Un solo giro dell'event loop invece di app.exec_()
+QApplication.exec_ = lambda self: (self.processEvents(), 0)[1]
+from src.main import main
+sys.exit(main(['dpt', '--profile-startup']))
+"""
+
+
+def run_script(script):
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=ROOT_DIR, env=env, capture_output=True, text=True, timeout=60
+    )
+
+
+class StartupTest(BaseTest):
+    def test_cold_start_time(self):
+        """Benchmark: import + costruzione della finestra in un processo nuovo"""
+        result = run_script(COLD_START_SCRIPT)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertLess(data['elapsed'], 1.0)  # Non più di 1s
+
+    def test_lazy_imports(self):
+        """Dialoghi, YAML e subprocess non vengono caricati all'avvio"""
+        result = run_script(COLD_START_SCRIPT)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        modules = set(json.loads(result.stdout.strip().splitlines()[-1])['modules'])
+        for name in ('src.ParamDialog', 'src.RenameDialog', 'src.SettingsDialog',
+                     'yaml', 'subprocess', 'numpy'):
+            self.assertNotIn(name, modules)
+
+    def test_profile_startup_report(self):
+        """--profile-startup stampa i tempi delle fasi su stderr"""
+        result = run_script(PROFILE_SCRIPT)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("DPT startup profile", result.stderr)
+        for phase in ("import PyQt5", "import MainWindow", "MainWindow()", "primo event loop"):
+            self.assertIn(phase, result.stderr)
+        self.assertIn("src.MainWindow", result.stderr)
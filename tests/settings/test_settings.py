@@ -13,6 +13,7 @@ class SettingsTest(BaseTest):
         """Test persistenza settings"""
         test_value = "/test/path"
         self.settings.set('last_open_directory', test_value)
+        self.settings.flush()
         
         new_settings = Settings()
         self.assertEqual(
@@ -59,4 +60,69 @@ class SettingsTest(BaseTest):
             )
         finally:
             if os.path.exists('settings.json.bak'):
-                os.rename('settings.json.bak', 'settings.json')
\ No newline at end of file
+                os.rename('settings.json.bak', 'settings.json')
+
+    def test_batched_writes(self):
+        """Più set vengono scritti su disco una volta sola"""
+        settings = Settings(save_delay=60)
+        with patch('src.Settings.os.replace', wraps=os.replace) as mock_replace:
+            with settings.transaction():
+                settings.set('text_color', '#123456')
+                settings.set('item_text_size', 17)
+            settings.set('timeline_text_size', 19)
+            self.assertTrue(settings.pending)
+            self.assertEqual(mock_replace.call_count, 0)
+
+            settings.flush()
+            self.assertEqual(mock_replace.call_count, 1)
+            self.assertFalse(settings.pending)
+
+            # Nessuna scrittura se non ci sono modifiche
+            settings.set('item_text_size', 17)
+            settings.flush()
+            self.assertEqual(mock_replace.call_count, 1)
+
+        with open(settings.settings_file) as f:
+            data = json.load(f)
+        self.assertEqual(data['item_text_size'], 17)
+        self.assertEqual(data['timeline_text_size'], 19)
+        # Nessun file temporaneo lasciato accanto a settings.json
+        leftovers = [name for name in os.listdir(settings.settings_file.parent)
+                     if name.startswith('.settings-')]
+        self.assertEqual(leftovers, [])
+
+    def test_debounced_save(self):
+        """Le modifiche vengono salvate in background dopo il ritardo"""
+        settings = Settings(save_delay=0.05)
+        settings.set('text_color', '#654321')
+        timer = settings._timer
+        self.assertIsNotNone(timer)
+        timer.join(2)
+        self.assertFalse(settings.pending)
+        self.assertEqual(Settings().get('text_color'), '#654321')
+
+    def test_change_notifications(self):
+        """Una notifica per set, una sola per transazione, nessuna senza cambiamenti"""
+        settings = Settings(save_delay=60)
+        received = []
+        settings.subscribe(received.append)
+        settings.set('item_text_size', settings.get('item_text_size', 12) + 1)
+        settings.set('item_text_size', settings.get('item_text_size'))
+        with settings.transaction():
+            settings.set('text_color', '#000001' if settings.get('text_color') != '#000001' else '#000002')
+            settings.set('timeline_text_size', settings.get('timeline_text_size', 14) + 1)
+        self.assertEqual(received, [{'item_text_size'}, {'text_color', 'timeline_text_size'}])
+
+        settings.unsubscribe(received.append)
+        settings.set('timeline_text_size', settings.get('timeline_text_size') + 1)
+        self.assertEqual(len(received), 2)
+
+        # I metodi sono tenuti con un riferimento debole
+        class Listener:
+            def changed(self, keys):
+                received.append(keys)
+        listener = Listener()
+        settings.subscribe(listener.changed)
+        del listener
+        settings.set('timeline_text_size', settings.get('timeline_text_size') + 1)
+        self.assertEqual(len(received), 2)
@@ -1,6 +1,6 @@
 # tests/settings/test_settings_dialog.py
 from tests.settings import (
-    BaseTest,
+    BaseTest, patch,
     Qt, QColor
 )
 from src.SettingsDialog import SettingsDialog
@@ -29,4 +29,39 @@ class SettingsDialogTest(BaseTest):
         self.assertEqual(
             self.window.settings.get('text_color'),
             new_color.name()
-        )
\ No newline at end of file
+        )
+
+    def test_changes_applied_in_place(self):
+        """Il dialogo non ricrea la scena: clip, selezione e undo restano"""
+        settings = self.window.settings
+        for key in ('text_color', 'item_text_size', 'track_background_color',
+                    'timeline_background_color', 'timeline_text_size'):
+            self.addCleanup(settings.set, key, settings.get(key))
+        timeline = self.window.scene
+        items = [timeline.add_music_item(i, i, 2, f"Clip{i}", settings) for i in range(3)]
+        items[1].setSelected(True)
+        self.window.transform_clips('insert', items, start=0.5, amount=1.0)
+        undo_depth = len(self.window.command_manager._undo_stack)
+
+        dialog = SettingsDialog(settings, self.window)
+        dialog.text_color = QColor('#224466')
+        dialog.track_color = QColor('#DDEEFF')
+        dialog.timeline_color = QColor('#FFEEDD')
+        dialog.item_text_size_spin.setValue(15)
+        dialog.timeline_text_size_spin.setValue(16)
+        with patch.object(timeline, 'clear') as mock_clear:
+            dialog.accept()
+        mock_clear.assert_not_called()
+
+        self.assertEqual(set(timeline.clip_items()), set(items))
+        self.assertEqual(timeline.selectedItems(), [items[1]])
+        self.assertEqual(len(self.window.command_manager._undo_stack), undo_depth)
+        for item in items:
+            self.assertEqual(item.text.defaultTextColor().name(), '#224466')
+            self.assertEqual(item.text.font().pointSize(), 15)
+        self.assertEqual(timeline.track_brush.color().name(), '#ddeeff')
+        ruler = self.window.timeline_container.ruler_scene
+        self.assertEqual(ruler.backgroundBrush().color().name(), '#ffeedd')
+
+        self.window.command_manager.undo()
+        self.assertEqual(items[1].params['cAttacco'], 1)
@@ -27,7 +27,6 @@ __all__ = [
     
     # App components
     'Timeline',
-    'TrackItem',
     'MusicItem',
     'TimelineView', 
     'TimelineRuler',
@@ -0,0 +1,192 @@
+# tests/timeline/test_batch_update.py
+import gc
+import os
+import tempfile
+import time
+import unittest
+from contextlib import nullcontext
+from tests.timeline import BaseTest, patch, QPointF, QRectF
+from PyQt5.QtWidgets import QGraphicsScene, QMessageBox
+from src.Generate import compile_generator
+from src.Params import dump_comportamenti
+
+# I benchmark cronometrati girano solo se richiesti: DPT_BENCHMARK=1 pytest ...
+BENCHMARK = os.environ.get('DPT_BENCHMARK')
+
+
+class BatchUpdateTest(BaseTest):
+    """Test di Timeline.batch_update"""
+
+    def setUp(self):
+        self.patcher = patch('PyQt5.QtWidgets.QMessageBox.question', return_value=QMessageBox.No)
+        self.patcher.start()
+        super().setUp()
+        self.viewport = self.window.timeline_container.timeline_view.viewport()
+
+    def tearDown(self):
+        self.patcher.stop()
+        super().tearDown()
+
+    def test_index_and_updates_suspended(self):
+        method = self.timeline.itemIndexMethod()
+        with self.timeline.batch_update():
+            self.assertEqual(self.timeline.itemIndexMethod(), QGraphicsScene.NoIndex)
+            self.assertFalse(self.viewport.updatesEnabled())
+            self.assertTrue(self.timeline.signalsBlocked())
+            with self.timeline.batch_update():  # Annidato: nessun effetto
+                pass
+            self.assertEqual(self.timeline.itemIndexMethod(), QGraphicsScene.NoIndex)
+        self.assertEqual(self.timeline.itemIndexMethod(), method)
+        self.assertTrue(self.viewport.updatesEnabled())
+        self.assertFalse(self.timeline.signalsBlocked())
+
+    def test_restored_after_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.timeline.batch_update():
+                raise RuntimeError("boom")
+        self.assertEqual(self.timeline.itemIndexMethod(), QGraphicsScene.BspTreeIndex)
+        self.assertTrue(self.viewport.updatesEnabled())
+        self.assertFalse(self.timeline.signalsBlocked())
+
+    def test_signals_emitted_once(self):
+        """selectionChanged e sceneRectChanged arrivano una volta sola, alla fine"""
+        items = [self.timeline.add_music_item(i, 0, 1, f"Clip{i}", self.window.settings) for i in range(5)]
+        selections, rects = [], []
+        self.timeline.selectionChanged.connect(lambda: selections.append(1))
+        self.timeline.sceneRectChanged.connect(rects.append)
+        with self.timeline.batch_update():
+            for item in items:
+                item.setSelected(True)
+            rect = self.timeline.sceneRect()
+            self.timeline.setSceneRect(0, 0, rect.width() + 500, rect.height())
+            self.assertEqual((selections, rects), ([], []))
+        self.assertEqual(len(selections), 1)
+        self.assertEqual(len(rects), 1)
+
+        # Nessun cambiamento: nessun segnale
+        with self.timeline.batch_update():
+            pass
+        self.assertEqual((len(selections), len(rects)), (1, 1))
+
+    def test_index_rebuilt_at_end(self):
+        """Le ricerche spaziali vedono i clip aggiunti e spostati nel blocco"""
+        with self.timeline.batch_update():
+            item = self.timeline.add_music_item(2, 1, 1, "Clip", self.window.settings)
+            item.setPos(QPointF(800, item.pos().y()))
+        scale = self.timeline.pixels_per_beat * self.timeline.zoom_level
+        self.assertIn(item, self.timeline.items(QRectF(810, item.pos().y() + 1, 10, 10)))
+        self.assertEqual(self.timeline.clip_index.overlapping(790, 810), [item])
+        self.assertAlmostEqual(item.params['cAttacco'], 800 / scale)
+
+    def test_bulk_operations_use_batch(self):
+        """Generazione, undo e zoom passano da un solo blocco"""
+        with patch.object(self.timeline, 'batch_update', wraps=self.timeline.batch_update) as mock_batch:
+            self.window.generate_clips("durata = 1", 20, 0.0, 10.0, [0, 1], seed=0)
+            self.window.command_manager.undo()
+            self.timeline.scale_scene(2.0)
+        self.assertEqual(mock_batch.call_count, 3)
+
+    def write_yaml(self, count):
+        """File YAML temporaneo con count clip generati"""
+        records = compile_generator("durata = uniform(1, 4)").generate(count, 0.0, 600.0, [0], seed=0)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'bench.yaml')
+        with open(path, 'w') as f:
+            dump_comportamenti([dict(params) for params, _ in records], f)
+        return path
+
+    def test_load_uses_one_batch(self):
+        """
+        load_from_yaml aggiunge i clip in un solo blocco: viste ferme,
+        indice dei clip ricostruito una volta, segnali emessi una volta
+        """
+        self.timeline.add_music_item(0, 0, 1, "Clip", self.window.settings).setSelected(True)
+        self.window.current_file = self.write_yaml(200)
+        selections, rects, updates = [], [], []
+        self.timeline.selectionChanged.connect(lambda: selections.append(1))
+        self.timeline.sceneRectChanged.connect(rects.append)
+        add_item = self.timeline.addItem
+
+        def record_add(item):
+            updates.append(self.viewport.updatesEnabled())
+            add_item(item)
+
+        index = self.timeline.clip_index
+        with patch.object(self.timeline, 'batch_update', wraps=self.timeline.batch_update) as mock_batch, \
+                patch.object(self.timeline, 'addItem', side_effect=record_add), \
+                patch.object(self.timeline, 'setItemIndexMethod',
+                             wraps=self.timeline.setItemIndexMethod) as mock_index, \
+                patch.object(index, '_source', wraps=index._source) as mock_source:
+            self.window.load_from_yaml(test_mode=True)
+            self.assertEqual(len(self.timeline.clip_index.overlapping(0, 10 ** 6)), 200)
+            self.assertEqual(len(self.timeline.clip_index), 200)
+        mock_batch.assert_called_once()
+        self.assertEqual(len(self.timeline.clip_items()), 200)
+        self.assertFalse(any(updates))
+        # NoIndex all'ingresso, BSP all'uscita: l'indice di Qt si ricostruisce una volta
+        self.assertEqual(mock_index.call_count, 2)
+        mock_source.assert_called_once()
+        self.assertEqual((len(selections), len(rects)), (1, 1))
+        self.assertTrue(self.viewport.updatesEnabled())
+
+    def timed(self, work, area):
+        """Durata di work più la prima ricerca e il ridisegno, senza garbage collector"""
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            work()
+            self.timeline.items(area)  # Prima ricerca: l'indice è pronto
+            self.app.processEvents()
+            return time.perf_counter() - start
+        finally:
+            gc.enable()
+
+    @unittest.skipUnless(BENCHMARK, "benchmark: DPT_BENCHMARK=1")
+    def test_load_benchmark(self):
+        """
+        Benchmark: caricamento di un file YAML di 10000 clip con e senza
+        batch_update. Il caricamento non ne trae vantaggio: il tempo è nel
+        parsing YAML e nella creazione dei MusicItem, i clip entrano nella
+        scena già posizionati e l'indice BSP di Qt si costruisce comunque
+        alla prima ricerca. Il blocco serve a non ridisegnare le viste e a
+        emettere i segnali una volta sola (test_load_uses_one_batch)
+        """
+        self.window.current_file = self.write_yaml(10000)
+        area = QRectF(0, 0, 1000, 400)
+
+        def run(batched):
+            context = nullcontext() if batched else patch.object(
+                self.timeline, 'batch_update', lambda: nullcontext())
+            with context:
+                return self.timed(lambda: self.window.load_from_yaml(test_mode=True), area)
+
+        plain, batched = run(False), run(True)
+        print(f"\ncaricamento di 10000 clip: {plain * 1000:.0f}ms, "
+              f"con batch_update {batched * 1000:.0f}ms ({plain / batched:.2f}x)")
+        self.assertEqual(len(self.timeline.clip_items()), 10000)
+
+    @unittest.skipUnless(BENCHMARK, "benchmark: DPT_BENCHMARK=1")
+    def test_move_benchmark(self):
+        """Benchmark: 10000 clip reinseriti e spostati con e senza batch_update"""
+        records = compile_generator("durata = uniform(1, 4)").generate(
+            10000, 0.0, 600.0, list(range(self.timeline.num_tracks)), seed=0)
+        items = self.timeline.add_clips(records)
+        area = QRectF(0, 0, 1000, 400)
+
+        def run(context, dx):
+            def work():
+                with context:
+                    for item in items:
+                        self.timeline.removeItem(item)
+                    for item in items:
+                        self.timeline.addItem(item)
+                    self.timeline.move_items(items, [item.pos() + QPointF(dx, 0) for item in items])
+            return self.timed(work, area)
+
+        plain = min(run(nullcontext(), 10), run(nullcontext(), -10))
+        batched = min(run(self.timeline.batch_update(), 10), run(self.timeline.batch_update(), -10))
+        print(f"\n10000 clip reinseriti e spostati: {plain * 1000:.0f}ms, "
+              f"con batch_update {batched * 1000:.0f}ms ({plain / batched:.2f}x)")
+        self.assertTrue(self.timeline.items(area))
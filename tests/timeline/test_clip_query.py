@@ -0,0 +1,110 @@
+# tests/timeline/test_clip_query.py
+import time
+from tests.timeline import (
+    BaseTest, patch
+)
+from src.ClipQuery import compile_query, tokenize, read_field, write_field, QuerySyntaxError
+
+
+class ClipQueryTest(BaseTest):
+    """Test del linguaggio di query sui parametri dei clip"""
+
+    RECORDS = [
+        ({'durata': 5.0, 'ritmo': [7, 15], 'posizione': -8}, 0),
+        ({'durata': 2.0, 'ritmo': [5, 15], 'posizione': 3}, 2),
+        ({'durata': [4.0], 'ritmo': [9, 1], 'posizione': 'GEN06'}, 4),
+        ({'durata': 3.0005, 'ritmo': [], 'posizione': 0}, None),
+    ]
+
+    def matches(self, text):
+        return list(compile_query(text).indices(self.RECORDS))
+
+    def test_tokenize(self):
+        """Numeri negativi, intervalli e parole chiave"""
+        kinds = [kind for kind, _, _ in tokenize("ritmo[0] in 5..9 and durata>-3")]
+        self.assertEqual(kinds, ['name', 'punct', 'number', 'punct', 'in', 'number', 'range',
+                                 'number', 'and', 'name', 'op', 'number'])
+
+    def test_comparisons(self):
+        self.assertEqual(self.matches("durata > 3"), [0, 2, 3])
+        self.assertEqual(self.matches("durata = 3"), [3])  # Tolleranza sui float
+        self.assertEqual(self.matches("durata != 5"), [1, 2, 3])
+        self.assertEqual(self.matches("ritmo[1] <= 1"), [2])
+        # Lista senza indice: primo elemento
+        self.assertEqual(self.matches("ritmo == 5"), [1])
+
+    def test_ranges_sets_and_logic(self):
+        self.assertEqual(self.matches("ritmo[0] in 5..7"), [0, 1])
+        self.assertEqual(self.matches("track in {2,4}"), [1, 2])
+        self.assertEqual(self.matches("durata > 3 and ritmo[0] in 5..9 and track in {2,4}"), [2])
+        self.assertEqual(self.matches("durata < 3 or (track = 0 and not posizione > 0)"), [0, 1])
+
+    def test_missing_fields_never_match(self):
+        """Campi mancanti o non numerici non soddisfano nessun confronto"""
+        self.assertEqual(self.matches("posizione != 1"), [0, 1, 3])
+        self.assertEqual(self.matches("ritmo[0] != 1"), [0, 1, 2])
+        self.assertEqual(self.matches("unknown > 0"), [])
+        self.assertEqual(self.matches("track >= 0"), [0, 1, 2])
+
+    def test_syntax_errors(self):
+        """Testo non valido (anche codice Python) solleva QuerySyntaxError"""
+        for text in ("", "durata >", "durata > 3 and", "(durata > 3", "durata in 3..",
+                     "ritmo[1.5] > 0", "__import__('os').system('ls')", "durata > 3 3"):
+            with self.assertRaises(QuerySyntaxError, msg=text):
+                compile_query(text)
+        self.assertIsInstance(QuerySyntaxError("x"), ValueError)
+
+    def test_read_and_write_field(self):
+        """Accesso ai campi condiviso da query, modifiche in blocco e trasformazioni"""
+        self.assertEqual(read_field([3, 4], []), 3)
+        self.assertEqual(read_field([[1, 2], [5, 6]], [1, 0]), 5)
+        self.assertIsNone(read_field([1], [3]))
+        self.assertEqual(write_field([3, 4], [], 9), [9, 4])
+        value = [[1, 2], [5, 6]]
+        self.assertEqual(write_field(value, [1, 0], 7), [[1, 2], [7, 6]])
+        self.assertEqual(value, [[1, 2], [5, 6]])  # L'originale non cambia
+
+    def test_compiled_once(self):
+        self.assertIs(compile_query("durata > 1"), compile_query("durata > 1"))
+
+    def test_timeline_query_and_select(self):
+        """La scena filtra e seleziona i clip con una query"""
+        items = [self.timeline.add_music_item(i * 4, i % 4, 2 + i % 3, f"Clip{i}", self.window.settings)
+                 for i in range(12)]
+        for item in items:
+            item.params['durata'] = item.rect().width() / self.timeline.pixels_per_beat
+
+        expected = {item for i, item in enumerate(items) if item.params['durata'] > 3 and i % 4 in (1, 3)}
+        self.assertEqual(set(self.timeline.query("durata > 3 and track in {1,3}")), expected)
+        self.timeline.select_query("durata > 3 and track in {1,3}")
+        self.assertEqual(set(self.timeline.selectedItems()), expected)
+
+    def test_search_bar_query(self):
+        """La barra di ricerca accetta anche le query, senza eval"""
+        items = [self.timeline.add_music_item(i * 4, i % 4, 3, f"Clip{i}", self.window.settings)
+                 for i in range(8)]
+        self.window.search_value.setText("track in {0,2}")
+        self.window.perform_search()
+        self.assertEqual({i for i in items if i.highlighted}, {i for n, i in enumerate(items) if n % 2 == 0})
+
+        self.window.select_search_results()
+        self.assertEqual(len(self.timeline.selectedItems()), 4)
+
+        self.window.search_value.setText("durata >> 3")
+        with patch('src.MainWindow.QMessageBox.warning') as mock_warning:
+            self.window.perform_search()
+        mock_warning.assert_called_once()
+
+    def test_vectorized_benchmark(self):
+        """Benchmark: query composta su 20000 record"""
+        records = [({'durata': i % 11, 'ritmo': [i % 13, 15]}, i % 8) for i in range(20000)]
+        query = compile_query("durata > 3 and ritmo[0] in 5..9 and track in {2,4}")
+        columns = query.columns(records)
+
+        start = time.perf_counter()
+        mask = query.evaluate(columns)
+        elapsed = time.perf_counter() - start
+        print(f"\nvalutazione su 20000 record: {elapsed * 1000:.2f}ms")
+        expected = sum(1 for p, t in records if p['durata'] > 3 and 5 <= p['ritmo'][0] <= 9 and t in (2, 4))
+        self.assertEqual(int(mask.sum()), expected)
+        self.assertLess(elapsed, 0.1)
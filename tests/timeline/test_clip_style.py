@@ -0,0 +1,70 @@
+# tests/timeline/test_clip_style.py
+from tests.timeline import BaseTest, patch, QColor
+from src.ClipStyle import style_registry, StyleRegistry, label_style
+from src.MusicItem import MusicItem
+from src.Settings import Settings
+
+
+class ClipStyleTest(BaseTest):
+    """Test degli stili condivisi delle etichette dei clip"""
+
+    def setUp(self):
+        super().setUp()
+        self.settings = self.window.settings
+        for key in ('text_color', 'item_text_size'):
+            self.addCleanup(self.settings.set, key, self.settings.get(key))
+        self.items = [self.timeline.add_music_item(i, i % 2, 1, f"Clip{i}", self.settings)
+                      for i in range(4)]
+
+    def test_clips_share_style_objects(self):
+        styles = {id(item.text.style) for item in self.items}
+        self.assertEqual(len(styles), 1)
+        style = self.items[0].text.style
+        self.assertIs(style, label_style(style.font, QColor(style.color)))
+        # Anche il colore di riempimento è condiviso
+        self.assertIs(self.items[0].color, self.items[1].color)
+        self.items[1].color = QColor(self.items[0].color)
+        self.assertIs(self.items[0].color, self.items[1].color)
+
+    def test_refresh_restyles_all_clips_once(self):
+        """Un cambio di tema rilegge le settings una volta e ridisegna la scena una volta"""
+        registry = style_registry(self.settings)
+        version = registry.version
+        with patch.object(self.timeline, 'update') as mock_update, \
+                patch.object(MusicItem, 'update') as mock_item_update:
+            with self.settings.transaction():
+                self.settings.set('text_color', '#336699')
+                self.settings.set('item_text_size', 17)
+        mock_update.assert_called_once()
+        mock_item_update.assert_not_called()
+        self.assertEqual((registry.version, registry.text_size), (version + 1, 17))
+        for item in self.items:
+            self.assertEqual(item.text.defaultTextColor().name(), '#336699')
+            self.assertEqual(item.text.font().pointSize(), 17)
+
+    def test_height_scaling_and_overrides(self):
+        item = self.items[0]
+        self.settings.set('item_text_size', 12)
+        item.updateTextStyle()
+        item.updateHeight(100)
+        self.assertEqual(item.text.font().pointSize(), 24)
+        self.items[2].updateHeight(100)
+        self.assertIs(item.text.style, self.items[2].text.style)
+
+        item.text.setDefaultTextColor(QColor('#ff0000'))
+        self.settings.set('item_text_size', 10)
+        self.window.update_all_items_style()
+        # Il colore esplicito resta, il font scalato segue il nuovo tema
+        self.assertEqual(item.text.defaultTextColor().name(), '#ff0000')
+        self.assertEqual(item.text.font().pointSize(), 20)
+        item.updateTextStyle()
+        self.assertEqual(item.text.font().pointSize(), 10)
+        self.assertEqual(item.text.defaultTextColor().name(), self.settings.get('text_color').lower())
+
+    def test_registry_per_settings(self):
+        other = Settings()
+        self.assertIs(style_registry(self.settings), style_registry(self.settings))
+        self.assertIsNot(style_registry(other), style_registry(self.settings))
+        self.assertIsInstance(style_registry(None), StyleRegistry)
+        item = MusicItem(0, 0, 10)
+        self.assertEqual(item.text.defaultTextColor().name(), '#000000')
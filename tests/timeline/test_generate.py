@@ -0,0 +1,132 @@
+# tests/timeline/test_generate.py
+import time
+from tests.timeline import BaseTest, patch, QPointF
+from PyQt5.QtWidgets import QMessageBox
+from src.Generate import compile_generator, parse_tracks
+from src.GenerateDialog import GenerateDialog
+from src.ClipQuery import QuerySyntaxError
+from src.MusicItem import MusicItem
+from src.Commands import MoveItemsCommand
+
+
+class GenerateTest(BaseTest):
+    """Test della generazione di clip da distribuzioni"""
+
+    def setUp(self):
+        self.patcher = patch('PyQt5.QtWidgets.QMessageBox.question', return_value=QMessageBox.No)
+        self.patcher.start()
+        super().setUp()
+
+    def tearDown(self):
+        self.patcher.stop()
+        super().tearDown()
+
+    def test_distributions(self):
+        spec = ("durata = uniform(1, 4)\nampiezza[0] = gauss(-20, 3)\n"
+                "ritmo[1] = sequence(5, 7, 9); posizione = linspace(-8, 8)")
+        records = compile_generator(spec).generate(30, 10.0, 20.0, [1, 3], seed=7)
+        self.assertEqual(len(records), 30)
+        starts = [params['cAttacco'] for params, _ in records]
+        self.assertEqual(starts, sorted(starts))
+        self.assertTrue(all(10.0 <= start <= 20.0 for start in starts))
+        self.assertEqual({track for _, track in records}, {1, 3})
+        self.assertTrue(all(1.0 <= params['durata'] <= 4.0 for params, _ in records))
+        # Le sequenze e linspace seguono l'ordine nel tempo
+        self.assertEqual([params['ritmo'] for params, _ in records[:4]], [[7, 5], [7, 7], [7, 9], [7, 5]])
+        self.assertEqual((records[0][0]['posizione'], records[-1][0]['posizione']), (-8, 8))
+        # I parametri non citati restano quelli di default, e gli interi restano interi
+        self.assertEqual(records[0][0]['frequenza'], [6, 1])
+        self.assertIsInstance(records[0][0]['ampiezza'][0], int)
+        self.assertIsNot(records[0][0]['frequenza'], records[1][0]['frequenza'])
+
+    def test_seed_is_reproducible(self):
+        generator = compile_generator("posizione = walk(0, 2)")
+        self.assertEqual(generator.generate(50, 0, 10, [0], seed=3), generator.generate(50, 0, 10, [0], seed=3))
+
+    def test_invalid_specs(self):
+        for text in ("foo = uniform(1, 2)", "ritmo[5] = 1", "durata += 1", "durata = uniform(1)",
+                     "durata = normal(0, 1)"):
+            with self.assertRaises(QuerySyntaxError, msg=text):
+                compile_generator(text)
+        with self.assertRaises(ValueError):
+            compile_generator("durata = 2").generate(10, 5.0, 1.0, [0])
+
+    def test_parse_tracks(self):
+        self.assertEqual(parse_tracks("", 4), [0, 1, 2, 3])
+        self.assertEqual(parse_tracks("0, 2-3, 2", 8), [0, 2, 3])
+        for text in ("9", "a", "3-1"):
+            with self.assertRaises(ValueError, msg=text):
+                parse_tracks(text, 8)
+
+    def test_generated_clips_are_one_command(self):
+        command = self.window.generate_clips("durata = uniform(1, 2)", 200, 0.0, 30.0, [0, 2], seed=1)
+        clips = self.timeline.clip_items()
+        self.assertEqual(len(clips), 200)
+        self.assertEqual(len(self.window.command_manager._undo_stack), 1)
+        scale = self.timeline.pixels_per_beat * self.timeline.zoom_level
+        for item in command.items[:10]:
+            self.assertAlmostEqual(item.pos().x(), item.params['cAttacco'] * scale)
+            self.assertAlmostEqual(item.rect().width(), item.params['durata'] * scale)
+            self.assertIn(self.timeline.track_at(item.pos().y()), (0, 2))
+
+        self.window.command_manager.undo()
+        self.assertEqual(self.timeline.clip_items(), [])
+        self.window.command_manager.redo()
+        self.assertEqual(len(self.timeline.clip_items()), 200)
+        self.assertEqual(len(self.timeline.param_index), 200)
+
+    def test_redo_keeps_generated_items(self):
+        """I comandi successivi restano validi dopo undo/redo della generazione"""
+        command = self.window.generate_clips("durata = 1", 3, 0.0, 10.0, [0], seed=2)
+        items = list(command.items)
+        item = items[0]
+        old_pos = item.pos()
+        new_pos = QPointF(old_pos.x() + 200, old_pos.y())
+        self.window.command_manager.execute(MoveItemsCommand([item], [old_pos], [new_pos]))
+
+        for _ in range(2):
+            self.window.command_manager.undo()
+        self.assertEqual(self.timeline.clip_items(), [])
+        for _ in range(2):
+            self.window.command_manager.redo()
+        self.assertEqual(set(self.timeline.clip_items()), set(items))
+        self.assertIs(item.scene(), self.timeline)
+        self.assertEqual(item.pos(), new_pos)
+
+        # Anche dopo uno zoom mentre il comando è annullato
+        self.window.command_manager.undo()
+        self.window.command_manager.undo()
+        before = [(clip.pos().x(), clip.rect().width()) for clip in items]
+        self.timeline.scale_scene(2.0)
+        self.window.command_manager.redo()
+        self.assertEqual([(clip.pos().x(), clip.rect().width()) for clip in command.items],
+                         [(x * 2, width * 2) for x, width in before])
+
+    def test_dialog(self):
+        dialog = GenerateDialog(self.window)
+        dialog.count.setValue(12)
+        dialog.tracks.setText("1-2")
+        dialog.seed.setText("5")
+        dialog.accept()
+        clips = [item for item in self.timeline.items() if isinstance(item, MusicItem)]
+        self.assertEqual(len(clips), 12)
+        self.assertTrue(all(item.name == "Gen" for item in clips))
+
+        dialog = GenerateDialog(self.window)
+        dialog.tracks.setText("99")
+        with patch('src.GenerateDialog.QMessageBox.warning') as mock_warning:
+            dialog.accept()
+        mock_warning.assert_called_once()
+        self.assertEqual(len(self.timeline.clip_items()), 12)
+
+    def test_generate_benchmark(self):
+        """Benchmark: generazione e inserimento di 10000 clip"""
+        start = time.perf_counter()
+        records = compile_generator("durata = uniform(1, 4)\nposizione = walk(0, 1)").generate(
+            10000, 0.0, 600.0, list(range(self.timeline.num_tracks)), seed=0)
+        generated = time.perf_counter() - start
+        self.timeline.add_clips(records)
+        inserted = time.perf_counter() - start
+        print(f"\ngenerazione di 10000 clip: {generated * 1000:.1f}ms, con inserimento: {inserted * 1000:.1f}ms")
+        self.assertEqual(len(self.timeline.clip_items()), 10000)
+        self.assertLess(generated, 1.0)
@@ -0,0 +1,146 @@
+# tests/timeline/test_group_drag.py
+import time
+
+from tests.timeline import (
+    BaseTest, Qt, QPointF, QEvent, QMouseEvent, patch
+)
+from PyQt5.QtWidgets import QApplication
+from src.MusicItem import DRAG_FRAME_INTERVAL
+
+
+class GroupDragTest(BaseTest):
+    """Test del trascinamento di gruppo dei clip selezionati"""
+
+    def setUp(self):
+        super().setUp()
+        self.view = self.window.timeline_container.timeline_view
+        self.view.horizontalScrollBar().setValue(0)
+        self.view.verticalScrollBar().setValue(0)
+
+    def send(self, event_type, scene_pos, button, buttons):
+        viewport = self.view.viewport()
+        pos = self.view.mapFromScene(scene_pos)
+        # La scena cerca gli item dalla posizione globale: va passata esplicitamente
+        event = QMouseEvent(event_type, QPointF(pos), QPointF(pos),
+                            QPointF(viewport.mapToGlobal(pos)), button, buttons, Qt.NoModifier)
+        QApplication.sendEvent(self.view.viewport(), event)
+
+    def start_drag(self, item):
+        start = item.sceneBoundingRect().center()
+        self.send(QEvent.MouseButtonPress, start, Qt.LeftButton, Qt.LeftButton)
+        return start
+
+    def move(self, pos):
+        self.send(QEvent.MouseMove, pos, Qt.NoButton, Qt.LeftButton)
+
+    def release(self, pos):
+        self.send(QEvent.MouseButtonRelease, pos, Qt.LeftButton, Qt.NoButton)
+
+    def select_all(self, items):
+        self.timeline.select_items(items)
+
+    def test_group_moves_as_block(self):
+        """Tutta la selezione si sposta dello stesso offset, parametri scritti al rilascio"""
+        items = [self.timeline.add_music_item(i * 4, i % 3, 2, f"Clip{i}", self.window.settings)
+                 for i in range(6)]
+        self.select_all(items)
+        before = [item.pos() for item in items]
+        pps = self.timeline.pixels_per_beat
+        height = self.timeline.track_height
+
+        start = self.start_drag(items[0])
+        end = start + QPointF(2 * pps + 3, height)
+        self.move(end)
+        items[0]._drag.flush()
+        # Durante il trascinamento i parametri non cambiano
+        self.assertEqual(items[1].params['cAttacco'], 4)
+
+        self.release(end)
+        for item, pos in zip(items, before):
+            # Snap alla griglia di 1/16: i 3 pixel in più si perdono
+            self.assertEqual(item.pos(), pos + QPointF(2 * pps, height))
+            self.assertAlmostEqual(item.params['cAttacco'], item.pos().x() / pps, places=3)
+            self.assertEqual(item.track_index, int(item.pos().y() / height))
+            self.assertIsNone(item.parentItem())
+        self.assertIsNone(self.timeline.group_drag)
+
+        # Un solo comando annulla tutto lo spostamento
+        manager = self.window.command_manager
+        self.assertEqual(len(manager._undo_stack), 1)
+        manager.undo()
+        self.assertEqual([item.pos() for item in items], before)
+        self.assertEqual(items[1].params['cAttacco'], 4)
+
+    def test_undo_after_zoom(self):
+        """Il comando di gruppo segue gli item ricreati dallo zoom"""
+        items = [self.timeline.add_music_item(i * 4, 0, 2, f"Clip{i}", self.window.settings)
+                 for i in range(3)]
+        self.select_all(items)
+        start = self.start_drag(items[0])
+        end = start + QPointF(self.timeline.pixels_per_beat, 0)
+        self.move(end)
+        self.release(end)
+
+        self.timeline.scale_scene(2.0)
+        self.window.command_manager.undo()
+        attacks = sorted(item.params['cAttacco'] for item in self.timeline.clip_items())
+        self.assertEqual(attacks, [0, 4, 8])
+        xs = sorted(item.pos().x() for item in self.timeline.clip_items())
+        self.assertEqual(xs, [0, 800, 1600])
+
+    def test_drag_is_clamped(self):
+        """Il gruppo non va prima dell'inizio né fuori dalle tracce"""
+        items = [self.timeline.add_music_item(1 + i, i, 1, f"Clip{i}", self.window.settings)
+                 for i in range(2)]
+        self.select_all(items)
+        start = self.start_drag(items[1])
+        end = start + QPointF(-5000, 5000)
+        self.move(end)
+        self.release(end)
+
+        self.assertEqual(items[0].pos().x(), 0)
+        self.assertEqual(items[1].pos().x() - items[0].pos().x(), self.timeline.pixels_per_beat)
+        self.assertEqual(items[1].track_index, self.timeline.num_tracks - 1)
+        self.assertEqual(items[0].track_index, self.timeline.num_tracks - 2)
+
+    def test_moves_coalesced_per_frame(self):
+        """Molti movimenti nello stesso frame producono un solo aggiornamento"""
+        item = self.timeline.add_music_item(0, 0, 2, "Clip", self.window.settings)
+        start = self.start_drag(item)
+        for i in range(1, 100):
+            self.move(start + QPointF(i * 10, 0))
+        drag = item._drag
+        self.assertEqual(drag.updates, 0)
+
+        time.sleep(DRAG_FRAME_INTERVAL * 2 / 1000)
+        self.app.processEvents()
+        self.assertEqual(drag.updates, 1)
+        self.assertEqual(drag.offset.x(), 990 - 990 % (self.timeline.pixels_per_beat / 16))
+
+    def test_large_group_frame_time(self):
+        """Benchmark: 1000 clip selezionati restano sotto i 16ms per frame"""
+        items = [self.timeline.add_music_item(i, i % 8, 1, f"Clip{i}", self.window.settings)
+                 for i in range(1000)]
+        self.select_all(items)
+        pps = self.timeline.pixels_per_beat
+
+        start = self.start_drag(items[0])
+        frames = 60
+        with patch.object(self.timeline, 'move_items', wraps=self.timeline.move_items) as mock_move:
+            # Il primo movimento crea il gruppo: il reparenting dei clip non entra nella media
+            self.move(start + QPointF(pps / 8, 0))
+            drag = items[0]._drag
+            drag.flush()
+            start_time = time.perf_counter()
+            for i in range(2, frames + 2):
+                self.move(start + QPointF(i * pps / 8, 0))
+                drag.flush()  # Un frame
+            frame_time = (time.perf_counter() - start_time) / frames
+            # Durante il trascinamento si sposta solo il contenitore
+            self.assertEqual(drag.updates, frames + 1)
+            self.assertEqual(mock_move.call_count, 0)
+            self.release(start)
+        self.assertTrue(mock_move.called)
+
+        print(f"\ntrascinamento di 1000 clip: {frame_time * 1000:.2f} ms per frame")
+        self.assertLess(frame_time, 1 / 60)
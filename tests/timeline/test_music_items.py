@@ -1,10 +1,12 @@
 # tests/timeline/test_music_items.py
+import sys
 from tests.timeline import (
     BaseTest,
     QColor
 
 )
 from src.MusicItem import MusicItem
+from src.Params import ClipParams, default_params
 class MusicItemTest(BaseTest):
     """Test specifici per gli item musicali"""
 
@@ -83,4 +85,107 @@ class MusicItemTest(BaseTest):
         initial_delta = abs(item2.pos().x() - item1.pos().x())
         item1.setPos(item1.pos().x() + 100, item1.pos().y())
         new_delta = abs(item2.pos().x() - item1.pos().x())
-        self.assertAlmostEqual(initial_delta, new_delta, places=1)
\ No newline at end of file
+        self.assertAlmostEqual(initial_delta, new_delta, places=1)
+
+    def test_paint_has_no_side_effects(self):
+        """Il paint usa i brush precalcolati senza modificare l'item"""
+        from unittest.mock import patch
+        from PyQt5.QtGui import QImage, QPainter
+        from PyQt5.QtWidgets import QStyleOptionGraphicsItem
+
+        item = self.timeline.add_music_item(0, 0, 3, "Test", self.window.settings)
+        other = self.timeline.add_music_item(4, 0, 3, "Test2", self.window.settings)
+        # Stesso colore -> stessi brush condivisi
+        self.assertIs(item._brushes, other._brushes)
+
+        image = QImage(400, 100, QImage.Format_ARGB32)
+        painter = QPainter(image)
+        option = QStyleOptionGraphicsItem()
+        brush = item.brush()
+        try:
+            with patch.object(item, 'setBrush') as mock_set_brush, \
+                 patch.object(item, 'update') as mock_update:
+                for selected, hovered, highlighted in [(False, False, False), (True, False, False),
+                                                       (False, True, False), (False, False, True)]:
+                    item.setSelected(selected)
+                    item.is_hovered = hovered
+                    item.highlighted = highlighted
+                    item.paint(painter, option, None)
+                mock_set_brush.assert_not_called()
+                mock_update.assert_not_called()
+        finally:
+            painter.end()
+        self.assertEqual(item.brush(), brush)
+
+        # Cambiare colore ricalcola i brush
+        item.color = QColor(10, 20, 30)
+        self.assertEqual(item.brush().color(), QColor(10, 20, 30))
+        self.assertEqual(item._brushes[2].color(), QColor(10, 20, 30).lighter(140))
+
+    def test_elided_label(self):
+        """L'etichetta è disegnata dal clip ed elisa alla sua larghezza"""
+        from src.MusicItem import elided_label, font_metrics
+        from PyQt5.QtGui import QImage, QPainter
+        from PyQt5.QtWidgets import QStyleOptionGraphicsItem
+
+        long_name = "Comportamento con un nome molto lungo " * 4
+        item = self.timeline.add_music_item(0, 0, 1, long_name, self.window.settings)
+        # Nessun QGraphicsTextItem figlio
+        self.assertEqual(item.childItems(), [])
+        self.assertEqual(item.text.toPlainText(), long_name)
+
+        # updateHeight non riscrive il testo, lo ridimensiona soltanto
+        item.updateHeight(80)
+        self.assertEqual(item.text.toPlainText(), long_name)
+
+        font = item.text.font()
+        available = item.rect().width() - 10
+        label = elided_label(long_name, available, font)
+        self.assertLess(len(label.text()), len(long_name))
+        self.assertLessEqual(font_metrics(font).horizontalAdvance(label.text()), available)
+        # Stessa chiave (testo, larghezza, font) -> stesso oggetto in cache
+        self.assertIs(label, elided_label(long_name, available, font))
+
+        # Il paint disegna il testo dentro il clip
+        image = QImage(int(item.rect().width()), int(item.rect().height()), QImage.Format_ARGB32)
+        image.fill(0)
+        painter = QPainter(image)
+        item.paint(painter, QStyleOptionGraphicsItem(), None)
+        painter.end()
+        text_color = item.text.defaultTextColor().rgb()
+        self.assertTrue(any(image.pixel(x, y) == text_color
+                            for x in range(image.width()) for y in range(image.height())))
+
+        # Rinominare aggiorna l'etichetta
+        item.name = "Nuovo"
+        self.assertEqual(item.text.toPlainText(), "Nuovo")
+
+    def test_clip_params_record(self):
+        """I parametri sono un record a slot che si usa come un dizionario"""
+        item = self.timeline.add_music_item(2, 0, 3, "Test", self.window.settings)
+        params = item.params
+        self.assertFalse(hasattr(params, '__dict__'))
+        self.assertEqual(params.durata, 3.0)
+        self.assertEqual(params, {**default_params(), 'cAttacco': 2, 'durata': 3.0})
+        self.assertEqual(list(params)[:2], ['cAttacco', 'durataArmonica'])  # Ordine canonico
+
+        # Chiavi extra e chiavi mancanti
+        params['nota'] = 'GEN06'
+        self.assertEqual(params.get('nota'), 'GEN06')
+        self.assertEqual(list(params)[-1], 'nota')
+        del params['posizione']
+        self.assertNotIn('posizione', params)
+        self.assertIsNone(params.get('posizione'))
+        with self.assertRaises(KeyError):
+            params['posizione']
+        with self.assertRaises(AttributeError):
+            params.colore = 1
+
+        # Anche la scrittura come attributo aggiorna l'indice
+        params.ritmo = [5, 9]
+        self.assertEqual(self.timeline.param_index.find('ritmo', [5, 9]), [item])
+
+    def test_clip_params_memory(self):
+        """Il record occupa molto meno di un dizionario con gli stessi valori"""
+        values = default_params()
+        self.assertLess(sys.getsizeof(ClipParams(values)) * 2, sys.getsizeof(dict(values)))
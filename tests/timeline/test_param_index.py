@@ -0,0 +1,112 @@
+# tests/timeline/test_param_index.py
+import copy
+import time
+from tests.timeline import (
+    BaseTest, patch
+)
+from src.ParamIndex import ParamIndex, param_keys
+from src.Params import ClipParams
+
+
+class ParamIndexTest(BaseTest):
+    """Test dell'indice dei parametri usato dalla ricerca"""
+
+    def add_clips(self, count):
+        items = []
+        for i in range(count):
+            item = self.timeline.add_music_item(i * 2, i % self.timeline.num_tracks, 3,
+                                                f"Clip{i}", self.window.settings)
+            item.params['ritmo'] = [i % 10, 15]
+            item.params['posizione'] = i % 7
+            items.append(item)
+        return items
+
+    def test_param_keys(self):
+        """Scalari e posizioni degli elementi delle liste diventano chiavi"""
+        keys = param_keys({'durata': 5, 'ritmo': [7, 15], 'frequenza': [[1, 2]], 'nome': 'GEN06'})
+        self.assertEqual(keys, {'durata': 5.0, 'ritmo[0]': 7.0, 'ritmo[1]': 15.0,
+                                'frequenza[0][0]': 1.0, 'frequenza[0][1]': 2.0})
+
+    def test_queries(self):
+        """Uguaglianza, intervallo e valore più vicino"""
+        items = self.add_clips(30)
+        index = self.timeline.param_index
+
+        self.assertEqual(set(index.equal('posizione', 3)), {i for i in items if i.params['posizione'] == 3})
+        self.assertEqual(set(index.in_range('ritmo[0]', 2, 4)),
+                         {i for i in items if 2 <= i.params['ritmo'][0] <= 4})
+        self.assertEqual(index.nearest('cAttacco', 7.9), [items[4]])
+        self.assertEqual(index.values('ritmo[1]'), [15.0] * 30)
+        self.assertEqual(index.in_range('missing', 0, 1), [])
+
+    def test_incremental_updates(self):
+        """Modifiche, aggiunte e rimozioni non ricostruiscono l'indice"""
+        items = self.add_clips(10)
+        index = self.timeline.param_index
+        self.assertEqual(len(index), 10)
+        rebuilds = index.rebuild_count
+
+        items[0].params['durata'] = 42.0
+        items[1].params = dict(items[1].params, posizione=99)
+        self.timeline.removeItem(items[2])
+        extra = self.timeline.add_music_item(100, 0, 3, "Extra", self.window.settings)
+
+        self.assertEqual(index.equal('durata', 42), [items[0]])
+        self.assertEqual(index.equal('posizione', 99), [items[1]])
+        self.assertNotIn(items[2], index.in_range('cAttacco'))
+        self.assertIn(extra, index.equal('cAttacco', 100))
+        self.assertEqual(len(index), 10)
+        self.assertEqual(index.rebuild_count, rebuilds)
+
+        # clear() distrugge gli item senza notifiche: ricostruzione completa
+        self.timeline.clear()
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.rebuild_count, rebuilds + 1)
+
+    def test_find_lists(self):
+        """Le liste si confrontano elemento per elemento, con la stessa lunghezza"""
+        items = self.add_clips(10)
+        items[3].params['ritmo'] = [3, 15, 1]
+        found = self.timeline.param_index.find('ritmo', [3, 15.0004])
+        self.assertEqual(found, [])
+        found = self.timeline.param_index.find('ritmo', [5, 15.0004])
+        self.assertEqual(found, [items[5]])
+
+    def test_clip_params_copies(self):
+        """Le copie dei parametri sono dizionari normali"""
+        calls = []
+        params = ClipParams({'durata': 1.0}, on_change=lambda: calls.append(1))
+        params['durata'] = 2.0
+        params.update(posizione=3)
+        self.assertEqual(len(calls), 2)
+        self.assertIs(type(params.copy()), dict)
+        self.assertIs(type(copy.deepcopy(params)), dict)
+
+    def test_search_uses_index(self):
+        """perform_search interroga l'indice invece di scandire la scena"""
+        items = self.add_clips(20)
+        self.window.search_param.setCurrentText('posizione')
+        self.window.search_value.setText('2')
+        self.window.perform_search()
+        self.assertEqual({i for i in items if i.highlighted}, {i for i in items if i.params['posizione'] == 2})
+
+        # Niente eval: un'espressione è un valore non valido, non codice
+        self.window.search_value.setText('[__import__("os").getcwd()]')
+        with patch('src.MainWindow.QMessageBox.warning') as mock_warning:
+            self.window.perform_search()
+        mock_warning.assert_called_once()
+
+    def test_query_benchmark(self):
+        """Benchmark: 1000 query su 5000 clip"""
+        index = ParamIndex(lambda: clips)
+        clips = [type('Clip', (), {'params': {'cAttacco': i * 0.5, 'ritmo': [i % 13, 15]}})()
+                 for i in range(5000)]
+        index.in_range('cAttacco')
+
+        start = time.perf_counter()
+        for i in range(1000):
+            index.equal('ritmo[0]', i % 13)
+            index.in_range('cAttacco', i, i + 10)
+        elapsed = time.perf_counter() - start
+        print(f"\n1000 query su 5000 clip: {elapsed * 1000:.1f}ms")
+        self.assertLess(elapsed, 1.0)
@@ -0,0 +1,129 @@
+# tests/timeline/test_section_transforms.py
+import time
+import numpy as np
+from tests.timeline import BaseTest, patch
+from PyQt5.QtWidgets import QMessageBox
+from src.Transforms import stretch, quantize, insert_time, delete_time, apply_transform
+from src.TransformDialog import TransformDialog
+
+
+class SectionTransformsTest(BaseTest):
+    """Test di stretch, quantizzazione, ripple e spostamento di tracce"""
+
+    def setUp(self):
+        self.patcher = patch('PyQt5.QtWidgets.QMessageBox.question', return_value=QMessageBox.No)
+        self.patcher.start()
+        super().setUp()
+        self.scale = self.timeline.pixels_per_beat * self.timeline.zoom_level
+        # Inizi 0, 4, 8, 12 (durata 2) su tracce 0, 1, 2, 0
+        self.items = [self.timeline.add_music_item(i * 4, i % 3, 2, f"Clip{i}", self.window.settings)
+                      for i in range(4)]
+
+    def tearDown(self):
+        self.patcher.stop()
+        super().tearDown()
+
+    def state(self, item):
+        return (round(item.pos().x() / self.scale, 6), round(item.rect().width() / self.scale, 6),
+                self.timeline.track_at(item.pos().y()))
+
+    def test_stretch(self):
+        """Dentro l'intervallo si scala, dopo si scorre, prima resta tutto uguale"""
+        starts, durations = stretch(np.array([0.0, 4.0, 9.0, 12.0]), np.array([2.0, 2.0, 2.0, 2.0]),
+                                    4.0, 10.0, 2.0)
+        self.assertEqual(starts.tolist(), [0.0, 4.0, 14.0, 18.0])
+        # Il clip a cavallo della fine si allunga solo per la parte dentro
+        self.assertEqual(durations.tolist(), [2.0, 4.0, 3.0, 2.0])
+        with self.assertRaises(ValueError):
+            stretch(starts, durations, 5.0, 5.0, 2.0)
+
+    def test_quantize(self):
+        starts, durations = quantize(np.array([0.1, 1.3]), np.array([0.05, 0.74]), 0.5)
+        self.assertEqual(starts.tolist(), [0.0, 1.5])
+        self.assertEqual(durations.tolist(), [0.5, 0.5])  # Mai sotto una cella
+        starts, durations = quantize(np.array([0.1]), np.array([0.74]), 0.5, durations_=False)
+        self.assertEqual(durations.tolist(), [0.74])
+
+    def test_ripple_insert_and_delete(self):
+        starts = np.array([0.0, 4.0, 5.0, 12.0])
+        durations = np.array([5.0, 2.0, 1.0, 2.0])
+        self.assertEqual(insert_time(starts, durations, 4.0, 3.0)[0].tolist(), [0.0, 7.0, 8.0, 15.0])
+        new_starts, new_durations = delete_time(starts, durations, 3.0, 8.0)
+        self.assertEqual(new_starts.tolist(), [0.0, 3.0, 3.0, 7.0])
+        # Il primo clip viene accorciato, quelli interamente dentro conservano la durata
+        self.assertEqual(new_durations.tolist(), [3.0, 2.0, 1.0, 2.0])
+
+    def test_shift_tracks_clamped(self):
+        _, _, tracks = apply_transform('shift_tracks', [0, 0], [1, 1], [0, 7], 8, offset=2)
+        self.assertEqual(tracks.tolist(), [2, 7])
+        with self.assertRaises(ValueError):
+            apply_transform('mirror', [0], [1], [0], 8)
+
+    def test_stretch_is_one_undoable_command(self):
+        before = [self.state(item) for item in self.items]
+        command = self.window.transform_clips('stretch', self.items, start=4.0, end=8.0, factor=1.5)
+        self.assertEqual(len(self.window.command_manager._undo_stack), 1)
+        # Il primo clip è prima dell'intervallo: non fa parte del comando
+        self.assertEqual(len(command.items), 3)
+        self.assertEqual([self.state(item)[:2] for item in self.items],
+                         [(0.0, 2.0), (4.0, 3.0), (10.0, 2.0), (14.0, 2.0)])
+        self.assertEqual(self.items[2].params['cAttacco'], 10.0)
+        self.assertEqual(self.items[1].params['durata'], 3.0)
+
+        self.window.command_manager.undo()
+        self.assertEqual([self.state(item) for item in self.items], before)
+        self.assertEqual(self.items[2].params['cAttacco'], 8)
+
+        # Nessun cambiamento: nessun comando
+        self.assertIsNone(self.window.transform_clips('quantize', self.items, grid=1.0))
+
+    def test_shift_tracks_command(self):
+        self.window.transform_clips('shift_tracks', self.items[:2], offset=1)
+        self.assertEqual([self.state(item)[2] for item in self.items], [1, 2, 2, 0])
+        self.window.command_manager.undo()
+        self.assertEqual([self.state(item)[2] for item in self.items], [0, 1, 2, 0])
+
+    def test_list_params_keep_other_elements(self):
+        self.items[3].params['cAttacco'] = [12, 99]
+        self.window.transform_clips('insert', self.items, start=10.0, amount=1.0)
+        self.assertEqual(self.items[3].params['cAttacco'], [13.0, 99])
+
+    def test_dialog_preview(self):
+        """L'anteprima segue le opzioni e sparisce alla chiusura"""
+        dialog = TransformDialog(self.window)
+        self.assertEqual(dialog.target.currentText(), 'All clips')
+        self.assertEqual(dialog.options['end'].value(), 14.0)
+        dialog.operation.setCurrentIndex(dialog.operation.findData('insert'))
+        self.assertFalse(dialog.options['factor'].isVisibleTo(dialog))
+        dialog.options['start'].setValue(6.0)
+        dialog.options['amount'].setValue(2.0)
+        self.assertEqual(dialog.count_label.text(), "2 clip")
+        self.assertEqual(sorted(rect.x() / self.scale for rect in self.timeline.preview_rects), [10.0, 14.0])
+        # L'anteprima non tocca i clip
+        self.assertEqual(self.state(self.items[2])[0], 8.0)
+
+        dialog.accept()
+        self.assertEqual(self.timeline.preview_rects, [])
+        self.assertEqual(self.state(self.items[2])[0], 10.0)
+
+        dialog = TransformDialog(self.window)
+        dialog.operation.setCurrentIndex(dialog.operation.findData('delete'))
+        dialog.options['start'].setValue(5.0)
+        dialog.options['end'].setValue(5.0)
+        self.assertIn("start < end", dialog.count_label.text())
+        with patch('src.TransformDialog.QMessageBox.warning') as mock_warning:
+            dialog.accept()
+        mock_warning.assert_called_once()
+        dialog.reject()
+        self.assertEqual(self.timeline.preview_rects, [])
+
+    def test_transform_benchmark(self):
+        """Benchmark: stretch di 10000 clip in un solo passaggio"""
+        starts = np.arange(10000) * 0.5
+        durations = np.full(10000, 2.0)
+        tracks = np.arange(10000) % 8
+        start = time.perf_counter()
+        apply_transform('stretch', starts, durations, tracks, 8, start=100.0, end=3000.0, factor=1.25)
+        elapsed = time.perf_counter() - start
+        print(f"\nstretch di 10000 clip: {elapsed * 1000:.2f}ms")
+        self.assertLess(elapsed, 0.5)
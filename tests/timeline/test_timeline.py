@@ -4,7 +4,6 @@ from tests.timeline import (
 )
 from src.Timeline import Timeline
 from src.MusicItem import MusicItem
-from src.Timeline import TrackItem
 class TimelineTest(BaseTest):
 
     def test_scene_rect_update(self):
@@ -28,9 +27,7 @@ class TimelineTest(BaseTest):
         try:
             self.window.settings.set('track_background_color', new_color)
             self.timeline.draw_tracks()
-            track_items = [item for item in self.timeline.items() if isinstance(item, TrackItem)]
-            self.assertTrue(len(track_items) > 0)
-            self.assertEqual(track_items[0].base_color.name().upper(), new_color.upper())
+            self.assertEqual(self.timeline.track_brush.color().name().upper(), new_color.upper())
         finally:
             self.timeline.num_tracks = initial_tracks
             self.timeline.draw_tracks()
@@ -83,4 +80,45 @@ class TimelineTest(BaseTest):
         self.assertEqual(
             len(container.track_header_view.scene.header_items),
             initial_tracks + 1
-        )
\ No newline at end of file
+        )
+
+    def test_tracks_drawn_in_background(self):
+        """Le tracce non sono item: sfondo e griglia li disegna drawBackground"""
+        from PyQt5.QtGui import QImage, QPainter, QColor
+        from PyQt5.QtCore import QRectF
+        from src.MusicItem import MusicItem
+
+        self.timeline.num_tracks += 20
+        self.timeline.draw_tracks()
+        self.assertFalse([item for item in self.timeline.items() if not isinstance(item, MusicItem)])
+
+        # Hit test delle tracce
+        track_height = self.timeline.track_height
+        self.assertEqual(self.timeline.track_at(0), 0)
+        self.assertEqual(self.timeline.track_at(track_height * 2.5), 2)
+        self.assertIsNone(self.timeline.track_at(-1))
+        self.assertIsNone(self.timeline.track_at(track_height * self.timeline.num_tracks))
+
+        # Cambiare colore non ricrea la scena
+        item = self.timeline.add_music_item(0, 0, 3, "Test", self.window.settings)
+        self.window.settings.set('track_background_color', '#00FF00')
+        self.assertIs(item.scene(), self.timeline)
+
+        rect = QRectF(0, 0, 120, track_height * 2)
+        image = QImage(int(rect.width()), int(rect.height()), QImage.Format_ARGB32)
+        image.fill(0)
+        painter = QPainter(image)
+        self.timeline.drawBackground(painter, rect)
+        painter.end()
+        self.assertEqual(QColor(image.pixel(int(rect.width()) - 5, track_height + 10)).name(), '#00ff00')
+        # Bordo tra le tracce
+        self.assertEqual(QColor(image.pixel(int(rect.width()) - 5, track_height)).name(), '#000000')
+
+        # Griglia: linee principali ogni beat, suddivisioni fino alla griglia di snap
+        major, minor = self.timeline.grid_spacing()
+        self.assertEqual(major, self.timeline.pixels_per_beat * self.timeline.zoom_level)
+        self.assertGreaterEqual(minor, self.timeline.min_grid_spacing)
+        self.timeline.scale_scene(0.01)
+        major, minor = self.timeline.grid_spacing()
+        self.assertGreaterEqual(major, self.timeline.min_grid_spacing)
+        self.assertIsNone(minor)
@@ -232,4 +232,62 @@ class TimelineContainerTest(BaseTest):
                 header_view.verticalScrollBar().value(),
                 timeline_view.verticalScrollBar().value(),
                 f"Scroll mismatch at value {value}"
-            )
\ No newline at end of file
+            )
+
+    def test_single_connection_per_scrollbar_pair(self):
+        """Ogni coppia di scrollbar è collegata una volta sola"""
+        container = self.window.timeline_container
+        controller = container.sync_controller
+        self.assertEqual(len(controller.pairs), 2)
+
+        # Richiamare setup/inizializzazione o cambiare zoom e tracce non aggiunge connessioni
+        container.setup_connections()
+        container.initialize_views()
+        self.timeline.initialize_components()
+        self.timeline.scale_scene(1.5)
+        self.timeline.scale_track_height(1.5)
+        QApplication.processEvents()
+        self.assertEqual(len(controller.pairs), 2)
+
+        # Uno scroll produce un solo aggiornamento del ruler
+        ruler_scroll = container.ruler_view.horizontalScrollBar()
+        changes = []
+        ruler_scroll.valueChanged.connect(changes.append)
+        container.timeline_view.horizontalScrollBar().setValue(120)
+        self.assertEqual(changes, [120])
+
+    def test_sync_without_event_loop(self):
+        """Le scrollbar sono sincronizzate già alla fine del costruttore"""
+        from src.Timeline import Timeline
+        container = TimelineContainer(Timeline(self.window.settings))
+        timeline_scroll = container.timeline_view.horizontalScrollBar()
+        ruler_scroll = container.ruler_view.horizontalScrollBar()
+        timeline_scroll.setRange(0, 500)
+        self.assertEqual(ruler_scroll.maximum(), 500)
+
+        timeline_scroll.setValue(42)
+        self.assertEqual(ruler_scroll.value(), 42)
+        ruler_scroll.setValue(10)
+        self.assertEqual(timeline_scroll.value(), 10)
+        container.deleteLater()
+
+    def test_unlinked_on_close_and_destroy(self):
+        """Chiusura e distruzione del controller sciolgono i collegamenti delle scrollbar"""
+        from PyQt5 import sip
+        from src.Timeline import Timeline
+        container = TimelineContainer(Timeline(self.window.settings))
+        timeline_scroll = container.timeline_view.horizontalScrollBar()
+        ruler_scroll = container.ruler_view.horizontalScrollBar()
+        timeline_scroll.setRange(0, 500)
+        container.close()
+        self.assertEqual(container.sync_controller.pairs, [])
+        timeline_scroll.setValue(42)
+        self.assertEqual(ruler_scroll.value(), 0)
+
+        container.sync_controller.link(timeline_scroll, ruler_scroll)
+        timeline_scroll.setValue(50)
+        self.assertEqual(ruler_scroll.value(), 50)
+        sip.delete(container.sync_controller)
+        timeline_scroll.setValue(60)
+        self.assertEqual(ruler_scroll.value(), 50)
+        container.deleteLater()
@@ -0,0 +1,65 @@
+# tests/timeline/test_timeline_lod.py
+from tests.timeline import (
+    BaseTest, patch,
+    QRectF, QColor
+)
+from PyQt5.QtGui import QImage, QPainter, QTransform
+from PyQt5.QtWidgets import QStyleOptionGraphicsItem
+from src.Timeline import DENSITY_ZOOM, DENSITY_COLOR
+
+
+class TimelineLevelOfDetailTest(BaseTest):
+    """Test del disegno semplificato a zoom ridotto"""
+
+    def paint_item(self, item, scale=1.0):
+        image = QImage(200, 100, QImage.Format_ARGB32)
+        image.fill(0)
+        painter = QPainter(image)
+        painter.setWorldTransform(QTransform.fromScale(scale, scale))
+        try:
+            item.paint(painter, QStyleOptionGraphicsItem(), None)
+        finally:
+            painter.end()
+        return image
+
+    def test_label_skipped_for_narrow_clips(self):
+        """Sotto le soglie di LOD niente etichetta né bordi"""
+        item = self.timeline.add_music_item(0, 0, 3, "Test", self.window.settings)
+        item.setSelected(True)
+
+        with patch.object(item.text, 'paint') as mock_label:
+            self.paint_item(item)
+            self.assertEqual(mock_label.call_count, 1)
+
+            # Lo stesso clip visto a 1/100: pochi pixel sullo schermo
+            self.paint_item(item, scale=0.01)
+            self.assertEqual(mock_label.call_count, 1)
+
+        with patch('PyQt5.QtGui.QPainter.drawRect') as mock_draw_rect:
+            self.paint_item(item, scale=0.01)
+            mock_draw_rect.assert_not_called()
+
+    def test_density_bars_at_extreme_zoom_out(self):
+        """A zoom estremo la timeline disegna le barre di densità"""
+        for i in range(20):
+            self.timeline.add_music_item(i * 5, 1, 5, f"Clip{i}", self.window.settings)
+        self.assertFalse(self.timeline.density_mode)
+
+        self.timeline.scale_scene(DENSITY_ZOOM / 2)
+        self.assertTrue(self.timeline.density_mode)
+
+        # I clip non si disegnano più da soli
+        item = next(i for i in self.timeline.items() if hasattr(i, 'params'))
+        self.assertTrue(self.paint_item(item).allGray())
+
+        rect = QRectF(0, 0, 100, self.timeline.sceneRect().height())
+        image = QImage(int(rect.width()), int(rect.height()), QImage.Format_ARGB32)
+        image.fill(0)
+        painter = QPainter(image)
+        self.timeline.draw_density(painter, rect)
+        painter.end()
+
+        # Barra piena sulla traccia 1, traccia 0 vuota
+        track_height = self.timeline.track_height
+        self.assertEqual(QColor(image.pixel(5, int(track_height * 1.9))), DENSITY_COLOR)
+        self.assertEqual(image.pixel(5, int(track_height * 0.9)), 0)
@@ -0,0 +1,66 @@
+# tests/timeline/test_timeline_minimap.py
+from tests.timeline import (
+    BaseTest, QTest, Qt, QColor
+)
+from PyQt5.QtCore import QPoint
+
+
+class TimelineMinimapTest(BaseTest):
+    """Test della panoramica della timeline"""
+
+    def setUp(self):
+        super().setUp()
+        self.window.resize(1000, 600)
+        self.window.show()
+        for _ in range(3):  # Attende che il layout assesti le dimensioni
+            self.app.processEvents()
+        self.minimap = self.window.timeline_container.minimap
+        self.view = self.window.timeline_container.timeline_view
+
+    def clip_pixel(self, item):
+        center = self.minimap.scene_transform().map(item.sceneBoundingRect().center())
+        return QColor(self.minimap.render_image().pixel(int(center.x()), int(center.y())))
+
+    def test_clips_drawn_in_minimap(self):
+        """I clip compaiono nell'immagine ridotta con il loro colore"""
+        item = self.timeline.add_music_item(2, 1, 5, "Test", self.window.settings)
+        item.color = QColor(200, 30, 30)
+        self.app.processEvents()  # scene.changed è emesso dall'event loop
+        self.assertEqual(self.clip_pixel(item), QColor(200, 30, 30))
+
+    def test_incremental_update(self):
+        """Un clip aggiunto aggiorna solo la sua regione, senza ricostruire"""
+        self.minimap.render_image()
+        rebuilds = self.minimap.rebuild_count
+
+        item = self.timeline.add_music_item(4, 2, 3, "New", self.window.settings)
+        item.color = QColor(20, 180, 40)
+        self.app.processEvents()
+
+        self.assertEqual(self.clip_pixel(item), QColor(20, 180, 40))
+        self.assertEqual(self.minimap.rebuild_count, rebuilds)
+
+        # Spostato il clip, la vecchia posizione torna vuota
+        old_center = self.minimap.scene_transform().map(item.sceneBoundingRect().center())
+        item.setPos(item.pos().x() + 800, item.pos().y())
+        self.app.processEvents()
+        image = self.minimap.render_image()
+        self.assertNotEqual(QColor(image.pixel(int(old_center.x()), int(old_center.y()))),
+                            QColor(20, 180, 40))
+        self.assertEqual(self.clip_pixel(item), QColor(20, 180, 40))
+
+    def test_click_to_jump(self):
+        """Un click sulla panoramica sposta la vista senza cambiare lo zoom"""
+        self.timeline.setSceneRect(0, 0, 20000, self.timeline.sceneRect().height())
+        self.app.processEvents()
+        zoom = self.timeline.zoom_level
+        scrollbar = self.view.horizontalScrollBar()
+        scrollbar.setValue(0)
+
+        target = QPoint(int(self.minimap.width() * 0.75), self.minimap.height() // 2)
+        QTest.mouseClick(self.minimap, Qt.LeftButton, pos=target)
+
+        self.assertGreater(scrollbar.value(), 0)
+        self.assertEqual(self.timeline.zoom_level, zoom)
+        # Il rettangolo visibile è centrato sul punto cliccato
+        self.assertAlmostEqual(self.minimap.viewport_rect().center().x(), target.x(), delta=2)
@@ -0,0 +1,89 @@
+# tests/timeline/test_timeline_selection.py
+from tests.timeline import (
+    BaseTest, QRectF
+)
+
+
+class TimelineSelectionTest(BaseTest):
+    """Test della selezione in blocco tramite l'indice dei clip"""
+
+    def setUp(self):
+        super().setUp()
+        # Un clip da 2s ogni 4s, alternando le tracce 0..3
+        self.items = [
+            self.timeline.add_music_item(i * 4, i % 4, 2, f"Clip{i}", self.window.settings)
+            for i in range(40)
+        ]
+        for i, item in enumerate(self.items):
+            item.params['ampiezza'] = -float(i)
+        self.notifications = []
+        self.timeline.selectionChanged.connect(lambda: self.notifications.append(1))
+
+    def selected(self):
+        return {item.name for item in self.timeline.selectedItems()}
+
+    def test_select_time_range(self):
+        """Seleziona i clip che si sovrappongono all'intervallo"""
+        self.timeline.select_time_range(5, 13)
+        # Clip1 [4,6), Clip2 [8,10), Clip3 [12,14)
+        self.assertEqual(self.selected(), {"Clip1", "Clip2", "Clip3"})
+
+        # Gli estremi che si toccano non contano
+        self.timeline.select_time_range(6, 8)
+        self.assertEqual(self.selected(), set())
+
+        self.timeline.select_time_range(0, 40, tracks={1})
+        self.assertEqual(self.selected(), {"Clip1", "Clip5", "Clip9"})
+
+    def test_select_tracks_and_predicate(self):
+        """Selezione per tracce e per predicato sui parametri"""
+        self.timeline.select_tracks({2, 3})
+        self.assertEqual(len(self.selected()), 20)
+
+        self.timeline.select_where(lambda params: params['ampiezza'] <= -35)
+        self.assertEqual(self.selected(), {f"Clip{i}" for i in range(35, 40)})
+
+        # extend aggiunge alla selezione esistente
+        self.timeline.select_where(lambda params: params['ampiezza'] == 0, extend=True)
+        self.assertEqual(len(self.selected()), 6)
+
+    def test_single_notification(self):
+        """Una sola notifica selectionChanged per operazione"""
+        for _ in range(1000):
+            self.timeline.add_music_item(200, 5, 1, "Extra", self.window.settings)
+        self.notifications.clear()
+
+        items = self.timeline.select_time_range(0, 300)
+        self.assertEqual(len(items), 1040)
+        self.assertEqual(len(self.notifications), 1)
+
+        # Nessun cambiamento, nessuna notifica
+        self.timeline.select_time_range(0, 300)
+        self.assertEqual(len(self.notifications), 1)
+
+    def test_index_follows_changes(self):
+        """L'indice segue spostamenti, ridimensionamenti e rimozioni"""
+        item = self.items[0]
+        item.setPos(1000 * self.timeline.pixels_per_beat, item.pos().y())
+        self.timeline.select_time_range(999, 1001)
+        self.assertEqual(self.selected(), {"Clip0"})
+
+        item.durata = 50
+        self.timeline.select_time_range(1040, 1041)
+        self.assertEqual(self.selected(), {"Clip0"})
+
+        self.timeline.removeItem(item)
+        self.timeline.select_time_range(999, 1100)
+        self.assertEqual(self.selected(), set())
+
+        # Dopo uno zoom gli item sono ricreati: l'indice non contiene item distrutti
+        self.timeline.scale_scene(2.0)
+        self.timeline.select_time_range(5, 13)
+        self.assertEqual(self.selected(), {"Clip1", "Clip2", "Clip3"})
+
+    def test_select_rect(self):
+        """Il rettangolo seleziona solo i clip che interseca, anche in verticale"""
+        height = self.timeline.track_height
+        pps = self.timeline.pixels_per_beat
+        self.timeline.select_rect(QRectF(0, 0, 10 * pps, height * 1.5))
+        self.assertEqual(self.selected(), {"Clip0", "Clip1"})
@@ -0,0 +1,81 @@
+# tests/timeline/test_timeline_snapping.py
+import time
+
+from tests.timeline import (
+    BaseTest, QPointF, patch
+)
+from src.MusicItem import GroupDrag
+from src.Timeline import SNAP_DISTANCE
+
+
+class TimelineSnappingTest(BaseTest):
+    """Test dello snap magnetico ai bordi dei clip e al righello"""
+
+    def drag(self, item, delta):
+        origin = item.sceneBoundingRect().center()
+        drag = GroupDrag(self.timeline, item, [item], origin)
+        drag.move_to(origin + delta)
+        drag.finish()
+
+    def test_nearest_edge(self):
+        """Ricerca del bordo più vicino con tolleranza ed esclusioni"""
+        a = self.timeline.add_music_item(1, 0, 2.03, "A", self.window.settings)   # 100 - 303
+        b = self.timeline.add_music_item(5, 1, 1, "B", self.window.settings)      # 500 - 600
+        index = self.timeline.clip_index
+
+        self.assertEqual(index.nearest_edge(306, 8), 303)
+        self.assertEqual(index.nearest_edge(495, 8), 500)
+        self.assertIsNone(index.nearest_edge(400, 8))
+        self.assertIsNone(index.nearest_edge(306, 8, exclude={a}))
+        self.assertEqual(index.nearest_edge(598, 8, exclude={a}), 600)
+
+    def test_snap_to_clip_end(self):
+        """Un clip trascinato vicino alla fine di un altro vi si aggancia"""
+        self.timeline.add_music_item(0, 0, 2.03, "A", self.window.settings)       # fine a 203
+        item = self.timeline.add_music_item(5, 1, 1, "B", self.window.settings)   # 500
+
+        # L'inizio di B finisce a 208: entro SNAP_DISTANCE dalla fine di A
+        self.drag(item, QPointF(-292, 0))
+        self.assertAlmostEqual(item.pos().x(), 203)
+        self.assertAlmostEqual(item.params['cAttacco'], 2.03)
+
+        # Anche la fine del clip trascinato si aggancia: B (largo 100) portato
+        # a 104-204 preferisce la fine di A (a 1 pixel) alla tacca 100 (a 4)
+        self.drag(item, QPointF(-99, 0))
+        self.assertAlmostEqual(item.pos().x() + item.rect().width(), 203)
+
+    def test_snap_to_ruler_markers(self):
+        """Lontano dai clip si aggancia alle tacche del righello"""
+        item = self.timeline.add_music_item(0, 0, 1, "A", self.window.settings)
+        # A zoom 1 le tacche sono ogni secondo (100 pixel)
+        self.drag(item, QPointF(704, 0))
+        self.assertEqual(item.pos().x(), 700)
+
+    def test_snap_disabled(self):
+        """Con snap_to_edges disattivato resta la griglia di 1/16"""
+        self.timeline.add_music_item(0, 0, 2.03, "A", self.window.settings)
+        item = self.timeline.add_music_item(5, 1, 1, "B", self.window.settings)
+        # Solo in memoria: settings.json resta invariato
+        with patch.dict(self.window.settings.current_settings, {'snap_to_edges': False}):
+            self.drag(item, QPointF(-292, 0))
+        self.assertEqual(item.pos().x(), 206.25)
+
+    def test_lookup_is_logarithmic(self):
+        """Benchmark: snap su 20000 clip senza scansioni lineari"""
+        for i in range(20000):
+            self.timeline.add_music_item(i * 1.5, i % 8, 1.01, f"Clip{i}", self.window.settings)
+        self.timeline.clip_index.nearest_edge(0, SNAP_DISTANCE)  # Costruzione dell'indice
+
+        start = time.perf_counter()
+        with patch.object(self.timeline, 'items') as mock_items, \
+                patch.object(self.timeline.clip_index, '_ensure',
+                             wraps=self.timeline.clip_index._ensure) as mock_ensure:
+            for i in range(1000):
+                self.timeline.magnetic_snap((i * 37.0, i * 37.0 + 100))
+        elapsed = (time.perf_counter() - start) / 1000
+        print(f"\nsnap su 20000 clip: {elapsed * 1e6:.1f}us per movimento")
+        # Nessuna scansione della scena e nessuna ricostruzione dell'indice
+        mock_items.assert_not_called()
+        self.assertTrue(mock_ensure.called)
+        self.assertFalse(self.timeline.clip_index.dirty)
+        self.assertLess(elapsed, 0.01)
@@ -1,12 +1,12 @@
 # tests/timeline/test_timeline_view.py
 from tests.timeline import (
-    BaseTest,
+    BaseTest, patch,
     Qt,
     QTimer, QPointF, QRectF,
     QKeyEvent, QEvent
 )
 from src.TimelineView import TimelineView
-from src.Timeline import TrackItem, Timeline
+from src.Timeline import Timeline
 from src.Settings import Settings
 from PyQt5.QtGui import QMouseEvent
 from PyQt5.QtTest import QTest
@@ -198,4 +198,26 @@ class TimelineViewTest(BaseTest):
         view.handleRubberBandSelection(rect, QPointF(0,0), QPointF(300,100))
         
         selected = [item for item in items if item.isSelected()]
-        self.assertEqual(len(selected), 3)
\ No newline at end of file
+        self.assertEqual(len(selected), 3)
+
+    def test_rubber_band_mouse_drag(self):
+        """Un vero trascinamento con Ctrl seleziona tramite select_rect, non via Qt"""
+        view = self.window.timeline_container.timeline_view
+        scale = self.timeline.pixels_per_beat * self.timeline.zoom_level
+        height = self.timeline.track_height
+        items = [self.timeline.add_music_item(i, 1, 1, f"Test{i}", self.window.settings) for i in range(3)]
+        outside = self.timeline.add_music_item(10, 1, 1, "Outside", self.window.settings)
+
+        start = view.mapFromScene(QPointF(0.5 * scale, height * 0.5))
+        end = view.mapFromScene(QPointF(2.5 * scale, height * 1.5))
+        with patch.object(self.timeline, 'select_rect', wraps=self.timeline.select_rect) as mock_select, \
+                patch.object(self.timeline, 'setSelectionArea') as mock_area:
+            QTest.mousePress(view.viewport(), Qt.LeftButton, Qt.ControlModifier, start)
+            QTest.mouseMove(view.viewport(), end)
+            self.assertEqual(self.timeline.selectedItems(), [])
+            QTest.mouseRelease(view.viewport(), Qt.LeftButton, Qt.ControlModifier, end)
+        mock_select.assert_called_once()
+        mock_area.assert_not_called()
+        self.assertEqual(set(self.timeline.selectedItems()), set(items))
+        self.assertFalse(outside.isSelected())
+        self.assertEqual(view.dragMode(), view.NoDrag)
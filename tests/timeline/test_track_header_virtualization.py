@@ -0,0 +1,111 @@
+# tests/timeline/test_track_header_virtualization.py
+from tests.timeline import (
+    BaseTest, patch,
+    QEvent
+)
+from PyQt5 import sip
+from PyQt5.QtGui import QFocusEvent
+from src.TrackHeaderView import TrackHeaderItem, TrackHeaderScene, TrackHeaderView, HEADER_OVERSCAN
+
+
+class TrackHeaderVirtualizationTest(BaseTest):
+    """Test degli header virtualizzati: solo le tracce visibili hanno un item"""
+
+    def setUp(self):
+        super().setUp()
+        self.window.resize(1000, 600)
+        self.window.show()
+        self.app.processEvents()
+        self.header_view = self.window.timeline_container.track_header_view
+        self.header_scene = self.header_view.scene
+        self.timeline.num_tracks = 300
+        self.timeline.draw_tracks()
+        self.app.processEvents()
+
+    def header_count(self):
+        return sum(1 for item in self.header_scene.items() if isinstance(item, TrackHeaderItem))
+
+    def visible_tracks(self):
+        viewport_height = self.header_view.viewport().height()
+        return viewport_height // self.timeline.track_height + 1
+
+    def test_only_visible_headers_materialized(self):
+        """Con centinaia di tracce esistono solo gli header visibili"""
+        self.assertEqual(len(self.header_scene.header_items), 300)
+        self.assertEqual(len(self.header_scene.tracks), 300)
+        limit = self.visible_tracks() + 2 * HEADER_OVERSCAN + 1
+        self.assertLessEqual(len(self.header_scene.active_headers), limit)
+        self.assertLessEqual(self.header_count(), limit)
+
+    def test_headers_recycled_on_scroll(self):
+        """Lo scroll riusa gli stessi item per le nuove tracce visibili"""
+        before = set(map(id, self.header_scene.active_headers.values()))
+        scrollbar = self.header_view.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
+        self.app.processEvents()
+
+        active = self.header_scene.active_headers
+        self.assertIn(299, active)
+        self.assertNotIn(0, active)
+        self.assertEqual(active[299].text.toPlainText(), "Track 300")
+        self.assertEqual(active[299].rect().y(), 299 * self.timeline.track_height)
+        # Nessun item nuovo: sono tutti presi dal pool
+        self.assertTrue(set(map(id, active.values())) <= before | set(map(id, self.header_scene._pool)))
+        self.assertLessEqual(self.header_count(), len(before) + 1)
+
+    def test_state_survives_recycling(self):
+        """Nome, mute e solo restano nel record quando l'header viene riusato"""
+        header = self.header_scene.header_items[1]
+        header.text.setPlainText("Bass")
+        header.text.focusOutEvent(QFocusEvent(QEvent.FocusOut))
+        header.mute_button.toggleForTest()
+
+        scrollbar = self.header_view.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
+        self.app.processEvents()
+        scrollbar.setValue(0)
+        self.app.processEvents()
+
+        header = self.header_scene.header_items[1]
+        self.assertEqual(header.text.toPlainText(), "Bass")
+        self.assertTrue(header.mute_button.is_active)
+        self.assertFalse(header.solo_button.is_active)
+        self.assertFalse(self.header_scene.header_items[2].mute_button.is_active)
+
+    def test_delete_track_shifts_records(self):
+        """Eliminando una traccia, nome e stato delle successive salgono"""
+        self.header_scene.tracks[3].name = "Drums"
+        self.header_scene.tracks[3].soloed = True
+        self.timeline.delete_track(2)
+
+        self.assertEqual(len(self.header_scene.header_items), 299)
+        header = self.header_scene.header_items[2]
+        self.assertEqual(header.text.toPlainText(), "Drums")
+        self.assertTrue(header.solo_button.is_active)
+        self.assertEqual(self.header_scene.header_items[3].text.toPlainText(), "Track 4")
+
+    def test_move_track_swaps_records(self):
+        """Spostando una traccia il suo nome la segue"""
+        self.header_scene.tracks[0].name = "Lead"
+        self.timeline.move_track(0, 1)
+        self.assertEqual(self.header_scene.header_items[1].text.toPlainText(), "Lead")
+        self.assertEqual(self.header_scene.header_items[0].text.toPlainText(), "Track 1")
+
+    def test_selection_of_hidden_tracks(self):
+        """La selezione resta nei record anche per le tracce senza header"""
+        self.header_scene.header_items[250].setSelected(True)
+        self.assertEqual(self.window.selected_track, 250)
+        self.assertEqual(self.header_scene.selected_tracks(), [250])
+
+        self.header_scene.deselect_all()
+        self.assertEqual(self.header_scene.selected_tracks(), [])
+
+    def test_view_owns_scene(self):
+        """La scena vive quanto la vista: distruggerla non rimaterializza header eliminati"""
+        self.assertIs(self.header_scene.parent(), self.header_view)
+        view = TrackHeaderView()
+        view.update_tracks(300, 50)
+        view.verticalScrollBar().setValue(500)
+        with patch.object(TrackHeaderScene, 'materialize') as mock_materialize:
+            sip.delete(view)
+        mock_materialize.assert_not_called()
@@ -0,0 +1,119 @@
+# tests/ui/test_live_search.py
+from tests.ui import BaseTest, patch, QTest
+from src.LiveSearch import parse_search_value, params_match, frozen_params
+
+
+class LiveSearchTest(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.live_search = self.window.live_search
+        self.items = []
+        for i in range(20):
+            item = self.timeline.add_music_item(i * 2, i % self.timeline.num_tracks, 3,
+                                                f"Clip{i}", self.window.settings)
+            item.params['posizione'] = i % 4
+            self.items.append(item)
+        self.window.search_param.setCurrentText('posizione')
+
+    def type_and_wait(self, text):
+        """Scrive nella barra di ricerca e attende i risultati dal thread di lavoro"""
+        finished = []
+        self.live_search.search_finished.connect(finished.append)
+        self.window.search_value.setText(text)
+        for _ in range(200):
+            if finished:
+                break
+            QTest.qWait(5)
+        self.live_search.search_finished.disconnect(finished.append)
+        return finished
+
+    def highlighted(self):
+        return {item for item in self.items if item.highlighted}
+
+    def test_parse_search_value(self):
+        """Solo numeri e liste di numeri, senza eseguire il testo"""
+        self.assertEqual(parse_search_value(' -8 '), -8)
+        self.assertEqual(parse_search_value('(7, 15)'), [7, 15])
+        for text in ('"abc"', '[1, "a"]', '__import__("os")'):
+            with self.assertRaises((ValueError, SyntaxError)):
+                parse_search_value(text)
+
+    def test_params_match(self):
+        """Il confronto sulla copia coincide con quello dell'indice"""
+        params = frozen_params({'ritmo': [7, 15], 'posizione': -8})
+        self.assertEqual(params['ritmo'], (7, 15))
+        self.assertTrue(params_match(params, 'ritmo', [7, 15.0005]))
+        self.assertFalse(params_match(params, 'ritmo', [7]))
+        self.assertTrue(params_match(params, 'posizione', -8.001))
+        self.assertFalse(params_match(params, 'ritmo', 7))
+
+    def test_search_as_you_type(self):
+        """Scrivere evidenzia i clip senza premere Invio"""
+        finished = self.type_and_wait('2')
+        self.assertEqual(finished, [5])
+        self.assertEqual(self.highlighted(), {i for i in self.items if i.params['posizione'] == 2})
+
+        # Cambiare parametro rilancia la ricerca
+        finished = []
+        self.live_search.search_finished.connect(finished.append)
+        self.window.search_param.setCurrentText('cAttacco')
+        for _ in range(200):
+            if finished:
+                break
+            QTest.qWait(5)
+        self.assertEqual(self.highlighted(), {self.items[1]})
+
+        # Testo vuoto: nessuna evidenziazione
+        self.type_and_wait('')
+        self.assertEqual(self.highlighted(), set())
+
+    def test_incomplete_text_keeps_results(self):
+        """Un testo incompleto non cancella i risultati precedenti"""
+        self.type_and_wait('1')
+        expected = self.highlighted()
+        self.assertTrue(expected)
+        self.window.search_value.setText('[1,')
+        QTest.qWait(self.live_search.delay * 2)
+        self.assertEqual(self.highlighted(), expected)
+
+    def test_results_applied_as_diff(self):
+        """Si ridisegnano solo i clip che cambiano stato"""
+        self.type_and_wait('1')
+        with patch.object(self.timeline, 'update') as mock_scene_update:
+            changed = self.timeline.set_highlighted(
+                [i for i in self.items if i.params['posizione'] in (1, 3)])
+        mock_scene_update.assert_not_called()
+        self.assertEqual(changed, 5)  # Solo i clip con posizione 3 si accendono
+        self.assertEqual(self.timeline.set_highlighted(self.timeline.highlighted_items), 0)
+
+    def test_stale_results_discarded(self):
+        """Il risultato di una ricerca superata non viene applicato"""
+        self.live_search._apply_results(self.live_search._request - 1, self.items)
+        self.assertEqual(self.highlighted(), set())
+
+    def test_snapshot_reused_until_params_change(self):
+        """La copia dei parametri si rifà solo dopo una modifica"""
+        first = self.live_search.snapshot()
+        self.assertIs(self.live_search.snapshot(), first)
+        self.items[0].params['posizione'] = 9
+        second = self.live_search.snapshot()
+        self.assertIsNot(second, first)
+        params = {item: p for item, p, _ in second}
+        self.assertEqual(params[self.items[0]]['posizione'], 9)
+
+    def test_live_query(self):
+        """Anche le query su più parametri vengono cercate mentre si scrive"""
+        finished = self.type_and_wait('posizione in 1..2 and track < 4')
+        self.assertTrue(finished)
+        expected = {item for item in self.items
+                    if item.params['posizione'] in (1, 2) and self.timeline.track_at(item.pos().y()) < 4}
+        self.assertEqual(self.highlighted(), expected)
+
+    def test_enter_overrides_pending_live_search(self):
+        """Invio cerca subito e annulla la ricerca live in attesa"""
+        self.window.search_value.setText('3')
+        self.window.perform_search()
+        self.assertFalse(self.live_search._timer.isActive())
+        self.assertEqual(self.highlighted(), {i for i in self.items if i.params['posizione'] == 3})
+        self.window.clear_search()
+        self.assertEqual(self.highlighted(), set())
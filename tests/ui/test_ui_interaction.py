@@ -1,7 +1,7 @@
 # tests/test_ui_interaction.py
 from tests.ui import BaseTest, QTest, Qt
 from PyQt5.QtWidgets import QAction
-from src.Timeline import TrackItem, Timeline
+from src.Timeline import Timeline
 from src.MusicItem import MusicItem 
 from src.MainWindow import MainWindow
 from src.TimelineContainer import TimelineContainer